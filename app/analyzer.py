@@ -0,0 +1,282 @@
+import asyncio
+import threading
+from collections import deque
+
+from app.backends import DEFAULT_TIER, check_tier
+from app.executor import analyze_parallel, warm_stages
+from app.incremental import analyze_incremental
+from app.lemmatizer import lemmatize_tokens
+from app.ner import SCHEMES, extract_entities_from_doc, generate_bio_tags_from_doc, process_text
+from app.pipeline import analyze_requests, analyze_text, batched, compare_text, resolve_stages, stage_sections
+from app.pos_tagger import pos_tag_text
+from app.pricing import known_cost
+from app.result_cache import ResultCache, cache_key
+from app.server import MicroBatcher
+from app.stemmer import stem_tokens
+from app.token_table import TokenTable
+from app.tokenizer import DEFAULT_LLM_MODEL, llm_token_count, sentence_tokens, word_tokens
+
+
+def check_options(scheme: str = "BIO", stages=None, tier: str = DEFAULT_TIER):
+    """Validated `(scheme, stages, tier)`; raises ValueError for unknown values."""
+    scheme = scheme.upper()
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown tagging scheme: {scheme}")
+    if stages is not None:
+        stages = list(stages)
+        resolve_stages(stages)
+    return scheme, stages, check_tier(tier.lower())
+
+
+def plain_result(result: dict) -> dict:
+    """`result` with `TokenTable` sections as lists of row dicts, as cached results hold them."""
+    return {name: value.to_dicts() if isinstance(value, TokenTable) else value for name, value in result.items()}
+
+
+def _attempt(fn):
+    try:
+        return fn()
+    except Exception as e:
+        return e
+
+
+def _outcome(future):
+    # A failed document becomes an error record, as with `analyze_parallel`
+    try:
+        return future.result()
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+class TextAnalyzer:
+    """
+    Library entry point to the analysis pipeline, independent of the CLI.
+
+    Results have the same structure as the matching command's
+    `--json-output`, whether or not they come from the cache. Models are
+    loaded lazily on first use (or by `warm`) and reused for the
+    analyzer's lifetime.
+
+    Every model call runs on one worker thread, so an analyzer can be
+    shared by any number of threads and coroutines: concurrent `analyze`
+    requests are queued and processed together as a batch (one spaCy
+    `nlp.pipe` pass per batch), and the on-disk cache is only touched from
+    that thread.
+
+        with TextAnalyzer(stages=["lemmas", "ner"]) as analyzer:
+            result = analyzer.analyze("Tony Stark built Jarvis.")
+            results = analyzer.analyze_many(texts)
+            result = await analyzer.analyze_async(text)
+
+    `cache` is True (the default `ResultCache`), a `ResultCache` or None.
+    `window_ms` holds a batch open for that long to collect more requests;
+    with the default of 0, requests that queue up while a batch is running
+    form the next one.
+    """
+
+    def __init__(
+        self,
+        scheme: str = "BIO",
+        stages=None,
+        tier: str = DEFAULT_TIER,
+        cache=None,
+        batch_size: int = 64,
+        window_ms: float = 0,
+    ):
+        self.scheme, self.stages, self.tier = check_options(scheme, stages, tier)
+        if cache is True:
+            cache = ResultCache()
+        self.cache = cache or None
+        self.batch_size = batch_size
+        self.window_ms = window_ms
+        self._batcher = None
+        self._lock = threading.Lock()
+
+    # ----------------------------
+    # Options
+    # ----------------------------
+    def _options(self, scheme=None, stages=None, tier=None):
+        # Per-call overrides of the analyzer's defaults
+        return check_options(scheme or self.scheme, self.stages if stages is None else stages, tier or self.tier)
+
+    def _request(self, text: str, scheme=None, stages=None, tier=None) -> dict:
+        if not isinstance(text, str):
+            raise TypeError(f"Expected text as str, got {type(text).__name__}")
+        scheme, stages, tier = self._options(scheme, stages, tier)
+        return {"text": text, "scheme": scheme, "stages": stages, "tier": tier}
+
+    # ----------------------------
+    # Worker thread
+    # ----------------------------
+    def _worker(self) -> MicroBatcher:
+        if self._batcher is None:
+            with self._lock:
+                if self._batcher is None:
+                    self._batcher = MicroBatcher(self._handle, self.window_ms / 1000, self.batch_size)
+        return self._batcher
+
+    def _handle(self, items):
+        # Request dicts are analyzed as one batch; callables (other commands) run one by one.
+        # Failures come back as that item's exception, so nothing that succeeded runs twice.
+        results = [None] * len(items)
+        indexes = []
+        for n, item in enumerate(items):
+            if callable(item):
+                results[n] = _attempt(item)
+            else:
+                indexes.append(n)
+        if indexes:
+            outcome = _attempt(lambda: self._analyze_batch([items[n] for n in indexes]))
+            if isinstance(outcome, Exception) and len(indexes) > 1:
+                # Isolate the failing request(s)
+                outcome = [_attempt(lambda n=n: self._analyze_batch([items[n]])[0]) for n in indexes]
+            elif isinstance(outcome, Exception):
+                outcome = [outcome]
+            for n, result in zip(indexes, outcome):
+                results[n] = result
+        return results
+
+    def _analyze_batch(self, requests):
+        if self.cache is None:
+            return [plain_result(result) for result in analyze_requests(requests)]
+
+        keys = [cache_key(r["text"], stage_sections(r["stages"]), scheme=r["scheme"], tier=r["tier"]) for r in requests]
+        results = [self.cache.get(key) for key in keys]
+        misses = [n for n, result in enumerate(results) if result is None]
+        if misses:
+            for n, result in zip(misses, analyze_requests([requests[n] for n in misses])):
+                result = plain_result(result)
+                self.cache.put(keys[n], result)
+                results[n] = result
+        return results
+
+    def _call(self, fn):
+        return self._worker().submit(fn)
+
+    def warm(self):
+        """Load the models the configured stages and tier use."""
+        self._call(lambda: warm_stages(self.stages, self.tier))
+
+    def close(self):
+        """Stop the worker thread once queued requests are done."""
+        with self._lock:
+            batcher, self._batcher = self._batcher, None
+        if batcher is not None:
+            batcher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------------------
+    # analyze
+    # ----------------------------
+    def analyze(self, text: str, scheme=None, stages=None, tier=None, profiler=None) -> dict:
+        """
+        The `analyze` result for `text`. `scheme`, `stages` and `tier`
+        override the analyzer's defaults for this call.
+
+        With a `profiling.Profiler`, the text runs on its own (bypassing
+        the cache) and per-stage metrics are added under `metrics`.
+        """
+        request = self._request(text, scheme, stages, tier)
+        if profiler is not None:
+            return self._call(lambda: plain_result(
+                analyze_text(text, request["scheme"], profiler, request["stages"], request["tier"])
+            ))
+        return self._worker().submit(request)
+
+    def analyze_many(self, texts, scheme=None, stages=None, tier=None) -> list:
+        """`analyze` results for `texts`, in order, processed in batches of `batch_size`."""
+        requests = [self._request(text, scheme, stages, tier) for text in texts]
+        worker = self._worker()
+        futures = [worker.enqueue(request) for request in requests]
+        return [future.result() for future in futures]
+
+    async def analyze_async(self, text: str, scheme=None, stages=None, tier=None) -> dict:
+        """Awaitable `analyze`; concurrent calls are batched together."""
+        request = self._request(text, scheme, stages, tier)
+        return await asyncio.wrap_future(self._worker().enqueue(request))
+
+    def analyze_stream(self, documents, scheme=None, stages=None, tier=None, workers: int = 1):
+        """
+        Analyze `(doc_id, text)` pairs lazily, yielding `(doc_id, result)`
+        in input order. At most two batches are in flight, so memory stays
+        bounded.
+
+        With `workers > 1`, documents go to a process pool instead
+        (`executor.analyze_parallel`). Either way, a failed document comes
+        back as `{"error": ...}` and the stream continues.
+        """
+        scheme, stages, tier = self._options(scheme, stages, tier)
+        if workers > 1:
+            for doc_id, result in analyze_parallel(
+                documents, workers, batch_size=self.batch_size, scheme=scheme, stages=stages,
+                use_cache=self.cache is not None, tier=tier
+            ):
+                yield doc_id, plain_result(result)
+            return
+
+        worker = self._worker()
+        pending = deque()
+        for batch in batched(documents, self.batch_size):
+            pending.append([(doc_id, worker.enqueue(self._request(text, scheme, stages, tier))) for doc_id, text in batch])
+            if len(pending) > 1:
+                yield from ((doc_id, _outcome(future)) for doc_id, future in pending.popleft())
+        while pending:
+            yield from ((doc_id, _outcome(future)) for doc_id, future in pending.popleft())
+
+    def analyze_incremental(self, text: str, scheme=None):
+        """
+        `(result, reused)` for `text`, re-analyzing only sentences not seen
+        before (all stages, accurate tier). Needs a cache; without one the
+        default `ResultCache` is used.
+        """
+        scheme = self._options(scheme)[0]
+        cache = self.cache if self.cache is not None else ResultCache()
+        return self._call(lambda: analyze_incremental(text, cache, scheme))
+
+    # ----------------------------
+    # Single-layer commands
+    # ----------------------------
+    def compare(self, text: str) -> dict:
+        return self._call(lambda: compare_text(text))
+
+    def tokenize(self, text: str, model: str = DEFAULT_LLM_MODEL) -> dict:
+        def run():
+            llm_count = llm_token_count(text, model)
+            return {
+                "sentences": sentence_tokens(text),
+                "words": word_tokens(text),
+                "llm_tokens": llm_count,
+                "llm_estimated_cost": known_cost(llm_count, model)
+            }
+        return self._call(run)
+
+    def pos(self, text: str) -> list:
+        def run():
+            return [{"token": w, "pos": p, "description": d} for w, p, d in pos_tag_text(text)]
+        return self._call(run)
+
+    def lemmatize(self, text: str) -> list:
+        def run():
+            return lemmatize_tokens(pos_tag_text(text))
+        return self._call(run)
+
+    def stem(self, text: str) -> list:
+        def run():
+            return stem_tokens(word_tokens(text))
+        return self._call(run)
+
+    def ner(self, text: str, scheme=None) -> dict:
+        scheme = self._options(scheme)[0]
+
+        def run():
+            doc = process_text(text)
+            return {
+                "entities": extract_entities_from_doc(doc),
+                "bio_tags": [{"token": t, "tag": b} for t, b in generate_bio_tags_from_doc(doc, scheme)]
+            }
+        return self._call(run)
@@ -0,0 +1,255 @@
+import re
+
+from app import memo, resources
+from app.document import Document
+from app.lemmatizer import LEMMA_FIELDS, LEMMA_FLAGS, lemmatize_document
+from app.memo import memoize_types
+from app.ner import annotate_documents, to_spacy_doc
+from app.pos_tagger import tag_document
+from app.token_table import TokenTable
+from app.wordnet_index import is_valid_word
+
+# ----------------------------
+# Backend registry
+# ----------------------------
+# stage -> implementation name -> function. Stage signatures:
+#   tokenize(pairs, batch_size)  -> Documents for `(doc_id, text)` pairs
+#   pos(document)                -> fills `document.pos`
+#   lemmatize(document)          -> fills `document.lemmas`
+#   ner(documents, batch_size)   -> Documents with `entities` filled in
+BACKEND_STAGES = ("tokenize", "pos", "lemmatize", "ner")
+_backends = {stage: {} for stage in BACKEND_STAGES}
+
+
+def register(stage: str, name: str):
+    def decorator(fn):
+        _backends[stage][name] = fn
+        return fn
+    return decorator
+
+
+TIERS = {
+    # Regex tokenizer, word -> tag lexicon with suffix rules
+    "fast": {"tokenize": "regex", "pos": "lexicon", "lemmatize": "wordnet", "ner": "spacy"},
+    # One spaCy pass supplies tokens, tags, lemmas and entities
+    "balanced": {"tokenize": "spacy", "pos": "spacy", "lemmatize": "spacy", "ner": "spacy_doc"},
+    # NLTK Treebank + perceptron + WordNet, spaCy NER
+    "accurate": {"tokenize": "treebank", "pos": "perceptron", "lemmatize": "wordnet", "ner": "spacy"},
+}
+DEFAULT_TIER = "accurate"
+
+
+def check_tier(tier: str) -> str:
+    if tier not in TIERS:
+        raise ValueError(f"Unknown tier: {tier}. Choose from: {', '.join(TIERS)}")
+    return tier
+
+
+def backend(stage: str, tier: str = DEFAULT_TIER):
+    return _backends[stage][TIERS[check_tier(tier)][stage]]
+
+
+def tokenize_documents(pairs, tier: str = DEFAULT_TIER, batch_size: int = 64):
+    return backend("tokenize", tier)(pairs, batch_size)
+
+
+def tokenize_text(text: str, tier: str = DEFAULT_TIER, doc_id=None) -> Document:
+    return next(iter(tokenize_documents([(doc_id, text)], tier, batch_size=1)))
+
+
+def tag(document, tier: str = DEFAULT_TIER):
+    return backend("pos", tier)(document)
+
+
+def lemmatize(document, tier: str = DEFAULT_TIER):
+    return backend("lemmatize", tier)(document)
+
+
+def annotate(documents, tier: str = DEFAULT_TIER, batch_size: int = 64):
+    return backend("ner", tier)(documents, batch_size)
+
+
+def warm(tier: str = DEFAULT_TIER, lemmas: bool = True, ner: bool = True):
+    # Load the models the tier's backends need for the selected stages
+    stages = TIERS[check_tier(tier)]
+    if stages["tokenize"] == "treebank":
+        resources.get("punkt", "english")
+        resources.get("word_tokenizer")
+    if lemmas and stages["pos"] in ("perceptron", "lexicon"):
+        resources.get("pos_tagger")
+    if lemmas and stages["lemmatize"] == "wordnet":
+        resources.get("wordnet_lemmatizer")
+    if (stages["tokenize"] == "spacy"
+            or (lemmas and "spacy" in (stages["pos"], stages["lemmatize"]))
+            or (ner and stages["ner"] == "spacy_doc")):
+        resources.get("spacy_tagger", SPACY_MODEL)
+    if ner and stages["ner"] == "spacy":
+        resources.get("spacy", SPACY_MODEL)
+
+
+# ----------------------------
+# accurate: today's NLTK stack
+# ----------------------------
+@register("tokenize", "treebank")
+def _treebank_documents(pairs, batch_size: int = 64):
+    return (Document.from_text(text, doc_id=doc_id) for doc_id, text in pairs)
+
+
+register("pos", "perceptron")(tag_document)
+register("lemmatize", "wordnet")(lemmatize_document)
+register("ner", "spacy")(annotate_documents)
+
+
+# ----------------------------
+# fast: regex tokens, lexicon tagger
+# ----------------------------
+# Sentence breaks: whitespace after terminal punctuation (or punctuation and a
+# closing quote/bracket), before an upper-case letter, digit or opening quote
+SENTENCE_BREAK = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+(?=[A-Z0-9\"'(\[])")
+# Treebank-like words: "don't" -> do n't, "John's" -> John 's, hyphenated words
+# and decimals stay whole, every other symbol is its own token
+WORD = re.compile(r"\w+(?=n't\b)|n't\b|'(?:s|re|ve|ll|d|m)\b|\d+(?:[.,]\d+)+|\w+(?:-\w+)*|[^\w\s]", re.IGNORECASE)
+
+
+def regex_document(text: str, doc_id=None) -> Document:
+    document = Document(text, doc_id)
+    start = 0
+    for end in [m.start() for m in SENTENCE_BREAK.finditer(text)] + [len(text)]:
+        first = len(document.tokens)
+        for match in WORD.finditer(text, start, end):
+            document.tokens.append(match.group())
+            document.offsets.append(match.span())
+        if len(document.tokens) > first:
+            document.sentences.append((document.offsets[first][0], document.offsets[-1][1]))
+            document.sentence_tokens.append((first, len(document.tokens)))
+        start = end
+    return document
+
+
+@register("tokenize", "regex")
+def _regex_documents(pairs, batch_size: int = 64):
+    return (regex_document(text, doc_id) for doc_id, text in pairs)
+
+
+PUNCT_TAGS = {
+    ".": ".", "!": ".", "?": ".", ",": ",", ":": ":", ";": ":", "-": ":", "--": ":",
+    "(": "(", ")": ")", "[": "(", "]": ")", "$": "$", "#": "#", "\"": "``", "'": "''", "`": "``",
+}
+# Checked in order; the first matching suffix wins
+SUFFIX_TAGS = (
+    ("ing", "VBG"), ("ed", "VBD"), ("ly", "RB"), ("est", "JJS"),
+    ("ous", "JJ"), ("ful", "JJ"), ("ive", "JJ"), ("able", "JJ"), ("ible", "JJ"), ("less", "JJ"), ("ic", "JJ"), ("al", "JJ"),
+    ("tion", "NN"), ("ment", "NN"), ("ness", "NN"), ("ity", "NN"), ("ss", "NN"), ("s", "NNS"),
+)
+NUMBER = re.compile(r"[+-]?\d+(?:[.,]\d+)*%?")
+
+
+def guess_tag(word: str, tagdict: dict) -> str:
+    """Most-frequent tag from `tagdict`, else punctuation / number / shape / suffix rules."""
+    tag = tagdict.get(word) or tagdict.get(word.lower())
+    if tag:
+        return tag
+    if word in PUNCT_TAGS:
+        return PUNCT_TAGS[word]
+    if NUMBER.fullmatch(word):
+        return "CD"
+    if not any(c.isalnum() for c in word):
+        return "SYM"
+    if word[0].isupper():
+        return "NNPS" if word.endswith("s") and len(word) > 3 and not word.endswith("ss") else "NNP"
+    lower = word.lower()
+    for suffix, suffix_tag in SUFFIX_TAGS:
+        if lower.endswith(suffix) and len(lower) > len(suffix) + 2:
+            return suffix_tag
+    return "NN"
+
+
+def _lexicon_tag(word):
+    # The perceptron's dictionary of words it always tags the same way
+    return guess_tag(word, resources.get("pos_tagger").tagdict)
+
+
+@register("pos", "lexicon")
+def _lexicon_tag_document(document):
+    # Context-free, so each word type is tagged once
+    document.pos = memoize_types(document.tokens, memo.table("tags"), _lexicon_tag)
+    return document
+
+
+# ----------------------------
+# balanced: spaCy token attributes
+# ----------------------------
+SPACY_MODEL = "en_core_web_sm"
+
+
+@resources.register("spacy_tagger")
+def _load_spacy_tagger(model: str = SPACY_MODEL):
+    # Tagger, rule lemmatizer and NER, with the cheap sentence recognizer
+    # standing in for the dependency parser
+    import spacy
+    nlp = spacy.load(model, exclude=["parser"])
+    if "senter" in nlp.disabled:
+        nlp.enable_pipe("senter")
+    return nlp
+
+
+def _spacy_layers(document, doc, index=None):
+    # `index[i]` is the spaCy token behind `document.tokens[i]`
+    tokens = [doc[i] for i in index] if index is not None else list(doc)
+    position = {token.i: n for n, token in enumerate(tokens)}
+    document.pos = [token.tag_ for token in tokens]
+    lemmas = [token.lemma_ for token in tokens]
+    document.lemmas = TokenTable(LEMMA_FIELDS, LEMMA_FLAGS, {
+        "token": document.tokens,
+        "pos": document.pos,
+        "lemma": lemmas,
+        "lemma_valid": [is_valid_word(lemma) for lemma in lemmas],
+    })
+    document.entities = [
+        (position[ent.start], position[ent.end - 1] + 1, ent.label_)
+        for ent in doc.ents
+        if ent.start in position and ent.end - 1 in position
+    ]
+    return document
+
+
+def _spacy_document(doc, doc_id=None) -> Document:
+    document = Document(doc.text, doc_id)
+    index = []
+    for sentence in doc.sents:
+        first = len(document.tokens)
+        for token in sentence:
+            if token.is_space:
+                continue
+            index.append(token.i)
+            document.tokens.append(token.text)
+            document.offsets.append((token.idx, token.idx + len(token.text)))
+        if len(document.tokens) > first:
+            document.sentences.append((document.offsets[first][0], document.offsets[-1][1]))
+            document.sentence_tokens.append((first, len(document.tokens)))
+    return _spacy_layers(document, doc, index)
+
+
+@register("tokenize", "spacy")
+def _spacy_documents(pairs, batch_size: int = 64):
+    nlp = resources.get("spacy_tagger", SPACY_MODEL)
+    pairs = ((text, doc_id) for doc_id, text in pairs)
+    return (_spacy_document(doc, doc_id) for doc, doc_id in nlp.pipe(pairs, batch_size=batch_size, as_tuples=True))
+
+
+def _spacy_fill(document):
+    # Layers are normally filled by the spaCy tokenizer; other tokenizations
+    # are run through the same pipeline on their own tokens
+    if document.pos is None or document.lemmas is None or document.entities is None:
+        nlp = resources.get("spacy_tagger", SPACY_MODEL)
+        _spacy_layers(document, nlp(to_spacy_doc(document, nlp)))
+    return document
+
+
+register("pos", "spacy")(_spacy_fill)
+register("lemmatize", "spacy")(_spacy_fill)
+
+
+@register("ner", "spacy_doc")
+def _spacy_doc_entities(documents, batch_size: int = 64):
+    return (_spacy_fill(document) for document in documents)
@@ -0,0 +1,115 @@
+import re
+
+from app.tokenizer import DEFAULT_LLM_MODEL, get_encoder, sentence_spans
+
+# Fallback split points for a sentence longer than the budget: each word
+# with the whitespace before it
+_WORD_PIECE = re.compile(r"\s*\S+")
+
+
+def _hard_split(text: str, start: int, end: int, max_tokens: int, enc):
+    # A single word over budget: cut its tokens into windows, moving each cut
+    # back to a UTF-8 character boundary
+    piece = text[start:end]
+    data = piece.encode("utf-8")
+    token_bytes = enc.decode_tokens_bytes(enc.encode_ordinary(piece))
+    pieces = []
+    cut = char = 0
+    for i in range(0, len(token_bytes), max_tokens):
+        window = token_bytes[i:i + max_tokens]
+        next_cut = min(cut + sum(len(b) for b in window), len(data))
+        while next_cut < len(data) and data[next_cut] & 0xC0 == 0x80:
+            next_cut -= 1
+        next_char = char + len(data[cut:next_cut].decode("utf-8"))
+        if next_char > char:
+            pieces.append((start + char, start + next_char, len(window)))
+        cut, char = next_cut, next_char
+    if char < len(piece):
+        pieces.append((start + char, end, len(enc.encode_ordinary(piece[char:]))))
+    return pieces
+
+
+def _pieces(text: str, max_tokens: int, enc):
+    """
+    `(start, end, tokens)` units that fit the budget: sentences, or words /
+    token windows of sentences that do not. Each unit carries the whitespace
+    before it, so counts add up without merging tokens across units.
+    """
+    spans = sentence_spans(text)
+    bounds = [(spans[i - 1][1] if i else 0, end) for i, (_, end) in enumerate(spans)]
+    counts = [len(t) for t in enc.encode_ordinary_batch([text[s:e] for s, e in bounds])]
+
+    for (start, end), count in zip(bounds, counts):
+        if count <= max_tokens:
+            yield start, end, count
+            continue
+        words = [(m.start(), m.end()) for m in _WORD_PIECE.finditer(text, start, end)]
+        word_counts = [len(t) for t in enc.encode_ordinary_batch([text[s:e] for s, e in words])]
+        for (s, e), n in zip(words, word_counts):
+            if n <= max_tokens:
+                yield s, e, n
+            else:
+                yield from _hard_split(text, s, e, max_tokens, enc)
+
+
+def chunk_text(text: str, max_tokens: int = 512, overlap: int = 0, model: str = DEFAULT_LLM_MODEL):
+    """
+    Split `text` into chunks of at most `max_tokens` tokens of `model`'s
+    encoding (a model name or an encoding such as `o200k_base`), breaking at
+    `sentence_tokens` boundaries; only a sentence longer than the budget is
+    split further, at word and then token boundaries.
+
+    Each chunk repeats up to `overlap` tokens of whole sentences from the
+    end of the previous one. Sentences are encoded once, in one batch;
+    chunk counts are sums of those counts (an upper bound in practice for
+    the chunk re-encoded on its own). Returns dicts with `index`, `text`,
+    `start` / `end` character offsets and `tokens`.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+    if not 0 <= overlap < max_tokens:
+        raise ValueError("overlap must be at least 0 and smaller than max_tokens")
+
+    enc = get_encoder(model)
+    chunks = []
+    current = []  # (start, end, tokens) units of the chunk being built
+    size = 0
+
+    def emit():
+        start = current[0][0]
+        # Leading whitespace belongs to the unit but not to the chunk text
+        while start < current[-1][1] and text[start].isspace():
+            start += 1
+        chunks.append({
+            "index": len(chunks),
+            "text": text[start:current[-1][1]],
+            "start": start,
+            "end": current[-1][1],
+            "tokens": size,
+        })
+
+    for unit in _pieces(text, max_tokens, enc):
+        if current and size + unit[2] > max_tokens:
+            emit()
+            # Carry whole trailing units into the next chunk as overlap
+            carried = []
+            carried_size = 0
+            for previous in reversed(current):
+                if carried_size + previous[2] > overlap or carried_size + previous[2] + unit[2] > max_tokens:
+                    break
+                carried.insert(0, previous)
+                carried_size += previous[2]
+            current, size = carried, carried_size
+        current.append(unit)
+        size += unit[2]
+
+    if current and text[current[0][0]:current[-1][1]].strip():
+        emit()
+    return chunks
+
+
+def chunk_documents(documents, max_tokens: int = 512, overlap: int = 0, model: str = DEFAULT_LLM_MODEL):
+    """Chunk `(doc_id, text)` pairs lazily, yielding `(doc_id, chunk)`."""
+    for doc_id, text in documents:
+        for chunk in chunk_text(text, max_tokens, overlap, model):
+            yield doc_id, chunk
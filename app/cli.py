@@ -1,15 +1,24 @@
 import typer
 from rich.console import Console
-from rich.table import Table
-from rich import box
 import time
 import json
 from pathlib import Path
-from app.tokenizer import sentence_tokens, word_tokens, llm_tokens
-from app.pos_tagger import pos_tag_tokens
-from app.lemmatizer import lemmatize_tokens
-from app.ner import process_text, extract_entities_from_doc, generate_bio_tags_from_doc
-from app.stemmer import stem_tokens
+import sys
+from app.tokenizer import DEFAULT_LLM_MODEL, get_encoder, llm_token_totals
+from app.pricing import known_cost
+from app.analyzer import TextAnalyzer
+from app.backends import DEFAULT_TIER, TIERS
+from app.pipeline import COMPARE_STAGES, STAGE_GRAPH, resolve_stages, stage_sections
+from app.result_cache import ResultCache, cache_key
+from app.corpus import iter_documents
+from app.wordnet_index import build_vocabulary, save_vocabulary
+from app.client import call
+from app.json_stream import emit_json, json_default
+from app.large_file import DEFAULT_CHUNK_BYTES, ChunkMerger, iter_chunk_results, iter_chunks
+from app.columnar import write_columnar
+from app.profiling import Profiler
+from app.render import DEFAULT_MAX_ROWS, Renderer, preview
+from app.server import AnalysisService, DEFAULT_MAX_BATCH, DEFAULT_WINDOW_MS, make_server, warm
 
 app = typer.Typer()
 console = Console()
@@ -23,6 +32,95 @@ def read_input_text(text: str | None, file: str | None) -> str:
     raise typer.BadParameter("Provide either TEXT or --file")
 
 
+def cached_result(text: str, stages, compute, use_cache: bool, **options):
+    # Cache hits return without loading any models
+    if not use_cache:
+        return compute(text)
+
+    cache = ResultCache()
+    key = cache_key(text, stages, **options)
+    result = cache.get(key)
+    if result is None:
+        result = compute(text)
+        cache.put(key, result)
+    return result
+
+
+OUTPUT_FORMATS = ("json", "columnar")
+
+
+def write_output(result, out: Path | None, json_output: bool, compact: bool, out_format: str, compress: bool):
+    # `result` is a zero-argument callable so generator sections can be produced once per writer
+    json_out = out
+    if out and out_format == "columnar":
+        write_columnar(out, [(None, result())], compress)
+        json_out = None
+    if json_output or json_out:
+        emit_json(result(), json_out, to_stdout=json_output, compact=compact)
+
+
+def analyze_large_file(file: Path, out: Path | None, json_output: bool, compact: bool, chunk_size: int, workers: int, out_format: str = "json", compress: bool = False, scheme: str = "BIO"):
+    start = time.perf_counter()
+    with ChunkMerger() as merger:
+        for char_offset, result in iter_chunk_results(iter_chunks(file, chunk_size), workers, scheme):
+            merger.add(char_offset, result)
+
+        write_output(merger.result, out, json_output, compact, out_format, compress)
+        if json_output:
+            return
+
+        console.print(f"[bold cyan]📊 Large File Analysis[/bold cyan] [dim]{file}[/dim]")
+        print_table("Summary", ["Metric", "Value"], [
+            ("Chunks", merger.chunks),
+            ("Word tokens", merger.tokens),
+            ("LLM tokens", merger.llm_tokens),
+            ("Lemma wins", merger.lemma_wins),
+            ("Stem wins", merger.stem_wins),
+        ])
+        console.print(f"[bold green]🏆 Overall Winner:[/bold green] {merger.overall_winner()}")
+        if not out:
+            console.print("[dim]Use --out or --json-output for the full token-level result[/dim]")
+        console.print(f"[dim]⏱️ Total analysis time: {round(time.perf_counter() - start, 3)}s[/dim]")
+
+
+def parse_stages(stages: str | None):
+    if not stages:
+        return None
+    selected = [s.strip().lower() for s in stages.split(",") if s.strip()]
+    try:
+        resolve_stages(selected)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    return selected
+
+
+def checked_documents(source: str, text_field: str):
+    # Malformed corpus input stops the run with the offending source:line
+    try:
+        yield from iter_documents(source, text_field)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def analyze_corpus(source: str, out: Path | None, text_field: str, batch_size: int, scheme: str = "BIO", use_cache: bool = True, stages=None, workers: int = 1, out_format: str = "json", compress: bool = False, tier: str = DEFAULT_TIER):
+    analyzer = TextAnalyzer(scheme, stages, tier, cache=use_cache, batch_size=batch_size)
+    stream = analyzer.analyze_stream(checked_documents(source, text_field), workers=workers)
+
+    if out_format == "columnar":
+        # Failed documents have no layers; only their id is kept
+        write_columnar(out, stream, compress)
+        return
+
+    sink = out.open("w", encoding="utf-8") if out else sys.stdout
+    try:
+        for doc_id, result in stream:
+            sink.write(json.dumps({"id": doc_id, **result}, ensure_ascii=False, default=json_default))
+            sink.write("\n")
+    finally:
+        if out:
+            sink.close()
+
+
 # ----------------------------
 # Helper Functions (UX SAFE)
 # ----------------------------
@@ -40,35 +138,74 @@ def highlight_entity(ent_text: str, ent_label: str):
     return f"[{colors.get(ent_label,'bold white')}]{ent_text}[/{colors.get(ent_label,'bold white')}]"
 
 def print_table(title, columns, rows):
-    table = Table(
-        title=f"[bold cyan]{title}[/bold cyan]",
-        box=box.DOUBLE,
-        show_lines=True,
-        expand=True
+    renderer = state["renderer"] or Renderer(console)
+    renderer.table(title, columns, rows)
+
+def print_profile(metrics):
+    def hit_rate(m):
+        return ", ".join(f"{name} {c['hit_rate']:.0%}" for name, c in m.get("cache", {}).items()) or "-"
+
+    rows = [
+        (name, f"{m['wall_s'] * 1000:.1f}", f"{m['cpu_s'] * 1000:.1f}", m["tokens_per_s"], m.get("peak_memory_kb", "-"), hit_rate(m))
+        for name, m in metrics["stages"].items()
+    ]
+    total = metrics["total"]
+    rows.append(("TOTAL", f"{total['wall_s'] * 1000:.1f}", f"{total['cpu_s'] * 1000:.1f}", total["tokens_per_s"], total.get("peak_memory_kb", "-"), ""))
+    print_table("⏱️ Stage Profile", ["Stage", "Wall ms", "CPU ms", "Tokens/s", "Peak KB", "Memo hit rate"], rows)
+
+# ----------------------------
+# Client mode
+# ----------------------------
+state = {"server": None, "renderer": None}
+
+@app.callback()
+def main(
+    server: str = typer.Option(
+        None, "--server", envvar="TEXT_ANALYZER_SERVER",
+        help="Send work to a running `serve` instance (http://host:port or unix:/path/to.sock)"
+    ),
+    render: str = typer.Option(
+        "auto", "--render", envvar="TEXT_ANALYZER_RENDER",
+        help="Table output: auto (rich on a terminal, tsv otherwise), rich, stream or tsv"
+    ),
+    max_rows: int = typer.Option(
+        None, "--max-rows", envvar="TEXT_ANALYZER_MAX_ROWS",
+        help=f"Rows per table before summarizing (default {DEFAULT_MAX_ROWS} for rich, unlimited otherwise; 0 = all)"
     )
-    for col in columns:
-        table.add_column(col, style="bold white")
-    for row in rows:
-        table.add_row(*map(str, row))
-    console.print(table)
+):
+    state["server"] = server
+    try:
+        state["renderer"] = Renderer(console, render.lower(), max_rows)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+def remote(endpoint: str, text: str, **options):
+    return call(state["server"], endpoint, text, **options)
 
 # ----------------------------
 # CLI Commands
 # ----------------------------
 @app.command()
-def tokenize(text: str, json_output: bool = False):
-    sentences = sentence_tokens(text)
-    words = word_tokens(text)
-    _, llm_count = llm_tokens(text)
-    llm_cost = round(0.00003 * llm_count, 6)  # Estimated cost
+def tokenize(
+    text: str,
+    json_output: bool = False,
+    model: str = typer.Option(DEFAULT_LLM_MODEL, "--model", help="Model (or tiktoken encoding) whose tokens are counted and priced")
+):
+    if state["server"]:
+        data = remote("tokenize", text, model=model)
+        sentences, words, llm_count = data["sentences"], data["words"], data["llm_tokens"]
+    else:
+        data = TextAnalyzer().tokenize(text, model)
+        sentences, words, llm_count = data["sentences"], data["words"], data["llm_tokens"]
+    llm_cost = known_cost(llm_count, model)
 
     if json_output:
-        console.print(json.dumps({
+        emit_json({
             "sentences": sentences,
             "words": words,
             "llm_tokens": llm_count,
             "llm_estimated_cost": llm_cost
-        }, indent=2))
+        })
         return
 
     # ------------------------
@@ -80,31 +217,27 @@ def tokenize(text: str, json_output: bool = False):
                 [(i+1, w) for i, w in enumerate(words)])
 
     console.print(f"[bold green]LLM Tokens:[/bold green] {llm_count}")
-    console.print(f"[bold green]Estimated LLM Cost:[/bold green] ${llm_cost}")
+    cost_text = "n/a" if llm_cost is None else f"${llm_cost}"
+    console.print(f"[bold green]Estimated LLM Cost:[/bold green] {cost_text} [dim]({model})[/dim]")
     console.print("[dim]~1 token ≈ ¾ word ≈ 4 characters[/dim]")
 
 @app.command()
 def pos(text: str, json_output: bool = False):
-    tokens = word_tokens(text)
-    tagged = pos_tag_tokens(tokens)
+    tagged = remote("pos", text) if state["server"] else TextAnalyzer().pos(text)
 
     if json_output:
-        console.print(json.dumps([
-            {"token": w, "pos": p, "description": d} for w, p, d in tagged
-        ], indent=2))
+        emit_json(tagged)
         return
 
-    print_table("POS Tagging", ["Token", "POS", "Description"], tagged)
+    print_table("POS Tagging", ["Token", "POS", "Description"],
+                [(t["token"], t["pos"], t["description"]) for t in tagged])
 
 @app.command()
 def lemmatize(text: str, json_output: bool = False):
-    tokens = word_tokens(text)
-    tagged = pos_tag_tokens(tokens)
-    tagged_simple = [(w, t) for w, t, _ in tagged]
-    lemmas = lemmatize_tokens(tagged_simple)
+    lemmas = remote("lemmatize", text) if state["server"] else TextAnalyzer().lemmatize(text)
 
     if json_output:
-        console.print(json.dumps(lemmas, indent=2))
+        emit_json(lemmas)
         return
 
     rows = [(i["token"], i["pos"], i["lemma"]) for i in lemmas]
@@ -112,11 +245,10 @@ def lemmatize(text: str, json_output: bool = False):
 
 @app.command()
 def stem(text: str, json_output: bool = False):
-    tokens = word_tokens(text)
-    stems = stem_tokens(tokens)
+    stems = remote("stem", text) if state["server"] else TextAnalyzer().stem(text)
 
     if json_output:
-        console.print(json.dumps(stems, indent=2))
+        emit_json(stems)
         return
 
     rows = [
@@ -132,16 +264,23 @@ def stem(text: str, json_output: bool = False):
                 ["Token", "Porter", "Snowball", "Lancaster"], rows)
 
 @app.command()
-def ner(text: str, json_output: bool = False):
-    doc = process_text(text)
-    entities = extract_entities_from_doc(doc)
-    bio_tags = generate_bio_tags_from_doc(doc)
+def ner(
+    text: str,
+    json_output: bool = False,
+    scheme: str = typer.Option("BIO", "--scheme", help="Token tagging scheme: BIO or BILOU")
+):
+    if state["server"]:
+        data = remote("ner", text, scheme=scheme.upper())
+    else:
+        try:
+            data = TextAnalyzer().ner(text, scheme)
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+    entities = data["entities"]
+    bio_tags = [(b["token"], b["tag"]) for b in data["bio_tags"]]
 
     if json_output:
-        console.print(json.dumps({
-            "entities": entities,
-            "bio_tags": [{"token": t, "tag": b} for t, b in bio_tags]
-        }, indent=2))
+        emit_json(data)
         return
 
     if entities:
@@ -156,7 +295,9 @@ def compare(
     text: str = typer.Argument(None, help="Input text to compare stemming vs lemmatization"),
     file: Path = typer.Option(None, "--file", help="Path to input text file"),  # optional
     json_output: bool = False,
-    out: Path = typer.Option(None, "--out", help="Save comparison output JSON to file")
+    out: Path = typer.Option(None, "--out", help="Save comparison output JSON to file"),
+    use_cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse results from the on-disk cache"),
+    compact: bool = typer.Option(False, "--compact", help="Write JSON without indentation")
 ):
     """
     Compare Stemming vs Lemmatization for the given text.
@@ -174,88 +315,27 @@ def compare(
         text = file.read_text(encoding="utf-8")
 
     # ------------------------
-    # Processing
+    # Processing (or cached result)
     # ------------------------
-    tokens = word_tokens(text)
-    tagged = pos_tag_tokens(tokens)
-    tagged_simple = [(w, t) for w, t, _ in tagged]
+    result = cached_result(text, COMPARE_STAGES, TextAnalyzer().compare, use_cache)
 
-    lemmas = lemmatize_tokens(tagged_simple)
-    lemma_map = {item["token"]: item for item in lemmas}
-
-    stems = stem_tokens(tokens)
-
-    rows = []
-    lemma_wins = 0
-    stem_wins = 0
-    stem_valid_words = set()
-    lemma_valid_words = set()
-
-    # ------------------------
-    # Comparison logic
-    # ------------------------
-    for s in stems:
-        word = s["token"]
-        porter = s["porter"]
-        porter_valid = s["porter_valid"]
-
-        lemma = lemma_map[word]["lemma"]
-        lemma_valid = lemma_map[word]["lemma_valid"]
-
-        # STRICT winner logic
-        if porter == lemma:
-            winner = "TIE"
-        elif lemma_valid and not porter_valid:
-            winner = "LEMMA ✅"
-            lemma_wins += 1
-        elif porter_valid and not lemma_valid:
-            winner = "STEM ✅"
-            stem_wins += 1
-        else:
-            winner = "LEMMA ✅"
-            lemma_wins += 1
-
-        # WordNet validity (stats only)
-        if porter_valid:
-            stem_valid_words.add(porter)
-        if lemma_valid:
-            lemma_valid_words.add(lemma)
-
-        rows.append((word, porter, lemma, winner))
-
-    # ------------------------
-    # Save JSON output if requested
-    # ------------------------
-    result = {
-        "input": text,
-        "comparison": [
-            {"token": r[0], "porter": r[1], "lemma": r[2], "winner": r[3]}
-            for r in rows
-        ],
-        "summary": {
-            "lemma_wins": lemma_wins,
-            "stem_wins": stem_wins,
-            "stem_valid_words": list(stem_valid_words),
-            "lemma_valid_words": list(lemma_valid_words),
-            "overall_winner": (
-                "Lemmatization 🏆" if lemma_wins > stem_wins else
-                "Stemming 🏆" if stem_wins > lemma_wins else
-                "Tie 🤝"
-            )
-        }
-    }
+    rows = [(r["token"], r["porter"], r["lemma"], r["winner"]) for r in result["comparison"]]
+    summary = result["summary"]
+    lemma_wins = summary["lemma_wins"]
+    stem_wins = summary["stem_wins"]
+    stem_valid_words = summary["stem_valid_words"]
+    lemma_valid_words = summary["lemma_valid_words"]
 
+    if json_output or out:
+        emit_json(result, out, to_stdout=json_output, compact=compact)
     if json_output:
-        console.print(json.dumps(result, indent=2))
-        if out:
-            out.write_text(json.dumps(result, indent=2), encoding="utf-8")
         return
 
     # ------------------------
     # Rich CLI output
     # ------------------------
     console.print("[bold cyan]⚖️ Stemming vs Lemmatization Comparison[/bold cyan]")
-    console.print(f"[bold]Input:[/bold] {text}")
+    console.print(f"[bold]Input:[/bold] {preview(text)}")
 
     print_table(
         "🔬 Stemming vs Lemmatization",
@@ -267,130 +347,102 @@ def compare(
     console.print(f"  [cyan]Lemma wins:[/cyan] {lemma_wins}")
     console.print(f"  [green]Stem wins:[/green] {stem_wins}")
 
-    overall = "Lemmatization 🏆" if lemma_wins > stem_wins else "Stemming 🏆" if stem_wins > lemma_wins else "Tie 🤝"
-    console.print(f"\n[bold green]🏆 Overall Winner:[/bold green] {overall}")
+    console.print(f"\n[bold green]🏆 Overall Winner:[/bold green] {summary['overall_winner']}")
 
     console.print("\n[bold]📊 Valid English Words (WordNet)[/bold]")
     console.print(f"  [green]Porter stems found:[/green] {len(stem_valid_words)}")
     console.print(f"  [cyan]Lemmas found:[/cyan] {len(lemma_valid_words)}")
 
-    # ------------------------
-    # Save to file if requested
-    # ------------------------
-    if out:
-        out.write_text(json.dumps(result, indent=2), encoding="utf-8")
-
 
 @app.command()
 def analyze(
     text: str = typer.Argument(None),
     file: Path = typer.Option(None, "--file", help="Path to input text file"),
     json_output: bool = False,
-    out: Path = typer.Option(None, "--out", help="Save output JSON to file")
+    out: Path = typer.Option(None, "--out", help="Save output JSON to file"),
+    corpus: str = typer.Option(None, "--corpus", help="Directory, glob, JSONL file or '-' (stdin JSONL) to analyze as a corpus"),
+    text_field: str = typer.Option("text", "--text-field", help="JSONL field holding the document text"),
+    batch_size: int = typer.Option(64, "--batch-size", help="Documents per spaCy batch in corpus mode"),
+    scheme: str = typer.Option("BIO", "--scheme", help="Token tagging scheme: BIO or BILOU"),
+    use_cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse results from the on-disk cache"),
+    compact: bool = typer.Option(False, "--compact", help="Write JSON without indentation"),
+    large: bool = typer.Option(False, "--large", help="Memory-map --file and analyze it in sentence-aligned chunks"),
+    chunk_size: int = typer.Option(DEFAULT_CHUNK_BYTES, "--chunk-size", help="Approximate chunk size in bytes for --large"),
+    workers: int = typer.Option(1, "--workers", help="Worker processes for --corpus documents or --large chunks"),
+    profile: bool = typer.Option(False, "--profile", help="Record per-stage metrics under `metrics` (runs locally, bypasses the cache)"),
+    profile_dir: Path = typer.Option(None, "--profile-dir", help="With --profile, dump a cProfile file per stage here"),
+    stages: str = typer.Option(None, "--stages", help=f"Comma-separated stages to run ({', '.join(STAGE_GRAPH)}); dependencies are added automatically"),
+    out_format: str = typer.Option("json", "--format", help="Format of --out: json or columnar (dictionary-encoded binary)"),
+    compress: bool = typer.Option(False, "--compress", help="zlib-compress columns with --format columnar"),
+    incremental: bool = typer.Option(False, "--incremental", help="Reuse cached per-sentence results; only new or edited sentences are re-analyzed"),
+    tier: str = typer.Option(DEFAULT_TIER, "--tier", help=f"Backend tier: {', '.join(TIERS)} (see benchmarks/tiers.py for speed vs. agreement)")
 ):
-    start_total = time.time()
-
-    # ------------------------
-    # Read input (CLI or file)
-    # ------------------------
-    text = read_input_text(text, file)
+    start_total = time.perf_counter()
 
     # ------------------------
-    # Build result dictionary
+    # Large-file mode: chunked, offsets merged back to global positions
     # ------------------------
-    result = {}
-
-    sentences = sentence_tokens(text)
-    words = word_tokens(text)
-    _, llm_count = llm_tokens(text)
-
-    result["tokenization"] = {
-        "sentences": sentences,
-        "words": words,
-        "llm_tokens": llm_count,
-        "llm_estimated_cost": round(0.00003 * llm_count, 6)
-    }
-
-    tagged = pos_tag_tokens(words)
-    tagged_simple = [(w, t) for w, t, _ in tagged]
-    lemmas = lemmatize_tokens(tagged_simple)
-    result["pos_lemmatization"] = lemmas
-
-    stems = stem_tokens(words)
-    result["stemming"] = stems
+    selected = parse_stages(stages)
+    tier = tier.lower()
+    if tier not in TIERS:
+        raise typer.BadParameter(f"--tier must be one of: {', '.join(TIERS)}")
+    out_format = out_format.lower()
+    if out_format not in OUTPUT_FORMATS:
+        raise typer.BadParameter(f"--format must be one of: {', '.join(OUTPUT_FORMATS)}")
+    if out_format == "columnar" and not out:
+        raise typer.BadParameter("--format columnar needs --out")
+
+    if large:
+        if not file:
+            raise typer.BadParameter("--large needs --file")
+        if selected:
+            raise typer.BadParameter("--stages is not supported with --large")
+        if tier != DEFAULT_TIER:
+            raise typer.BadParameter("--large always uses the accurate tier")
+        analyze_large_file(file, out, json_output, compact, chunk_size, workers, out_format, compress, scheme.upper())
+        return
 
     # ------------------------
-    # NEW: Stemming vs Lemmatization comparison
+    # Corpus mode: one NDJSON line per document
     # ------------------------
-    lemma_map = {l["token"]: l for l in lemmas}
-    comparison_rows = []
-
-    lemma_wins = 0
-    stem_wins = 0
-
-    for s in stems:
-        token = s["token"]
-        porter = s["porter"]
-        porter_valid = s["porter_valid"]
-
-        lemma = lemma_map[token]["lemma"]
-        lemma_valid = lemma_map[token]["lemma_valid"]
-
-        if porter == lemma:
-            winner = "TIE"
-        elif lemma_valid and not porter_valid:
-            winner = "LEMMA"
-            lemma_wins += 1
-        elif porter_valid and not lemma_valid:
-            winner = "STEM"
-            stem_wins += 1
-        else:
-            winner = "LEMMA"
-            lemma_wins += 1
-
-        comparison_rows.append({
-            "token": token,
-            "porter": porter,
-            "lemma": lemma,
-            "winner": winner
-        })
-
-    overall_winner = (
-        "Lemmatization"
-        if lemma_wins > stem_wins
-        else "Stemming"
-        if stem_wins > lemma_wins
-        else "Tie"
-    )
-
-    result["stem_vs_lemma_comparison"] = {
-        "rows": comparison_rows,
-        "lemma_wins": lemma_wins,
-        "stem_wins": stem_wins,
-        "overall_winner": overall_winner
-    }
+    if corpus:
+        analyze_corpus(corpus, out, text_field, batch_size, scheme.upper(), use_cache, selected, workers, out_format, compress, tier)
+        return
 
     # ------------------------
-    # NER + BIO tagging
+    # Read input (CLI or file)
     # ------------------------
-    doc = process_text(text)
-    result["named_entities"] = extract_entities_from_doc(doc)
-    result["bio_tags"] = [
-        {"token": t, "tag": b}
-        for t, b in generate_bio_tags_from_doc(doc)
-    ]
+    text = read_input_text(text, file)
 
     # ------------------------
-    # Save JSON to file
+    # Build result dictionary
     # ------------------------
-    if out:
-        out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    scheme = scheme.upper()
+    reused = None
+    if incremental:
+        if selected or profile or tier != DEFAULT_TIER:
+            raise typer.BadParameter("--incremental runs every stage on the accurate tier and cannot be combined with --stages, --profile or --tier")
+        if not use_cache:
+            raise typer.BadParameter("--incremental reuses sentences from the result cache and cannot be combined with --no-cache")
+        result, reused = TextAnalyzer(scheme).analyze_incremental(text)
+    elif profile:
+        profiler = Profiler(cprofile_dir=profile_dir)
+        try:
+            result = TextAnalyzer(scheme, selected, tier).analyze(text, profiler=profiler)
+        finally:
+            profiler.close()
+    else:
+        if state["server"]:
+            compute = lambda t: remote("analyze", t, scheme=scheme, stages=selected, tier=tier)
+        else:
+            compute = TextAnalyzer(scheme, selected, tier).analyze
+        result = cached_result(text, stage_sections(selected), compute, use_cache, scheme=scheme, tier=tier)
 
     # ------------------------
-    # JSON-only output
+    # Stream JSON to --out and/or stdout (one serialization pass), or columnar --out
     # ------------------------
+    write_output(lambda: result, out, json_output, compact, out_format, compress)
     if json_output:
-        console.print(json.dumps(result, indent=2))
         return
 
     # ------------------------
@@ -398,59 +450,63 @@ def analyze(
     # ------------------------
     console.print(
         f"[bold cyan]📊 Full Text Analysis[/bold cyan]\n"
-        f"[bold]Input:[/bold] {text}"
+        f"[bold]Input:[/bold] {preview(text)}"
     )
 
-    print_table(
-        "Sentence Tokens",
-        ["#", "Sentence"],
-        [(i + 1, s) for i, s in enumerate(sentences)]
-    )
+    if "tokenization" in result:
+        print_table(
+            "Sentence Tokens",
+            ["#", "Sentence"],
+            [(i + 1, s) for i, s in enumerate(result["tokenization"]["sentences"])]
+        )
 
-    print_table(
-        "Word Tokens",
-        ["#", "Token"],
-        [(i + 1, w) for i, w in enumerate(words)]
-    )
+        print_table(
+            "Word Tokens",
+            ["#", "Token"],
+            [(i + 1, w) for i, w in enumerate(result["tokenization"]["words"])]
+        )
 
-    print_table(
-        "POS + Lemmatization",
-        ["Token", "POS", "Lemma"],
-        [(i["token"], i["pos"], i["lemma"]) for i in lemmas]
-    )
+    if "pos_lemmatization" in result:
+        print_table(
+            "POS + Lemmatization",
+            ["Token", "POS", "Lemma"],
+            [(i["token"], i["pos"], i["lemma"]) for i in result["pos_lemmatization"]]
+        )
 
-    print_table(
-        "Stemming Comparison",
-        ["Token", "Porter", "Snowball", "Lancaster"],
-        [
-            (
-                s["token"],
-                fmt_stem(s["porter"], s["porter_valid"]),
-                fmt_stem(s["snowball"], s["snowball_valid"]),
-                fmt_stem(s["lancaster"], s["lancaster_valid"]),
-            )
-            for s in stems
-        ]
-    )
+    if "stemming" in result:
+        print_table(
+            "Stemming Comparison",
+            ["Token", "Porter", "Snowball", "Lancaster"],
+            [
+                (
+                    s["token"],
+                    fmt_stem(s["porter"], s["porter_valid"]),
+                    fmt_stem(s["snowball"], s["snowball_valid"]),
+                    fmt_stem(s["lancaster"], s["lancaster_valid"]),
+                )
+                for s in result["stemming"]
+            ]
+        )
 
     # ------------------------
     # NEW: Compare table output
     # ------------------------
-    print_table(
-        "Stemming vs Lemmatization (Winner-based)",
-        ["Token", "Porter Stem", "Lemma", "Winner"],
-        [
-            (r["token"], r["porter"], r["lemma"], r["winner"])
-            for r in result["stem_vs_lemma_comparison"]["rows"]
-        ]
-    )
+    if "stem_vs_lemma_comparison" in result:
+        print_table(
+            "Stemming vs Lemmatization (Winner-based)",
+            ["Token", "Porter Stem", "Lemma", "Winner"],
+            [
+                (r["token"], r["porter"], r["lemma"], r["winner"])
+                for r in result["stem_vs_lemma_comparison"]["rows"]
+            ]
+        )
 
-    console.print(
-        f"[bold green]🏆 Overall Winner:[/bold green] "
-        f"{result['stem_vs_lemma_comparison']['overall_winner']}"
-    )
+        console.print(
+            f"[bold green]🏆 Overall Winner:[/bold green] "
+            f"{result['stem_vs_lemma_comparison']['overall_winner']}"
+        )
 
-    if result["named_entities"]:
+    if result.get("named_entities"):
         print_table(
             "Named Entities",
             ["Entity", "Label"],
@@ -460,18 +516,248 @@ def analyze(
             ]
         )
 
-    if result["bio_tags"]:
+    if result.get("bio_tags"):
         print_table(
             "BIO Tagging",
             ["Token", "BIO Tag"],
             [(b["token"], b["tag"]) for b in result["bio_tags"]]
         )
 
+    if "metrics" in result:
+        print_profile(result["metrics"])
+
+    if reused is not None:
+        total = len(result["tokenization"]["sentences"])
+        console.print(f"[dim]♻️ Reused {reused}/{total} sentences, re-analyzed {total - reused}[/dim]")
+
     console.print(
         f"[dim]⏱️ Total analysis time: "
-        f"{round(time.time() - start_total, 3)}s[/dim]"
+        f"{round(time.perf_counter() - start_total, 3)}s[/dim]"
     )
 
 
+# ----------------------------
+# LLM token budgets
+# ----------------------------
+@app.command()
+def chunk(
+    text: str = typer.Argument(None),
+    file: Path = typer.Option(None, "--file", help="Path to input text file"),
+    corpus: str = typer.Option(None, "--corpus", help="Directory, glob, JSONL file or '-' (stdin JSONL); writes one JSON line per chunk"),
+    text_field: str = typer.Option("text", "--text-field", help="JSONL field holding the document text"),
+    max_tokens: int = typer.Option(512, "--max-tokens", help="Token budget per chunk"),
+    overlap: int = typer.Option(0, "--overlap", help="Tokens of whole sentences repeated from the previous chunk"),
+    model: str = typer.Option(DEFAULT_LLM_MODEL, "--model", help="Model or tiktoken encoding (cl100k_base, o200k_base, ...)"),
+    out: Path = typer.Option(None, "--out", help="Write chunks here (JSON, or JSON lines with --corpus)"),
+    json_output: bool = False
+):
+    """
+    Split text into chunks under a token budget, at sentence boundaries.
+    """
+    from app.chunker import chunk_documents, chunk_text
+
+    try:
+        if corpus:
+            sink = out.open("w", encoding="utf-8") if out else sys.stdout
+            try:
+                for doc_id, piece in chunk_documents(iter_documents(corpus, text_field), max_tokens, overlap, model):
+                    sink.write(json.dumps({"id": doc_id, **piece}, ensure_ascii=False))
+                    sink.write("\n")
+            finally:
+                if out:
+                    sink.close()
+            return
+
+        chunks = chunk_text(read_input_text(text, file), max_tokens, overlap, model)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    if json_output or out:
+        emit_json(chunks, out, to_stdout=json_output)
+        if json_output:
+            return
+
+    print_table(f"Chunks (≤ {max_tokens} tokens, {model})", ["#", "Tokens", "Start", "End", "Text"], [
+        (c["index"] + 1, c["tokens"], c["start"], c["end"], preview(c["text"], 80)) for c in chunks
+    ])
+
+
+@app.command()
+def count(
+    corpus: str = typer.Argument(..., help="Directory, glob, JSONL file or '-' (stdin JSONL)"),
+    text_field: str = typer.Option("text", "--text-field", help="JSONL field holding the document text"),
+    model: list[str] = typer.Option(None, "--model", help="Model to count and price (repeatable)"),
+    batch_size: int = typer.Option(1000, "--batch-size", help="Documents encoded per batch"),
+    threads: int = typer.Option(8, "--threads", help="tiktoken encoder threads"),
+    json_output: bool = False
+):
+    """
+    Corpus-wide LLM token counts and input cost for one or more models.
+    Models sharing an encoding are counted in one pass.
+    """
+    models = model or [DEFAULT_LLM_MODEL]
+    texts = (text for _, text in iter_documents(corpus, text_field))
+    totals = llm_token_totals(texts, models, num_threads=threads, batch_size=batch_size)
+
+    rows = [
+        {
+            "model": name,
+            "encoding": get_encoder(name).name,
+            "tokens": tokens,
+            "estimated_cost": known_cost(tokens, name),
+        }
+        for name, tokens in totals["tokens"].items()
+    ]
+    if json_output:
+        emit_json({"documents": totals["documents"], "models": rows})
+        return
+
+    print_table(f"LLM Tokens ({totals['documents']:,} documents)", ["Model", "Encoding", "Tokens", "Est. input cost"], [
+        (r["model"], r["encoding"], f"{r['tokens']:,}", "n/a" if r["estimated_cost"] is None else f"${r['estimated_cost']:,.4f}")
+        for r in rows
+    ])
+
+
+# ----------------------------
+# Corpus statistics
+# ----------------------------
+@app.command()
+def stats(
+    corpus: str = typer.Argument(None, help="Directory, glob, JSONL file or '-' (stdin JSONL)"),
+    text_field: str = typer.Option("text", "--text-field", help="JSONL field holding the document text"),
+    batch_size: int = typer.Option(64, "--batch-size", help="Documents per batch"),
+    workers: int = typer.Option(1, "--workers", help="Worker processes; each aggregates its own shard"),
+    top: int = typer.Option(20, "--top", help="Rows in the frequency tables"),
+    save: Path = typer.Option(None, "--save", help="Write the mergeable aggregate as JSON"),
+    merge: list[Path] = typer.Option(None, "--merge", help="Aggregate saved with --save to fold in (repeatable)"),
+    json_output: bool = False
+):
+    """
+    Corpus-wide frequencies, entity labels, stem/lemma win rates, WordNet
+    coverage and LLM-token histogram. Shards saved with --save can be
+    combined later with --merge.
+    """
+    # numpy is only needed here, so it is imported on demand
+    from app.stats import CorpusStats, collect_stats
+
+    if not corpus and not merge:
+        raise typer.BadParameter("Provide a CORPUS and/or --merge files")
+
+    aggregate = collect_stats(iter_documents(corpus, text_field), workers, batch_size) if corpus else CorpusStats()
+    for path in merge or []:
+        aggregate.merge(CorpusStats.from_dict(json.loads(path.read_text(encoding="utf-8"))))
+
+    if save:
+        save.write_text(json.dumps(aggregate.to_dict(), ensure_ascii=False), encoding="utf-8")
+
+    summary = aggregate.summary(top)
+    if json_output:
+        emit_json(summary)
+        return
+
+    print_table("📊 Corpus Summary", ["Metric", "Value"], [
+        ("Documents", summary["documents"]),
+        ("Tokens", summary["tokens"]),
+        ("Unique terms", summary["unique_terms"]),
+        ("LLM tokens", summary["llm_tokens"]),
+        ("Lemma / Stem / Tie win rate", " / ".join(f"{summary['win_rates'][k]:.1%}" for k in ("lemma", "stem", "tie"))),
+        ("WordNet coverage (lemma / stem)", " / ".join(f"{summary['wordnet_coverage'][k]:.1%}" for k in ("lemma", "stem"))),
+    ])
+    for title, key in (("Top Terms", "top_terms"), ("Top Lemmas", "top_lemmas"), ("Top Porter Stems", "top_stems")):
+        print_table(title, ["Rank", "Value", "Count"], [(i + 1, v, n) for i, (v, n) in enumerate(summary[key])])
+    print_table("Entity Labels", ["Label", "Count", "Share"], [(l, n, f"{share:.1%}") for l, n, share in summary["entity_labels"]])
+    print_table("LLM Tokens per Document", ["LLM tokens", "Documents"], [(h["llm_tokens"], h["documents"]) for h in summary["llm_token_histogram"]])
+
+
+# ----------------------------
+# Result cache management
+# ----------------------------
+cache_app = typer.Typer(help="Inspect or clear the on-disk result cache")
+app.add_typer(cache_app, name="cache")
+
+@cache_app.command("stats")
+def cache_stats(json_output: bool = False):
+    stats = ResultCache().stats()
+    if json_output:
+        emit_json(stats)
+        return
+    print_table("Result Cache", ["Metric", "Value"], list(stats.items()))
+
+@cache_app.command("clear")
+def cache_clear():
+    removed = ResultCache().clear()
+    console.print(f"[bold green]Removed {removed} cached results[/bold green]")
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host"),
+    port: int = typer.Option(8765, "--port"),
+    socket: str = typer.Option(None, "--socket", help="Listen on a Unix socket instead of TCP"),
+    window_ms: float = typer.Option(DEFAULT_WINDOW_MS, "--window-ms", help="Micro-batch collection window"),
+    max_batch: int = typer.Option(DEFAULT_MAX_BATCH, "--max-batch", help="Largest micro-batch")
+):
+    """
+    Run a local analysis server with all models kept warm.
+
+    POST {"text": ...} to /analyze, /ner, /pos, /stem, /lemmatize, /tokenize or /tokens.
+    Requests arriving within --window-ms are processed as one batch.
+    """
+    console.print("[dim]Loading models...[/dim]")
+    warm()
+    server = make_server(AnalysisService(window_ms, max_batch), host, port, socket)
+    address = f"unix:{socket}" if socket else f"http://{host}:{port}"
+    console.print(f"[bold green]Serving on[/bold green] {address}  [dim](use --server {address})[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@app.command("index-wordnet")
+def index_wordnet(
+    out: Path = typer.Argument(..., help="Where to write the WordNet vocabulary index")
+):
+    """
+    Precompile WordNet lemma names into a sorted, memory-mappable index.
+
+    Point TEXT_ANALYZER_WORDNET_INDEX at the file to share it across processes.
+    Set TEXT_ANALYZER_WORDNET_EXACT=1 to keep full morphy semantics for validity checks.
+    """
+    count = save_vocabulary(out)
+    console.print(f"[bold green]Indexed {count} WordNet lemma names →[/bold green] {out}")
+
+
+@app.command("build-lexicon")
+def build_lexicon_command(
+    out: Path = typer.Argument(..., help="Where to write the lexicon"),
+    vocab: Path = typer.Option(None, "--vocab", help="Vocabulary file, one word per line"),
+    corpus: str = typer.Option(None, "--corpus", help="Directory, glob, JSONL file or '-' to scan for words"),
+    text_field: str = typer.Option("text", "--text-field", help="JSONL field holding the document text")
+):
+    """
+    Precompute Porter/Snowball/Lancaster stems, per-POS WordNet lemmas and
+    validity flags into a read-only, memory-mappable lexicon.
+
+    Point TEXT_ANALYZER_LEXICON at the file; stem/lemmatize then only run
+    NLTK for words missing from it. Without --vocab or --corpus, every
+    WordNet lemma name is included.
+    """
+    from app.lexicon import build_lexicon, scan_vocabulary
+
+    words = set()
+    if vocab:
+        words.update(line.strip() for line in vocab.read_text(encoding="utf-8").splitlines())
+    if corpus:
+        words.update(scan_vocabulary(iter_documents(corpus, text_field)))
+    if not vocab and not corpus:
+        words.update(build_vocabulary())
+
+    count = build_lexicon(out, words)
+    console.print(f"[bold green]Wrote {count} lexicon entries →[/bold green] {out}")
+
+
 if __name__ == "__main__":
     app()
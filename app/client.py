@@ -0,0 +1,40 @@
+import http.client
+import json
+import socket
+from urllib.parse import urlparse
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def connect(address: str, timeout: float | None = 60):
+    # `address` is `http://host:port` or `unix:/path/to/socket`
+    if address.startswith("unix:"):
+        return UnixHTTPConnection(address[len("unix:"):], timeout=timeout)
+    parsed = urlparse(address if "://" in address else f"http://{address}")
+    return http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=timeout)
+
+
+def call(address: str, endpoint: str, text: str, **options):
+    conn = connect(address)
+    try:
+        body = json.dumps({"text": text, **options}).encode("utf-8")
+        conn.request("POST", f"/{endpoint}", body=body, headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        payload = json.loads(response.read() or b"null")
+    finally:
+        conn.close()
+
+    if response.status != 200:
+        message = payload.get("error") if isinstance(payload, dict) else payload
+        raise RuntimeError(f"Server error ({response.status}): {message}")
+    return payload
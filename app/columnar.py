@@ -0,0 +1,400 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+
+from app.token_table import Bitmap
+
+# The format version lives in the footer only
+MAGIC = b"TACOL\0\0\0"
+FORMAT_VERSION = 2
+# Documents per row group; the writer holds at most one group in memory
+DEFAULT_GROUP_DOCUMENTS = 1000
+_TRAILER = struct.Struct("<Q")
+
+# layer -> (result section, [(column, row key, kind)]); kinds: str (dictionary
+# encoded), int, bool (bitmap). Token-aligned layers drop their repeated "token"
+# key, which lives once in the `tokens` layer.
+LAYERS = {
+    "tokens": None,  # token / start / end, built from `tokenization.words` and `word_offsets`
+    "sentences": ("tokenization", [("text", None, "str")]),
+    "lemmas": ("pos_lemmatization", [("pos", "pos", "str"), ("lemma", "lemma", "str"), ("lemma_valid", "lemma_valid", "bool")]),
+    "stems": ("stemming", [
+        ("porter", "porter", "str"), ("snowball", "snowball", "str"), ("lancaster", "lancaster", "str"),
+        ("porter_valid", "porter_valid", "bool"), ("snowball_valid", "snowball_valid", "bool"),
+        ("lancaster_valid", "lancaster_valid", "bool"),
+    ]),
+    "comparison": ("stem_vs_lemma_comparison", [("winner", "winner", "str")]),
+    "entities": ("named_entities", [("text", "text", "str"), ("label", "label", "str"), ("start", "start", "int"), ("end", "end", "int")]),
+    "bio": ("bio_tags", [("tag", "tag", "str")]),
+}
+
+# Per-document summary columns; `error` is "" unless the document failed
+SUMMARY = (("llm_tokens", "int"), ("lemma_wins", "int"), ("stem_wins", "int"), ("overall_winner", "str"), ("error", "str"))
+
+
+# ----------------------------
+# Writer
+# ----------------------------
+class _Column:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.count = 0
+        if kind == "str":
+            self.dictionary = {}
+            self.values = array("I")
+        elif kind == "int":
+            self.values = array("q")
+        else:
+            self.values = bytearray()
+
+    def append(self, value):
+        if self.kind == "str":
+            code = self.dictionary.get(value)
+            if code is None:
+                code = self.dictionary[value] = len(self.dictionary)
+            self.values.append(code)
+        elif self.kind == "int":
+            self.values.append(value)
+        else:
+            self.values.append(1 if value else 0)
+        self.count += 1
+
+
+def _narrow(values: array, signed: bool) -> array:
+    # Smallest typecode that holds every value
+    low, high = (min(values), max(values)) if values else (0, 0)
+    for code in ("bhiq" if signed else "BHIQ"):
+        bits = array(code).itemsize * 8
+        lo, hi = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if signed else (0, (1 << bits) - 1)
+        if lo <= low and high <= hi:
+            return array(code, values)
+    return values
+
+
+class _Group:
+    """Columns of the documents buffered since the last row group was written."""
+
+    def __init__(self):
+        self.ids = _Column("str")
+        self.summary = {name: _Column(kind) for name, kind in SUMMARY}
+        self.layers = {}
+        self.offsets = {}
+        self.documents = 0
+
+    def layer(self, name: str, columns):
+        if name not in self.layers:
+            self.layers[name] = {column: _Column(kind) for column, kind in columns}
+            # Documents of this group added before the layer first appeared have no rows in it
+            self.offsets[name] = array("q", [0] * (self.documents + 1))
+        return self.layers[name]
+
+
+class ColumnarWriter:
+    """
+    Writes `analyze` results (one or many documents) as a columnar file.
+
+    Strings are dictionary-encoded per column, integers stored in the
+    narrowest width, flags as bitmaps; every layer carries per-document
+    offsets. Documents are written in row groups of `group_documents`, so
+    memory stays bounded by one group however long the corpus is; a JSON
+    footer indexes the groups' column blobs so `ColumnarReader` can
+    memory-map the file and decode a single layer (or document).
+    `compress` zlib-compresses each blob separately.
+    """
+
+    def __init__(self, path, compress: bool = False, group_documents: int = DEFAULT_GROUP_DOCUMENTS):
+        self.path = path
+        self.compress = compress
+        self.group_documents = group_documents
+        self.documents = 0
+        self._layer_names = {}
+        self._groups = []
+        self._group = _Group()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+
+    def add(self, result: dict, doc_id=None):
+        group = self._group
+        group.ids.append("" if doc_id is None else str(doc_id))
+
+        tokenization = result.get("tokenization")
+        comparison = result.get("stem_vs_lemma_comparison") or {}
+        summary = {
+            "llm_tokens": tokenization["llm_tokens"] if tokenization else 0,
+            "lemma_wins": comparison.get("lemma_wins", 0),
+            "stem_wins": comparison.get("stem_wins", 0),
+            "overall_winner": comparison.get("overall_winner", ""),
+            "error": result.get("error") or "",
+        }
+        for name, column in group.summary.items():
+            column.append(summary[name])
+
+        if tokenization:
+            columns = group.layer("tokens", [("token", "str"), ("start", "int"), ("end", "int")])
+            for token, (start, end) in zip(tokenization["words"], tokenization["word_offsets"]):
+                columns["token"].append(token)
+                columns["start"].append(start)
+                columns["end"].append(end)
+
+        for layer, spec in LAYERS.items():
+            if spec is None or spec[0] not in result:
+                continue
+            section, fields = spec
+            rows = result[section]
+            if layer == "sentences":
+                rows = ({"text": text} for text in rows["sentences"])
+            elif layer == "comparison":
+                rows = rows["rows"]
+
+            columns = group.layer(layer, [(column, kind) for column, _, kind in fields])
+            keys = [(columns[column], key or column) for column, key, _ in fields]
+            for row in rows:
+                for column, key in keys:
+                    column.append(row[key])
+
+        group.documents += 1
+        self.documents += 1
+        for name, columns in group.layers.items():
+            self._layer_names.setdefault(name, None)
+            group.offsets[name].append(next(iter(columns.values())).count)
+
+        if group.documents >= self.group_documents:
+            self._flush()
+
+    def _flush(self):
+        # Write the buffered group's blobs and keep only their index
+        group = self._group
+        if not group.documents:
+            return
+        f = self._file
+        self._groups.append({
+            "documents": group.documents,
+            "ids": self._write_column(f, group.ids),
+            "summary": {name: self._write_column(f, c) for name, c in group.summary.items()},
+            "layers": {
+                name: {
+                    "offsets": self._write_column(f, _IntValues(group.offsets[name])),
+                    "columns": {column: self._write_column(f, c) for column, c in columns.items()},
+                }
+                for name, columns in group.layers.items()
+            },
+        })
+        f.flush()
+        self._group = _Group()
+
+    def _blob(self, f, data: bytes) -> dict:
+        compressed = self.compress and len(data) > 64
+        if compressed:
+            data = zlib.compress(data)
+        spec = {"offset": f.tell(), "length": len(data), "compressed": compressed}
+        f.write(data)
+        return spec
+
+    def _write_column(self, f, column: _Column) -> dict:
+        spec = {"kind": column.kind, "count": column.count}
+        if column.kind == "str":
+            values = list(column.dictionary)
+            encoded = [v.encode("utf-8") for v in values]
+            ends = array("q", [0])
+            for item in encoded:
+                ends.append(ends[-1] + len(item))
+            ends = _narrow(ends, signed=False)
+            codes = _narrow(column.values, signed=False)
+            spec["dictionary"] = {
+                "count": len(values),
+                "typecode": ends.typecode,
+                "offsets": self._blob(f, ends.tobytes()),
+                "data": self._blob(f, b"".join(encoded)),
+            }
+            spec["typecode"] = codes.typecode
+            spec["data"] = self._blob(f, codes.tobytes())
+        elif column.kind == "int":
+            values = _narrow(column.values, signed=True)
+            spec["typecode"] = values.typecode
+            spec["data"] = self._blob(f, values.tobytes())
+        else:
+            spec["data"] = self._blob(f, Bitmap(column.values).to_bytes())
+        return spec
+
+    def close(self):
+        self._flush()
+        f = self._file
+        footer = {
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "documents": self.documents,
+            "layers": list(self._layer_names),
+            "groups": self._groups,
+        }
+        position = f.tell()
+        f.write(json.dumps(footer, separators=(",", ":")).encode("utf-8"))
+        f.write(_TRAILER.pack(position))
+        f.write(MAGIC)
+        f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            # Don't leave a truncated file behind
+            self._file.close()
+            os.remove(self.path)
+
+
+class _IntValues(_Column):
+    def __init__(self, values: array):
+        self.kind = "int"
+        self.values = values
+        self.count = len(values)
+
+
+def write_columnar(path, results, compress: bool = False, group_documents: int = DEFAULT_GROUP_DOCUMENTS) -> int:
+    """Write `(doc_id, result)` pairs to `path`; returns the number of documents."""
+    with ColumnarWriter(path, compress, group_documents) as writer:
+        for doc_id, result in results:
+            writer.add(result, doc_id)
+    return writer.documents
+
+
+# ----------------------------
+# Reader
+# ----------------------------
+class ColumnarReader:
+    """
+    Memory-maps a columnar file; only the blobs of the columns you ask for
+    are read (and decompressed).
+
+        with ColumnarReader("result.tacol") as reader:
+            stems = reader.layer("stems")              # whole file
+            entities = reader.layer("entities", doc=3)  # one document
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map)
+        tail = len(MAGIC) + _TRAILER.size
+        if size < len(MAGIC) + tail or self._map[:len(MAGIC)] != MAGIC or self._map[size - len(MAGIC):] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a columnar analysis file")
+        (position,) = _TRAILER.unpack(self._map[size - tail:size - len(MAGIC)])
+        self.footer = json.loads(self._map[position:size - tail])
+        if self.footer.get("version") != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} has columnar format version {self.footer.get('version')}, expected {FORMAT_VERSION}")
+        self._swap = self.footer["byteorder"] != sys.byteorder
+        self._groups = self.footer["groups"]
+        # First document of each row group
+        self._starts = [0]
+        for group in self._groups:
+            self._starts.append(self._starts[-1] + group["documents"])
+        self._offsets = {}
+
+    @property
+    def documents(self) -> int:
+        return self.footer["documents"]
+
+    def layers(self) -> list[str]:
+        return list(self.footer["layers"])
+
+    def _locate(self, doc: int):
+        # (row group, document index within it)
+        if not 0 <= doc < self.documents:
+            raise IndexError(f"Document {doc} out of range (file has {self.documents})")
+        group = bisect_right(self._starts, doc) - 1
+        return group, doc - self._starts[group]
+
+    def _bytes(self, spec: dict):
+        data = self._map[spec["offset"]:spec["offset"] + spec["length"]]
+        return zlib.decompress(data) if spec["compressed"] else data
+
+    def _array(self, typecode: str, spec: dict, start: int = 0, end: int | None = None) -> array:
+        values = array(typecode)
+        if spec["compressed"]:
+            values.frombytes(self._bytes(spec))
+            values = values[start:end]
+        else:
+            # Uncompressed: read just the requested slice out of the map
+            first = spec["offset"] + start * values.itemsize
+            last = spec["offset"] + spec["length"] if end is None else spec["offset"] + end * values.itemsize
+            values.frombytes(self._map[first:last])
+        if self._swap:
+            values.byteswap()
+        return values
+
+    def _decode(self, spec: dict, start: int = 0, end: int | None = None) -> list:
+        if spec["kind"] == "bool":
+            return list(Bitmap.from_bytes(self._bytes(spec["data"]), spec["count"]))[start:end]
+
+        values = self._array(spec["typecode"], spec["data"], start, end)
+        if spec["kind"] == "int":
+            return values.tolist()
+
+        dictionary = spec["dictionary"]
+        ends = self._array(dictionary["typecode"], dictionary["offsets"])
+        data = self._bytes(dictionary["data"])
+        strings = [bytes(data[ends[i]:ends[i + 1]]).decode("utf-8") for i in range(dictionary["count"])]
+        return [strings[code] for code in values]
+
+    def _layer_offsets(self, group: int, name: str):
+        key = (group, name)
+        if key not in self._offsets:
+            self._offsets[key] = self._decode(self._groups[group]["layers"][name]["offsets"])
+        return self._offsets[key]
+
+    def _columns(self, layer: str) -> list[str]:
+        if layer not in self.footer["layers"]:
+            raise KeyError(f"No layer {layer!r} in file (has: {', '.join(self.layers())})")
+        return next(list(g["layers"][layer]["columns"]) for g in self._groups if layer in g["layers"])
+
+    def column(self, layer: str, column: str, doc: int | None = None) -> list:
+        if column not in self._columns(layer):
+            raise KeyError(f"No column {column!r} in layer {layer!r}")
+        if doc is None:
+            values = []
+            for group in self._groups:
+                if layer in group["layers"]:
+                    values.extend(self._decode(group["layers"][layer]["columns"][column]))
+            return values
+
+        group, local = self._locate(doc)
+        spec = self._groups[group]["layers"].get(layer)
+        if spec is None:
+            return []
+        offsets = self._layer_offsets(group, layer)
+        return self._decode(spec["columns"][column], offsets[local], offsets[local + 1])
+
+    def layer(self, name: str, doc: int | None = None) -> dict:
+        """Columns of one layer as `{column: [values]}`, for all documents or just `doc`."""
+        return {column: self.column(name, column, doc) for column in self._columns(name)}
+
+    def ids(self) -> list[str]:
+        return [value for group in self._groups for value in self._decode(group["ids"])]
+
+    def summary(self) -> dict:
+        return {
+            name: [value for group in self._groups for value in self._decode(group["summary"][name])]
+            for name, _ in SUMMARY
+        }
+
+    def errors(self) -> dict:
+        """`{document index: error message}` for documents that failed."""
+        return {doc: error for doc, error in enumerate(self.summary()["error"]) if error}
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
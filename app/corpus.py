@@ -0,0 +1,58 @@
+import glob
+import json
+import sys
+from pathlib import Path
+
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+
+
+def iter_jsonl(lines, text_field: str = "text", source: str = "<stdin>"):
+    """`(doc_id, text)` per JSONL record; a bad line raises ValueError naming `source:line`."""
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{source}:{line_no}: invalid JSON ({e.msg})") from None
+        if isinstance(record, str):
+            yield f"{source}:{line_no}", record
+            continue
+        if not isinstance(record, dict) or text_field not in record:
+            raise ValueError(f"{source}:{line_no}: missing '{text_field}' field")
+        if not isinstance(record[text_field], str):
+            raise ValueError(f"{source}:{line_no}: '{text_field}' is not a string")
+        yield record.get("id", f"{source}:{line_no}"), record[text_field]
+
+
+def iter_files(paths):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            yield str(path), f.read().strip()
+
+
+def iter_documents(source: str, text_field: str = "text"):
+    """
+    Yield `(doc_id, text)` pairs from a corpus source, one at a time.
+
+    - `-` reads JSONL records from stdin.
+    - A `.jsonl`/`.ndjson` file is read line by line.
+    - A directory yields every `*.txt` file inside it (recursively).
+    - Anything else is treated as a glob pattern, e.g. `docs/**/*.md`.
+    """
+    if source == "-":
+        yield from iter_jsonl(sys.stdin, text_field)
+        return
+
+    path = Path(source)
+    if path.is_file() and path.suffix.lower() in JSONL_SUFFIXES:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from iter_jsonl(f, text_field, source=str(path))
+        return
+
+    if path.is_dir():
+        yield from iter_files(sorted(p for p in path.rglob("*.txt") if p.is_file()))
+        return
+
+    yield from iter_files(sorted(p for p in glob.iglob(source, recursive=True) if Path(p).is_file()))
@@ -0,0 +1,55 @@
+from app.tokenizer import sentence_spans, word_spans
+
+
+class Document:
+    """
+    A text tokenized once, with every analysis layer aligned to that tokenization.
+
+    - `tokens[i]` is the Treebank token (same strings as `word_tokens`)
+    - `offsets[i]` is its (start, end) character span in `text`
+    - `sentences[j]` is a (start, end) character span, and
+      `sentence_tokens[j]` the (first, last + 1) token range of that sentence
+
+    Layers are filled in by the stage modules (`pos_tagger.tag_document`,
+    `lemmatizer.lemmatize_document`, `stemmer.stem_document`,
+    `ner.annotate_document`) and stay `None` until their stage has run.
+    """
+
+    def __init__(self, text: str, doc_id=None):
+        self.id = doc_id
+        self.text = text
+        self.sentences = []
+        self.sentence_tokens = []
+        self.tokens = []
+        self.offsets = []
+
+        self.pos = None
+        self.lemmas = None
+        self.stems = None
+        self.entities = None
+
+    @classmethod
+    def from_text(cls, text: str, doc_id=None):
+        document = cls(text, doc_id)
+
+        for start, end in sentence_spans(text):
+            first = len(document.tokens)
+            tokens, offsets = word_spans(text[start:end], offset=start)
+            document.tokens.extend(tokens)
+            document.offsets.extend(offsets)
+            document.sentences.append((start, end))
+            document.sentence_tokens.append((first, len(document.tokens)))
+
+        return document
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def sentence_texts(self) -> list[str]:
+        return [self.text[start:end] for start, end in self.sentences]
+
+    def spaces(self) -> list[bool]:
+        # Whether each token is followed by whitespace in the original text
+        ends = [end for _, end in self.offsets]
+        starts = [start for start, _ in self.offsets[1:]] + [len(self.text)]
+        return [next_start > end for end, next_start in zip(ends, starts)]
@@ -0,0 +1,162 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app import backends, resources
+from app.backends import DEFAULT_TIER
+from app.pipeline import analyze_stream, analyze_stream_cached, resolve_stages
+
+# Target characters per dispatched batch; batches also stop at `batch_size` documents
+DEFAULT_BATCH_CHARS = 50_000
+# Runs of a batch that crashes its worker on its own; past this many it is
+# split up, and a single document past it is reported as an error
+MAX_ATTEMPTS = 2
+
+_worker = {}
+
+
+def warm_stages(stages=None, tier: str = DEFAULT_TIER):
+    # Load only the models the selected stages use
+    run = resolve_stages(stages)
+    backends.warm(tier, lemmas="lemmas" in run, ner="ner" in run)
+    if "tokens" in run:
+        from app.tokenizer import get_encoder
+        get_encoder()
+    if "lemmas" in run or "stems" in run:
+        resources.get("wordnet_vocabulary")
+    if "stems" in run:
+        resources.get("porter")
+        resources.get("snowball", "english")
+        resources.get("lancaster")
+
+
+def _init_worker(scheme: str, stages, use_cache: bool, tier: str = DEFAULT_TIER):
+    warm_stages(stages, tier)
+    _worker.update(scheme=scheme, stages=stages, tier=tier, cache=None)
+    if use_cache:
+        # SQLite WAL handles concurrent writers across processes
+        from app.result_cache import ResultCache
+        _worker["cache"] = ResultCache()
+
+
+def _run(batch):
+    scheme, stages, tier, cache = _worker["scheme"], _worker["stages"], _worker["tier"], _worker["cache"]
+    if cache is not None:
+        return list(analyze_stream_cached(batch, cache, batch_size=len(batch), scheme=scheme, stages=stages, tier=tier))
+    return list(analyze_stream(batch, batch_size=len(batch), scheme=scheme, stages=stages, tier=tier))
+
+
+def analyze_batch(batch):
+    """Worker entry point: analyze `(doc_id, text)` pairs, isolating per-document errors."""
+    try:
+        return _run(batch)
+    except Exception as e:
+        if len(batch) == 1:
+            return [(batch[0][0], {"error": f"{type(e).__name__}: {e}"})]
+
+    # Re-run one by one so a bad document only fails itself
+    results = []
+    for item in batch:
+        results.extend(analyze_batch([item]))
+    return results
+
+
+def size_balanced_batches(documents, batch_chars: int = DEFAULT_BATCH_CHARS, batch_size: int = 64):
+    """Group `(doc_id, text)` pairs, in order, into batches of roughly `batch_chars` characters."""
+    batch = []
+    size = 0
+    for doc_id, text in documents:
+        batch.append((doc_id, text))
+        size += len(text)
+        if size >= batch_chars or len(batch) >= batch_size:
+            yield batch
+            batch = []
+            size = 0
+    if batch:
+        yield batch
+
+
+def analyze_parallel(
+    documents,
+    workers: int | None = None,
+    batch_size: int = 64,
+    scheme: str = "BIO",
+    stages=None,
+    use_cache: bool = False,
+    batch_chars: int = DEFAULT_BATCH_CHARS,
+    tier: str = DEFAULT_TIER,
+):
+    """
+    Analyze `(doc_id, text)` pairs on a process pool, yielding
+    `(doc_id, result)` in input order.
+
+    At most `2 * workers` batches are in flight, so memory stays bounded
+    however long the input is. Documents that fail come back as
+    `{"error": ...}`. If a worker process dies, every unfinished batch
+    fails with it, so the pool is restarted and those batches are re-run
+    one at a time: only a batch that crashes on its own is retried, then
+    split, and a single document that keeps crashing is reported as an
+    error.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    def new_pool():
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(scheme, stages, use_cache, tier))
+
+    pool = new_pool()
+    pending = deque()  # [batch, future or results]
+
+    def submit(batch):
+        try:
+            future = pool.submit(analyze_batch, batch)
+        except BrokenProcessPool as e:
+            # Picked up (and the pool restarted) when this batch is collected
+            future = Future()
+            future.set_exception(e)
+        pending.append([batch, future])
+
+    def restart():
+        nonlocal pool
+        pool.shutdown(wait=False, cancel_futures=True)
+        pool = new_pool()
+
+    def run_alone(batch):
+        # Nothing else is in flight, so a crash here is this batch's own
+        for _ in range(MAX_ATTEMPTS):
+            try:
+                return pool.submit(analyze_batch, batch).result()
+            except BrokenProcessPool:
+                restart()
+        if len(batch) == 1:
+            return [(batch[0][0], {"error": "Worker process crashed"})]
+        return [result for item in batch for result in run_alone([item])]
+
+    def recover():
+        restart()
+        for entry in pending:
+            future = entry[1]
+            if isinstance(future, Future) and not (future.done() and not future.cancelled() and future.exception() is None):
+                entry[1] = run_alone(entry[0])
+
+    def take():
+        while True:
+            _, outcome = pending[0]
+            if isinstance(outcome, Future):
+                try:
+                    outcome = outcome.result()
+                except BrokenProcessPool:
+                    recover()
+                    continue
+            pending.popleft()
+            return outcome
+
+    try:
+        for batch in size_balanced_batches(documents, batch_chars, batch_size):
+            submit(batch)
+            while len(pending) >= workers * 2:
+                yield from take()
+        while pending:
+            yield from take()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
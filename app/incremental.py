@@ -0,0 +1,102 @@
+from app.document import Document
+from app.ner import annotate_documents
+from app.pipeline import analyze_document, overall_winner
+from app.result_cache import cache_key
+from app.tokenizer import llm_token_count, sentence_spans
+from app.pricing import estimate_cost
+
+# Cache "stage" name for per-sentence entries, so they never collide with
+# whole-document results
+SENTENCE_STAGES = ("sentence",)
+
+
+def _sentence_part(result: dict) -> dict:
+    # What is stored per sentence: offsets relative to the sentence start,
+    # entity positions relative to its first token
+    return {
+        "words": result["tokenization"]["words"],
+        "word_offsets": result["tokenization"]["word_offsets"],
+        "pos_lemmatization": result["pos_lemmatization"],
+        "stemming": result["stemming"],
+        "comparison_rows": result["stem_vs_lemma_comparison"]["rows"],
+        "named_entities": result["named_entities"],
+        "bio_tags": result["bio_tags"],
+    }
+
+
+def analyze_incremental(text: str, cache, scheme: str = "BIO", batch_size: int = 64):
+    """
+    `analyze` `text` one sentence at a time, reusing per-sentence results
+    stored in `cache` (a `ResultCache`) for sentences seen before.
+
+    Sentences are keyed by a hash of their text, so after an edit only new
+    or changed sentences are analyzed; offsets, entity positions and the
+    win counts are recomputed for the whole document. Returns
+    `(result, reused)`, where `reused` is the number of sentences served
+    from the cache.
+
+    Each sentence is tagged on its own, so POS tags and entities can differ
+    slightly from a whole-document `analyze` at sentence boundaries.
+    """
+    spans = sentence_spans(text)
+    sentences = [text[start:end] for start, end in spans]
+    keys = [cache_key(sentence, SENTENCE_STAGES, scheme=scheme) for sentence in sentences]
+
+    parts = {}
+    for key in dict.fromkeys(keys):
+        part = cache.get(key)
+        if part is not None:
+            parts[key] = part
+    reused = sum(1 for key in keys if key in parts)
+
+    # Repeated sentences are analyzed once
+    missing = {key: sentence for key, sentence in zip(keys, sentences) if key not in parts}
+    documents = (Document.from_text(sentence, doc_id=key) for key, sentence in missing.items())
+    for document in annotate_documents(documents, batch_size=batch_size):
+        part = _sentence_part(analyze_document(document, scheme))
+        cache.put(document.id, part)
+        parts[document.id] = part
+
+    return merge_sentences(text, spans, [parts[key] for key in keys]), reused
+
+
+def merge_sentences(text: str, spans, parts) -> dict:
+    """Stitch per-sentence parts back into one `analyze` result with global positions."""
+    words, offsets, lemmas, stems, rows, entities, bio_tags = [], [], [], [], [], [], []
+
+    for (start, _), part in zip(spans, parts):
+        token_offset = len(words)
+        words.extend(part["words"])
+        offsets.extend([s + start, e + start] for s, e in part["word_offsets"])
+        lemmas.extend(part["pos_lemmatization"])
+        stems.extend(part["stemming"])
+        rows.extend(part["comparison_rows"])
+        entities.extend(
+            dict(e, start=e["start"] + token_offset, end=e["end"] + token_offset)
+            for e in part["named_entities"]
+        )
+        bio_tags.extend(part["bio_tags"])
+
+    lemma_wins = sum(1 for r in rows if r["winner"] == "LEMMA")
+    stem_wins = sum(1 for r in rows if r["winner"] == "STEM")
+    llm_count = llm_token_count(text)
+
+    return {
+        "tokenization": {
+            "sentences": [text[start:end] for start, end in spans],
+            "words": words,
+            "word_offsets": offsets,
+            "llm_tokens": llm_count,
+            "llm_estimated_cost": estimate_cost(llm_count)
+        },
+        "pos_lemmatization": lemmas,
+        "stemming": stems,
+        "stem_vs_lemma_comparison": {
+            "rows": rows,
+            "lemma_wins": lemma_wins,
+            "stem_wins": stem_wins,
+            "overall_winner": overall_winner(lemma_wins, stem_wins)
+        },
+        "named_entities": entities,
+        "bio_tags": bio_tags
+    }
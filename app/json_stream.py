@@ -0,0 +1,134 @@
+import json
+import sys
+from itertools import islice
+
+from app.token_table import TokenTable
+
+FLUSH_BYTES = 1 << 16
+CHUNK_ITEMS = 512
+
+
+def iter_json(value, indent: int | None = 2, level: int = 0):
+    """
+    Yield the JSON encoding of `value` in chunks.
+
+    Dicts are walked key by key and lists/tuples/generators in slices of
+    `CHUNK_ITEMS` elements, so a section can be serialized (or produced)
+    lazily without building one big string; `TokenTable` rows are built
+    one slice at a time. With `indent` the layout
+    matches `json.dumps(value, indent=...)`; `indent=None` gives compact output.
+    """
+    if isinstance(value, dict):
+        yield from _iter_object(value, indent, level)
+    elif isinstance(value, (list, tuple, TokenTable)) or hasattr(value, "__next__"):
+        yield from _iter_array(iter(value), indent, level)
+    else:
+        yield json.dumps(value)
+
+
+def _layout(indent, level):
+    # (newline + inner prefix, newline + outer prefix, item separator, key separator)
+    if indent is None:
+        return "", "", ",", ":"
+    return "\n" + " " * (indent * (level + 1)), "\n" + " " * (indent * level), ",", ": "
+
+
+def _iter_object(value: dict, indent, level):
+    if not value:
+        yield "{}"
+        return
+
+    inner, outer, item_sep, key_sep = _layout(indent, level)
+    yield "{"
+    for i, (key, item) in enumerate(value.items()):
+        yield (item_sep if i else "") + inner + json.dumps(str(key)) + key_sep
+        yield from iter_json(item, indent, level + 1)
+    yield outer + "}"
+
+
+def _iter_array(items, indent, level):
+    inner, outer, item_sep, _ = _layout(indent, level)
+    encoder = _encoder(indent)
+    first = True
+
+    while True:
+        chunk = list(islice(items, CHUNK_ITEMS))
+        if not chunk:
+            break
+
+        if any(hasattr(item, "__next__") for item in chunk):
+            # Nested generators have to be walked lazily
+            for item in chunk:
+                yield ("[" if first else item_sep) + inner
+                first = False
+                yield from iter_json(item, indent, level + 1)
+            continue
+
+        # Encode the whole slice in one call, then drop its brackets; indented
+        # elements come back one level deep and are shifted to this level
+        encoded = encoder.encode(chunk)
+        if indent is None:
+            body = encoded[1:-1]
+        else:
+            body = outer + encoded[2:-2].replace("\n", outer)
+        yield ("[" if first else item_sep) + body
+        first = False
+
+    yield "[]" if first else outer + "]"
+
+
+def json_default(value):
+    # `default=` for json.dumps on results holding `TokenTable` layers
+    if isinstance(value, TokenTable):
+        return value.to_dicts()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encoders = {}
+
+
+def _encoder(indent):
+    if indent not in _encoders:
+        if indent is None:
+            _encoders[indent] = json.JSONEncoder(separators=(",", ":"))
+        else:
+            _encoders[indent] = json.JSONEncoder(indent=indent)
+    return _encoders[indent]
+
+
+def write_json(value, sinks, compact: bool = False):
+    """Stream `value` as JSON to every file-like object in `sinks`."""
+    buffer = []
+    size = 0
+
+    def flush():
+        chunk = "".join(buffer)
+        for sink in sinks:
+            sink.write(chunk)
+        buffer.clear()
+
+    for chunk in iter_json(value, indent=None if compact else 2):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= FLUSH_BYTES:
+            flush()
+            size = 0
+
+    buffer.append("\n")
+    flush()
+    for sink in sinks:
+        sink.flush()
+
+
+def emit_json(value, out=None, to_stdout: bool = True, compact: bool = False):
+    # One serialization pass feeds both the --out file and raw stdout
+    sinks = [sys.stdout] if to_stdout else []
+    handle = open(out, "w", encoding="utf-8") if out else None
+    if handle:
+        sinks.append(handle)
+    try:
+        if sinks:
+            write_json(value, sinks, compact)
+    finally:
+        if handle:
+            handle.close()
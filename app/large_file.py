@@ -0,0 +1,177 @@
+import json
+import mmap
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from app.tokenizer import sentence_spans
+from app.pipeline import analyze_text, overall_winner
+from app.pricing import estimate_cost
+
+DEFAULT_CHUNK_BYTES = 200_000
+
+# List sections of the `analyze` result, in output order
+LIST_SECTIONS = ("words", "word_offsets", "sentences", "pos_lemmatization", "stemming", "comparison_rows", "named_entities", "bio_tags")
+
+
+def iter_chunks(path, chunk_bytes: int = DEFAULT_CHUNK_BYTES):
+    """
+    Memory-map `path` and yield `(char_offset, text)` chunks that end on a
+    sentence boundary, so each chunk can be analyzed on its own.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            pos = 0
+            char_offset = 0
+            carry = ""
+
+            while pos < size:
+                end = min(pos + chunk_bytes, size)
+                # Never split a multi-byte UTF-8 sequence
+                while end < size and end > pos and (data[end] & 0xC0) == 0x80:
+                    end -= 1
+                text = carry + data[pos:end].decode("utf-8")
+                pos = end
+
+                cut = len(text)
+                if pos < size:
+                    spans = sentence_spans(text)
+                    if len(spans) > 1:
+                        cut = spans[-1][0]
+                    else:
+                        # No sentence boundary (unpunctuated transcripts):
+                        # cut after the last whitespace, never mid-word
+                        cut = _after_last_space(text) or cut
+
+                if text[:cut].strip():
+                    yield char_offset, text[:cut]
+                char_offset += cut
+                carry = text[cut:]
+
+
+def _after_last_space(text: str) -> int:
+    # Index just past the last whitespace character, or 0 if there is none
+    for i in range(len(text) - 1, -1, -1):
+        if text[i].isspace():
+            return i + 1
+    return 0
+
+
+def analyze_chunk(chunk, scheme: str = "BIO"):
+    char_offset, text = chunk
+    return char_offset, analyze_text(text, scheme)
+
+
+def iter_chunk_results(chunks, workers: int = 1, scheme: str = "BIO"):
+    # Ordered results; with workers > 1 at most 2 * workers chunks are in flight
+    if workers <= 1:
+        for chunk in chunks:
+            yield analyze_chunk(chunk, scheme)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(analyze_chunk, chunk, scheme))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ChunkMerger:
+    """
+    Merges per-chunk `analyze` results into one result with global offsets.
+
+    Token-level sections are spilled to temporary JSON-lines files as chunks
+    arrive, so memory stays bounded by one chunk; `result()` reads them back
+    lazily for the streaming JSON writer.
+    """
+
+    def __init__(self):
+        self._dir = tempfile.TemporaryDirectory(prefix="text-analyzer-")
+        self._files = {
+            name: open(os.path.join(self._dir.name, f"{name}.jsonl"), "w+", encoding="utf-8")
+            for name in LIST_SECTIONS
+        }
+        self.tokens = 0
+        self.chunks = 0
+        self.llm_tokens = 0
+        self.lemma_wins = 0
+        self.stem_wins = 0
+
+    def _write(self, name: str, items):
+        f = self._files[name]
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False))
+            f.write("\n")
+
+    def add(self, char_offset: int, result: dict):
+        tokenization = result["tokenization"]
+        comparison = result["stem_vs_lemma_comparison"]
+        token_offset = self.tokens
+
+        self._write("words", tokenization["words"])
+        self._write("word_offsets", ([s + char_offset, e + char_offset] for s, e in tokenization["word_offsets"]))
+        self._write("sentences", tokenization["sentences"])
+        self._write("pos_lemmatization", result["pos_lemmatization"])
+        self._write("stemming", result["stemming"])
+        self._write("comparison_rows", comparison["rows"])
+        self._write("named_entities", (
+            dict(e, start=e["start"] + token_offset, end=e["end"] + token_offset)
+            for e in result["named_entities"]
+        ))
+        self._write("bio_tags", result["bio_tags"])
+
+        self.tokens += len(tokenization["words"])
+        self.chunks += 1
+        self.llm_tokens += tokenization["llm_tokens"]
+        self.lemma_wins += comparison["lemma_wins"]
+        self.stem_wins += comparison["stem_wins"]
+
+    def _read(self, name: str):
+        f = self._files[name]
+        f.flush()
+        f.seek(0)
+        for line in f:
+            yield json.loads(line)
+
+    def overall_winner(self) -> str:
+        return overall_winner(self.lemma_wins, self.stem_wins)
+
+    def result(self) -> dict:
+        # Same shape as `analyze`; list sections are generators over the spill files
+        return {
+            "tokenization": {
+                "sentences": self._read("sentences"),
+                "words": self._read("words"),
+                "word_offsets": self._read("word_offsets"),
+                "llm_tokens": self.llm_tokens,
+                "llm_estimated_cost": estimate_cost(self.llm_tokens)
+            },
+            "pos_lemmatization": self._read("pos_lemmatization"),
+            "stemming": self._read("stemming"),
+            "stem_vs_lemma_comparison": {
+                "rows": self._read("comparison_rows"),
+                "lemma_wins": self.lemma_wins,
+                "stem_wins": self.stem_wins,
+                "overall_winner": self.overall_winner()
+            },
+            "named_entities": self._read("named_entities"),
+            "bio_tags": self._read("bio_tags")
+        }
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._dir.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,5 +1,8 @@
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet
+from app import memo, resources
+from app.lexicon import lookup_lemma
+from app.memo import memoize_types
+from app.token_table import TokenTable
+from app.wordnet_index import is_valid_word
 
 POS_MAP = {
     "N": "n",
@@ -8,27 +11,44 @@ POS_MAP = {
     "R": "r"
 }
 
-lemmatizer = WordNetLemmatizer()
+def _lemmatize_type(key):
+    word, wn_pos, exact = key
+    known = lookup_lemma(word, wn_pos, exact)
+    if known is not None:
+        return known
 
-def is_valid_word(word: str):
-    return bool(wordnet.synsets(word))
+    lemmatizer = resources.get("wordnet_lemmatizer")
+    if wn_pos:
+        lemma = lemmatizer.lemmatize(word, pos=wn_pos)
+    else:
+        lemma = lemmatizer.lemmatize(word)
+    return lemma, is_valid_word(lemma, exact)
 
 
-def lemmatize_tokens(tagged_tokens: list[tuple[str, str]]):
-    results = []
+LEMMA_FIELDS = ("token", "pos", "lemma")
+LEMMA_FLAGS = ("lemma_valid",)
 
-    for word, pos in tagged_tokens:
-        wn_pos = POS_MAP.get(pos[0])
-        if wn_pos:
-            lemma = lemmatizer.lemmatize(word, pos=wn_pos)
-        else:
-            lemma = lemmatizer.lemmatize(word)
 
-        results.append({
-            "token": word,
-            "pos": pos,
-            "lemma": lemma,
-            "lemma_valid": is_valid_word(lemma)
-        })
+def lemma_table(tagged_tokens, exact: bool | None = None) -> TokenTable:
+    # `tagged_tokens` are (word, tag) pairs or `pos_tag_tokens`'
+    # (word, tag, description) triples. Lemmas are computed once per
+    # (word, WordNet POS) type
+    words = [tagged[0] for tagged in tagged_tokens]
+    tags = [tagged[1] for tagged in tagged_tokens]
+    keys = [(word, POS_MAP.get(pos[:1]), exact) for word, pos in zip(words, tags)]
+    lemmas = memoize_types(keys, memo.table("lemmas"), _lemmatize_type)
+    return TokenTable(LEMMA_FIELDS, LEMMA_FLAGS, {
+        "token": words,
+        "pos": tags,
+        "lemma": [lemma for lemma, _ in lemmas],
+        "lemma_valid": [valid for _, valid in lemmas],
+    })
 
-    return results
+
+def lemmatize_tokens(tagged_tokens, exact: bool | None = None):
+    return lemma_table(tagged_tokens, exact).to_dicts()
+
+
+def lemmatize_document(document):
+    document.lemmas = lemma_table(list(zip(document.tokens, document.pos)))
+    return document
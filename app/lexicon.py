@@ -0,0 +1,167 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from app import resources
+from app.wordnet_index import EXACT_MORPHY, is_valid_word
+
+# Set TEXT_ANALYZER_LEXICON to a file written by `build-lexicon` to look
+# stems and lemmas up there before running the NLTK stemmers / lemmatizer.
+LEXICON_ENV = "TEXT_ANALYZER_LEXICON"
+
+MAGIC = b"TALEX1\0\0"
+_COUNT = struct.Struct("<Q")
+
+# WordNet POS with a precomputed lemma; untagged words lemmatize as nouns,
+# like `WordNetLemmatizer.lemmatize(word)`
+LEMMA_POS = ("n", "v", "a", "r")
+
+# Validity codes: valid as a WordNet lemma name, valid only through morphy
+# (i.e. with exact semantics), or not valid at all
+INVALID, VALID, MORPHY = "0", "1", "2"
+
+
+# ----------------------------
+# Building
+# ----------------------------
+def _validity(word: str) -> str:
+    if is_valid_word(word, exact=False):
+        return VALID
+    if resources.get("wordnet").morphy(word.lower()) is not None:
+        return MORPHY
+    return INVALID
+
+
+def build_record(word: str) -> tuple:
+    """`(word, porter, snowball, lancaster, lemma_n, lemma_v, lemma_a, lemma_r, codes)`."""
+    stems = (
+        resources.get("porter").stem(word),
+        resources.get("snowball", "english").stem(word),
+        resources.get("lancaster").stem(word),
+    )
+    lemmatizer = resources.get("wordnet_lemmatizer")
+    lemmas = tuple(lemmatizer.lemmatize(word, pos=pos) for pos in LEMMA_POS)
+    codes = "".join(_validity(value) for value in stems + lemmas)
+    return (word,) + stems + lemmas + (codes,)
+
+
+def scan_vocabulary(documents) -> set[str]:
+    """Word types of `(doc_id, text)` pairs, as `word_tokens` splits them."""
+    from app.tokenizer import word_tokens
+
+    vocabulary = set()
+    for _, text in documents:
+        vocabulary.update(word_tokens(text))
+    return vocabulary
+
+
+def write_lexicon(path, records) -> int:
+    """
+    Write records (see `build_record`) sorted by the word's UTF-8 bytes,
+    behind a table of record offsets so lookups can binary search the map.
+    Words containing tabs or newlines are skipped.
+    """
+    lines = sorted(
+        "\t".join(record).encode("utf-8")
+        for record in records
+        if not any(c in record[0] for c in "\t\n")
+    )
+    offsets = array("Q", [0])
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_COUNT.pack(len(lines)))
+        f.write(offsets.tobytes())
+        f.write(b"".join(lines))
+    return len(lines)
+
+
+def build_lexicon(path, words) -> int:
+    return write_lexicon(path, (build_record(word) for word in set(words) if word))
+
+
+# ----------------------------
+# Lookup
+# ----------------------------
+class MappedLexicon:
+    """Read-only, memory-mapped view of a file written by `write_lexicon`."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = len(MAGIC) + _COUNT.size
+        if len(self._map) < header or self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a lexicon file")
+        (self._count,) = _COUNT.unpack(self._map[len(MAGIC):header])
+        table_end = header + (self._count + 1) * 8
+        # Offsets are little-endian; other platforms copy the table once
+        offsets = memoryview(self._map)[header:table_end].cast("Q")
+        if sys.byteorder != "little":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        self._offsets = offsets
+        self._data = table_end
+
+    def __len__(self):
+        return self._count
+
+    def lookup(self, word: str):
+        """The record fields for `word` as a list of strings, or None."""
+        # Records are sorted, so comparing only the `word\t` prefix keeps the order
+        key = word.encode("utf-8") + b"\t"
+        data, offsets, base = self._map, self._offsets, self._data
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = base + offsets[mid]
+            prefix = data[start:start + len(key)]
+            if prefix == key:
+                return data[start:base + offsets[mid + 1]].decode("utf-8").split("\t")
+            if prefix < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def __contains__(self, word: str) -> bool:
+        return self.lookup(word) is not None
+
+
+@resources.register("lexicon")
+def _load_lexicon():
+    path = os.environ.get(LEXICON_ENV)
+    if path and os.path.exists(path):
+        return MappedLexicon(path)
+    return None
+
+
+def _valid(code: str, exact: bool | None) -> bool:
+    return code == VALID or (code == MORPHY and (EXACT_MORPHY if exact is None else exact))
+
+
+def lookup_stems(token: str, exact: bool | None = None):
+    """`_stem_type`'s tuple for `token` from the lexicon, or None if it is not there."""
+    lexicon = resources.get("lexicon")
+    record = lexicon.lookup(token) if lexicon is not None else None
+    if record is None:
+        return None
+    codes = record[-1]
+    return tuple(record[1:4]) + tuple(_valid(code, exact) for code in codes[:3])
+
+
+def lookup_lemma(word: str, wn_pos: str | None, exact: bool | None = None):
+    """`(lemma, valid)` for `word` from the lexicon, or None if it is not there."""
+    lexicon = resources.get("lexicon")
+    record = lexicon.lookup(word) if lexicon is not None else None
+    if record is None:
+        return None
+    i = LEMMA_POS.index(wn_pos or "n")
+    return record[4 + i], _valid(record[-1][3 + i], exact)
@@ -0,0 +1,96 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Default capacity (unique keys) of each memo table; 0 disables memoization
+DEFAULT_SIZE = int(os.environ.get("TEXT_ANALYZER_MEMO_SIZE", "100000"))
+
+_MISSING = object()
+
+
+class LRUMemo:
+    """Size-bounded LRU memo table with hit/miss counters."""
+
+    def __init__(self, name: str, maxsize: int = DEFAULT_SIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute(key)
+        if self.maxsize <= 0:
+            return value
+
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+
+_tables = {}
+_maxsize = DEFAULT_SIZE
+
+
+def table(name: str) -> LRUMemo:
+    memo = _tables.get(name)
+    if memo is None:
+        memo = _tables.setdefault(name, LRUMemo(name, _maxsize))
+    return memo
+
+
+def configure(maxsize: int):
+    global _maxsize
+    _maxsize = maxsize
+    for memo in _tables.values():
+        memo.resize(maxsize)
+
+
+def stats() -> dict:
+    return {name: memo.stats() for name, memo in _tables.items()}
+
+
+def memoize_types(keys, memo: LRUMemo, compute):
+    """
+    Compute `compute(key)` once per unique key and scatter the results back
+    to every occurrence, in order.
+    """
+    unique = {key: memo.get(key, compute) for key in dict.fromkeys(keys)}
+    return [unique[key] for key in keys]
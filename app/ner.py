@@ -1,11 +1,57 @@
-import spacy
+from app import resources
 
-nlp = spacy.load("en_core_web_sm")
+SCHEMES = ("BIO", "BILOU")
 
-def process_text(text: str):
+def process_text(text):
+    nlp = resources.get("spacy", "en_core_web_sm")
     return nlp(text)
 
 
+def process_texts(texts, batch_size: int = 64, as_tuples: bool = False):
+    # Streams docs through nlp.pipe; with `as_tuples`, `texts` yields
+    # (text, context) pairs and (doc, context) pairs come back.
+    nlp = resources.get("spacy", "en_core_web_sm")
+    return nlp.pipe(texts, batch_size=batch_size, as_tuples=as_tuples)
+
+
+def to_spacy_doc(document, nlp=None):
+    # Reuse the document's tokenization so entities line up with its tokens
+    from spacy.tokens import Doc
+    nlp = nlp or resources.get("spacy", "en_core_web_sm")
+    words = [document.text[start:end] or token for token, (start, end) in zip(document.tokens, document.offsets)]
+    return Doc(nlp.vocab, words=words, spaces=document.spaces())
+
+
+def annotate_document(document, doc=None):
+    # `doc` is an already processed spaCy doc built with `to_spacy_doc`
+    if doc is None:
+        doc = process_text(to_spacy_doc(document))
+    document.entities = [(ent.start, ent.end, ent.label_) for ent in doc.ents]
+    return document
+
+
+def annotate_documents(documents, batch_size: int = 64):
+    pairs = ((to_spacy_doc(d), d) for d in documents)
+    for doc, document in process_texts(pairs, batch_size=batch_size, as_tuples=True):
+        yield annotate_document(document, doc)
+
+
+def document_entities(document):
+    return [
+        {
+            "text": document.text[document.offsets[start][0]:document.offsets[end - 1][1]],
+            "label": label,
+            "start": start,
+            "end": end
+        }
+        for start, end, label in document.entities
+    ]
+
+
+def document_bio_tags(document, scheme: str = "BIO"):
+    return list(iter_span_tags(document.tokens, document.entities, scheme))
+
+
 def extract_entities_from_doc(doc):
     entities = []
 
@@ -20,16 +66,44 @@ def extract_entities_from_doc(doc):
     return entities
 
 
-def generate_bio_tags_from_doc(doc):
-    bio_tags = []
+def _tag_prefix(i: int, start: int, end: int, scheme: str) -> str:
+    if scheme == "BILOU":
+        if end - start == 1:
+            return "U-"
+        if i == end - 1:
+            return "L-"
+    return "B-" if i == start else "I-"
+
+
+def iter_span_tags(tokens, spans, scheme: str = "BIO"):
+    """
+    Single sweep over tokens and sorted (start, end, label) token spans.
+
+    Yields (token, tag) pairs lazily in O(tokens + entities).
+    `scheme` is "BIO" (B-/I-/O) or "BILOU" (adds L- for last and U- for unit spans).
+    """
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown tagging scheme: {scheme}")
+
+    spans = iter(spans)
+    current = next(spans, None)
+
+    for i, token in enumerate(tokens):
+        while current is not None and current[1] <= i:
+            current = next(spans, None)
+
+        if current is None or i < current[0]:
+            yield token, "O"
+            continue
+
+        start, end, label = current
+        yield token, _tag_prefix(i, start, end, scheme) + label
+
+
+def iter_bio_tags(doc, scheme: str = "BIO"):
+    spans = ((ent.start, ent.end, ent.label_) for ent in doc.ents)
+    return iter_span_tags((token.text for token in doc), spans, scheme)
 
-    for token in doc:
-        tag = "O"
-        for ent in doc.ents:
-            if token.i == ent.start:
-                tag = f"B-{ent.label_}"
-            elif ent.start < token.i < ent.end:
-                tag = f"I-{ent.label_}"
-        bio_tags.append((token.text, tag))
 
-    return bio_tags
+def generate_bio_tags_from_doc(doc, scheme: str = "BIO"):
+    return list(iter_bio_tags(doc, scheme))
@@ -0,0 +1,288 @@
+from app import backends
+from app.backends import DEFAULT_TIER
+from app.document import Document
+from app.pos_tagger import pos_tag_text
+from app.lemmatizer import lemma_table
+from app.stemmer import stem_table
+from app.tokenizer import llm_token_count
+from app.pricing import estimate_cost
+from app.ner import document_entities, document_bio_tags
+from app.stemmer import stem_document
+from app.profiling import stage
+
+# Selectable `analyze` stages: name -> (result section, stages it needs)
+STAGE_GRAPH = {
+    "tokens": ("tokenization", ()),
+    "lemmas": ("pos_lemmatization", ()),
+    "stems": ("stemming", ()),
+    "compare": ("stem_vs_lemma_comparison", ("lemmas", "stems")),
+    "ner": ("named_entities", ()),
+    "bio": ("bio_tags", ("ner",)),
+}
+
+ANALYZE_STAGES = tuple(section for section, _ in STAGE_GRAPH.values())
+
+COMPARE_STAGES = ("comparison",)
+
+
+def resolve_stages(stages=None) -> tuple:
+    """Expand selected stage names with everything they depend on, in pipeline order."""
+    if stages is None:
+        return tuple(STAGE_GRAPH)
+
+    needed = set()
+
+    def visit(name):
+        if name not in STAGE_GRAPH:
+            raise ValueError(f"Unknown stage: {name}. Choose from: {', '.join(STAGE_GRAPH)}")
+        if name not in needed:
+            needed.add(name)
+            for dependency in STAGE_GRAPH[name][1]:
+                visit(dependency)
+
+    for name in stages:
+        visit(name)
+    return tuple(name for name in STAGE_GRAPH if name in needed)
+
+
+def stage_sections(stages=None) -> tuple:
+    # Result sections for the selected stages (dependencies run but are not emitted)
+    selected = set(resolve_stages(stages) if stages is None else stages)
+    return tuple(section for name, (section, _) in STAGE_GRAPH.items() if name in selected)
+
+
+def analyze_text(text: str, scheme: str = "BIO", profiler=None, stages=None, tier: str = DEFAULT_TIER):
+    """
+    Run the `analyze` pipeline on `text`; `stages` limits it to those
+    stages (see `STAGE_GRAPH`) and their dependencies, `tier` picks the
+    backends (see `backends.TIERS`).
+
+    With a `profiling.Profiler`, per-stage metrics are recorded and added
+    to the result under `metrics`.
+    """
+    with stage(profiler, "tokenize"):
+        document = backends.tokenize_text(text, tier)
+    if profiler:
+        profiler.tokens = len(document)
+    if "ner" in resolve_stages(stages):
+        with stage(profiler, "ner"):
+            document = next(iter(backends.annotate([document], tier, batch_size=1)))
+    result = analyze_document(document, scheme, profiler, stages, tier)
+    if profiler:
+        result["metrics"] = profiler.metrics()
+    return result
+
+
+def analyze_document(document: Document, scheme: str = "BIO", profiler=None, stages=None, tier: str = DEFAULT_TIER):
+    """
+    Build the `analyze` result for a tokenized document.
+
+    Entities are expected to be annotated already when `ner` is selected
+    (`backends.annotate`, batched); tagging, lemmatization and stemming
+    run here with the `tier`'s backends.
+    """
+    run = resolve_stages(stages)
+    emit = stage_sections(stages)
+
+    if "lemmas" in run:
+        with stage(profiler, "pos"):
+            backends.tag(document, tier)
+        with stage(profiler, "lemmatize"):
+            backends.lemmatize(document, tier)
+    if "stems" in run:
+        with stage(profiler, "stem"):
+            stem_document(document)
+
+    result = {}
+
+    if "tokenization" in emit:
+        with stage(profiler, "llm_tokens"):
+            llm_count = llm_token_count(document.text)
+
+        result["tokenization"] = {
+            "sentences": document.sentence_texts(),
+            "words": document.tokens,
+            "word_offsets": [list(span) for span in document.offsets],
+            "llm_tokens": llm_count,
+            "llm_estimated_cost": estimate_cost(llm_count)
+        }
+
+    # Per-token layers stay columnar `TokenTable`s; row dicts are only built
+    # as the result is written out (see `json_stream`)
+    if "pos_lemmatization" in emit:
+        result["pos_lemmatization"] = document.lemmas
+    if "stemming" in emit:
+        result["stemming"] = document.stems
+
+    # ------------------------
+    # Stemming vs Lemmatization comparison
+    # ------------------------
+    if "stem_vs_lemma_comparison" in emit:
+        result["stem_vs_lemma_comparison"] = compare_layers(document.stems, document.lemmas)
+
+    # ------------------------
+    # NER + BIO tagging
+    # ------------------------
+    if "named_entities" in emit:
+        with stage(profiler, "ner"):
+            result["named_entities"] = document_entities(document)
+    with stage(profiler, "bio_tags"):
+        if "bio_tags" in emit:
+            result["bio_tags"] = [
+                {"token": t, "tag": b}
+                for t, b in document_bio_tags(document, scheme)
+            ]
+
+    return result
+
+
+def token_winner(porter: str, lemma: str, porter_valid: bool, lemma_valid: bool) -> str:
+    """STRICT per-token winner: identical forms tie, a valid WordNet word beats an invalid one, otherwise the lemma wins."""
+    if porter == lemma:
+        return "TIE"
+    if porter_valid and not lemma_valid:
+        return "STEM"
+    return "LEMMA"
+
+
+def compare_layers(stems, lemmas):
+    # `stems` / `lemmas` are position-aligned `TokenTable`s
+    comparison_rows = []
+
+    lemma_wins = 0
+    stem_wins = 0
+
+    for token, porter, porter_valid, lemma, lemma_valid in zip(
+        stems.column("token"), stems.column("porter"), stems.column("porter_valid"),
+        lemmas.column("lemma"), lemmas.column("lemma_valid")
+    ):
+        winner = token_winner(porter, lemma, porter_valid, lemma_valid)
+        if winner == "LEMMA":
+            lemma_wins += 1
+        elif winner == "STEM":
+            stem_wins += 1
+
+        comparison_rows.append({
+            "token": token,
+            "porter": porter,
+            "lemma": lemma,
+            "winner": winner
+        })
+
+    return {
+        "rows": comparison_rows,
+        "lemma_wins": lemma_wins,
+        "stem_wins": stem_wins,
+        "overall_winner": overall_winner(lemma_wins, stem_wins)
+    }
+
+
+def overall_winner(lemma_wins: int, stem_wins: int) -> str:
+    return (
+        "Lemmatization"
+        if lemma_wins > stem_wins
+        else "Stemming"
+        if stem_wins > lemma_wins
+        else "Tie"
+    )
+
+
+COMPARE_LABELS = {"LEMMA": "LEMMA ✅", "STEM": "STEM ✅", "TIE": "TIE"}
+OVERALL_LABELS = {"Lemmatization": "Lemmatization 🏆", "Stemming": "Stemming 🏆", "Tie": "Tie 🤝"}
+
+
+def compare_text(text: str):
+    """Build the `compare` result: STRICT stem-vs-lemma winner per token plus a summary."""
+    tagged = pos_tag_text(text)
+    tokens = [word for word, _, _ in tagged]
+
+    lemmas = lemma_table(tagged)
+    stems = stem_table(tokens)
+    comparison = compare_layers(stems, lemmas)
+
+    # WordNet validity (stats only)
+    stem_valid_words = {p for p, valid in zip(stems.column("porter"), stems.column("porter_valid")) if valid}
+    lemma_valid_words = {l for l, valid in zip(lemmas.column("lemma"), lemmas.column("lemma_valid")) if valid}
+
+    return {
+        "input": text,
+        "comparison": [dict(row, winner=COMPARE_LABELS[row["winner"]]) for row in comparison["rows"]],
+        "summary": {
+            "lemma_wins": comparison["lemma_wins"],
+            "stem_wins": comparison["stem_wins"],
+            "stem_valid_words": list(stem_valid_words),
+            "lemma_valid_words": list(lemma_valid_words),
+            "overall_winner": OVERALL_LABELS[comparison["overall_winner"]]
+        }
+    }
+
+
+def analyze_stream(documents, batch_size: int = 64, scheme: str = "BIO", stages=None, tier: str = DEFAULT_TIER):
+    """
+    Analyze `(doc_id, text)` pairs lazily, yielding `(doc_id, result)`.
+
+    spaCy runs batched through `nlp.pipe` (and not at all unless `ner` is
+    selected); only one batch of documents is held in memory at a time.
+    """
+    tokenized = backends.tokenize_documents(documents, tier, batch_size)
+    if "ner" in resolve_stages(stages):
+        tokenized = backends.annotate(tokenized, tier, batch_size)
+    for document in tokenized:
+        yield document.id, analyze_document(document, scheme, stages=stages, tier=tier)
+
+
+def analyze_requests(requests):
+    """
+    Analyze request dicts (`text` plus optional `scheme`, `stages`, `tier`)
+    as one batch, returning results in request order.
+
+    Requests are grouped by tier; each group is tokenized and annotated in
+    one pass, and spaCy NER only runs if some request in it selected `ner`.
+    """
+    groups = {}
+    for n, request in enumerate(requests):
+        groups.setdefault(backends.check_tier(request.get("tier", DEFAULT_TIER)), []).append(n)
+
+    results = [None] * len(requests)
+    for tier, indexes in groups.items():
+        group = [requests[n] for n in indexes]
+        documents = backends.tokenize_documents([(None, r["text"]) for r in group], tier, len(group))
+        if any("ner" in resolve_stages(r.get("stages")) for r in group):
+            documents = backends.annotate(documents, tier, len(group))
+        for n, document, request in zip(indexes, documents, group):
+            results[n] = analyze_document(document, request.get("scheme", "BIO").upper(), stages=request.get("stages"), tier=tier)
+    return results
+
+
+def analyze_stream_cached(documents, cache, batch_size: int = 64, scheme: str = "BIO", stages=None, tier: str = DEFAULT_TIER):
+    """
+    Like `analyze_stream`, but results found in `cache` (a `ResultCache`)
+    are returned without running the pipeline, and new results are stored.
+
+    Documents are handled in chunks of `batch_size`, so memory stays
+    bounded and output order matches input order.
+    """
+    from app.result_cache import cache_key
+
+    for chunk in batched(documents, batch_size):
+        keys = [cache_key(text, stage_sections(stages), scheme=scheme, tier=tier) for _, text in chunk]
+        results = [cache.get(key) for key in keys]
+
+        misses = [(i, text) for i, ((_, text), result) in enumerate(zip(chunk, results)) if result is None]
+        for i, result in analyze_stream(misses, batch_size=batch_size, scheme=scheme, stages=stages, tier=tier):
+            cache.put(keys[i], result)
+            results[i] = result
+
+        for (doc_id, _), result in zip(chunk, results):
+            yield doc_id, result
+
+
+def batched(iterable, size: int):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
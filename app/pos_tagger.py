@@ -1,4 +1,5 @@
-import nltk
+from app import resources
+from app.tokenizer import sentence_tokens, word_tokens
 
 POS_DESCRIPTIONS = {
     "NN": "Noun",
@@ -19,12 +20,39 @@ POS_DESCRIPTIONS = {
     "RBS": "Adverb (superlative)",
 }
 
+def _describe(tagged):
+    return [(word, tag, POS_DESCRIPTIONS.get(tag, "Other")) for word, tag in tagged]
+
+
 def pos_tag_tokens(tokens: list[str]):
-    tagged = nltk.pos_tag(tokens)
-    result = []
+    # One process-wide tagger; `nltk.pos_tag` would import all of nltk and
+    # (before 3.9) reload the perceptron weights on every call
+    return _describe(resources.get("pos_tagger").tag(tokens))
+
+
+def pos_tag_batch(token_lists: list[list[str]]):
+    """Tag several token lists (one per sentence or text) with the shared tagger."""
+    tagger = resources.get("pos_tagger")
+    return [_describe(tagger.tag(tokens)) for tokens in token_lists]
+
+
+def pos_tag_sents(sentences: list[str]):
+    """Tag `sentence_tokens` output: one list of (word, tag, description) per sentence."""
+    return pos_tag_batch([word_tokens(sentence) for sentence in sentences])
+
+
+def pos_tag_text(text: str):
+    # Same tokens as `word_tokens(text)`, but each sentence is tagged on its
+    # own so the tagger sees real sentence starts
+    return [tagged for sentence in pos_tag_sents(sentence_tokens(text)) for tagged in sentence]
 
-    for word, tag in tagged:
-        description = POS_DESCRIPTIONS.get(tag, "Other")
-        result.append((word, tag, description))
 
-    return result
+def tag_document(document):
+    tokens = document.tokens
+    tagger = resources.get("pos_tagger")
+    document.pos = [
+        tag
+        for first, last in document.sentence_tokens
+        for _, tag in tagger.tag(tokens[first:last])
+    ]
+    return document
@@ -0,0 +1,56 @@
+import json
+import os
+
+from app.tokenizer import DEFAULT_LLM_MODEL
+
+# Set TEXT_ANALYZER_PRICING to a JSON file of {"model": {"input": ..., "output": ...}}
+# (USD per 1M tokens) to add models or override the list prices below.
+PRICING_ENV = "TEXT_ANALYZER_PRICING"
+
+# USD per 1M tokens (provider list prices; check current pricing before budgeting)
+PRICING = {
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "output": 10.00},
+    "gpt-4.1": {"input": 2.00, "output": 8.00},
+    "gpt-4.1-mini": {"input": 0.40, "output": 1.60},
+    "gpt-4.1-nano": {"input": 0.10, "output": 0.40},
+    "gpt-4-turbo": {"input": 10.00, "output": 30.00},
+    "gpt-4": {"input": 30.00, "output": 60.00},
+    "gpt-3.5-turbo": {"input": 0.50, "output": 1.50},
+    "o1": {"input": 15.00, "output": 60.00},
+    "o3-mini": {"input": 1.10, "output": 4.40},
+    "text-embedding-3-small": {"input": 0.02, "output": 0.0},
+    "text-embedding-3-large": {"input": 0.13, "output": 0.0},
+}
+
+_table = None
+
+
+def pricing() -> dict:
+    global _table
+    if _table is None:
+        table = {model: dict(prices) for model, prices in PRICING.items()}
+        path = os.environ.get(PRICING_ENV)
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                for model, prices in json.load(f).items():
+                    table.setdefault(model, {"input": 0.0, "output": 0.0}).update(prices)
+        _table = table
+    return _table
+
+
+def price(model: str = DEFAULT_LLM_MODEL, kind: str = "input") -> float:
+    """USD per token for `model`'s `input` or `output` tokens."""
+    prices = pricing().get(model)
+    if prices is None:
+        raise ValueError(f"No price for model: {model}. Known: {', '.join(pricing())} (add more via {PRICING_ENV})")
+    return prices[kind] / 1_000_000
+
+
+def estimate_cost(tokens: int, model: str = DEFAULT_LLM_MODEL, kind: str = "input") -> float:
+    return round(tokens * price(model, kind), 6)
+
+
+def known_cost(tokens: int, model: str = DEFAULT_LLM_MODEL, kind: str = "input") -> float | None:
+    # Encoding names (cl100k_base, ...) count tokens but have no price
+    return estimate_cost(tokens, model, kind) if model in pricing() else None
@@ -0,0 +1,126 @@
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from app import memo
+
+
+def _cache_counts():
+    return {name: (s["hits"], s["misses"]) for name, s in memo.stats().items()}
+
+
+def _rate(count: int, seconds: float):
+    return round(count / seconds, 1) if seconds > 0 else None
+
+
+def _cache_metrics(hits: int, misses: int) -> dict:
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 4)}
+
+
+def _combine(previous: dict, metrics: dict) -> dict:
+    # A stage entered again (e.g. `ner` annotation, then entity extraction) adds up
+    combined = dict(metrics)
+    combined["wall_s"] = round(previous["wall_s"] + metrics["wall_s"], 6)
+    combined["cpu_s"] = round(previous["cpu_s"] + metrics["cpu_s"], 6)
+    if "peak_memory_kb" in metrics:
+        combined["peak_memory_kb"] = max(previous["peak_memory_kb"], metrics["peak_memory_kb"])
+    cache = dict(previous.get("cache", {}))
+    for table, counts in metrics.get("cache", {}).items():
+        before = cache.get(table, {"hits": 0, "misses": 0})
+        cache[table] = _cache_metrics(before["hits"] + counts["hits"], before["misses"] + counts["misses"])
+    if cache:
+        combined["cache"] = cache
+    return combined
+
+
+class Profiler:
+    """
+    Records per-stage wall/CPU time, memo cache hit rates and (optionally)
+    tracemalloc peak memory.
+
+    Pass one to `pipeline.analyze_text(..., profiler=...)`. `on_stage`, if
+    given, is called as `on_stage(name, metrics)` after every stage, e.g. to
+    forward timings to a metrics system. With `cprofile_dir`, each stage is
+    also run under cProfile and dumped to `<cprofile_dir>/<stage>.prof`.
+    A stage entered more than once accumulates into one entry.
+    """
+
+    def __init__(self, memory: bool = True, cprofile_dir=None, on_stage=None):
+        self.memory = memory
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.on_stage = on_stage
+        self.tokens = 0
+        self.stages = {}
+        self._profiles = {}
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+
+        profile = self._profiles.setdefault(name, cProfile.Profile()) if self.cprofile_dir else None
+        counts = _cache_counts()
+        start, start_cpu = time.perf_counter(), time.process_time()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - start_cpu
+
+            metrics = {"wall_s": round(wall, 6), "cpu_s": round(cpu, 6), "tokens_per_s": None}
+
+            if self.memory:
+                metrics["peak_memory_kb"] = round((tracemalloc.get_traced_memory()[1] - base) / 1024, 1)
+
+            # Memo tables touched by this stage only
+            cache = {}
+            for table, (hits, misses) in _cache_counts().items():
+                hits -= counts.get(table, (0, 0))[0]
+                misses -= counts.get(table, (0, 0))[1]
+                if hits or misses:
+                    cache[table] = _cache_metrics(hits, misses)
+            if cache:
+                metrics["cache"] = cache
+
+            if profile:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(self.cprofile_dir / f"{name}.prof")
+
+            if name in self.stages:
+                metrics = _combine(self.stages[name], metrics)
+            self.stages[name] = metrics
+            if self.on_stage:
+                self.on_stage(name, metrics)
+
+    def metrics(self) -> dict:
+        # tokens_per_s is filled in here, once the token count is known
+        wall = sum(m["wall_s"] for m in self.stages.values())
+        cpu = sum(m["cpu_s"] for m in self.stages.values())
+        for m in self.stages.values():
+            m["tokens_per_s"] = _rate(self.tokens, m["wall_s"])
+
+        total = {"wall_s": round(wall, 6), "cpu_s": round(cpu, 6), "tokens": self.tokens, "tokens_per_s": _rate(self.tokens, wall)}
+        if self.memory:
+            total["peak_memory_kb"] = max((m["peak_memory_kb"] for m in self.stages.values()), default=0.0)
+        return {"total": total, "stages": self.stages}
+
+    def close(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def stage(profiler, name: str):
+    """`profiler.stage(name)`, or a no-op context when profiling is off."""
+    return profiler.stage(name) if profiler else nullcontext()
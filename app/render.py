@@ -0,0 +1,137 @@
+import sys
+from itertools import islice
+
+from rich import box
+from rich.errors import MarkupError
+from rich.markup import escape
+from rich.table import Table
+from rich.text import Text
+
+MODES = ("auto", "rich", "stream", "tsv")
+# Rows shown per table in `rich` mode unless --max-rows says otherwise
+DEFAULT_MAX_ROWS = 500
+PAGE_ROWS = 200
+MAX_COLUMN_WIDTH = 40
+PREVIEW_CHARS = 500
+
+
+def plain(cell) -> str:
+    # Strip Rich markup (colored stems, entities) for width measurement and TSV
+    cell = str(cell)
+    if "[" not in cell:
+        return cell
+    try:
+        return Text.from_markup(cell).plain
+    except MarkupError:
+        return cell
+
+
+def _fit(cell: str, width: int) -> str:
+    # Pad (or truncate) a possibly marked-up cell to `width` visible characters
+    text = plain(cell)
+    if len(text) > width:
+        return escape(text[:width - 1] + "…")
+    return cell + " " * (width - len(text))
+
+
+def preview(text: str, limit: int = PREVIEW_CHARS) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… [dim]({len(text) - limit:,} more characters)[/dim]"
+
+
+class Renderer:
+    """
+    Renders result tables in one of three modes:
+
+    - `rich`: boxed Rich tables, capped at `max_rows` rows plus a summary line
+    - `stream`: fixed-width pages of `PAGE_ROWS` rows, printed as they are built
+    - `tsv`: plain tab-separated text straight to stdout
+
+    `auto` picks `rich` on a terminal and `tsv` otherwise. `max_rows=None`
+    means `DEFAULT_MAX_ROWS` for `rich` and no limit for the other modes;
+    0 always means no limit.
+    """
+
+    def __init__(self, console, mode: str = "auto", max_rows: int | None = None, out=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown render mode: {mode}. Choose from: {', '.join(MODES)}")
+        self.console = console
+        self.out = out or sys.stdout
+        self.mode = mode if mode != "auto" else ("rich" if console.is_terminal else "tsv")
+        if max_rows is None:
+            max_rows = DEFAULT_MAX_ROWS if self.mode == "rich" else 0
+        self.max_rows = max_rows
+
+    def table(self, title: str, columns, rows):
+        rows = iter(rows)
+        if self.max_rows:
+            shown = islice(rows, self.max_rows)
+        else:
+            shown, rows = rows, iter(())
+
+        if self.mode == "tsv":
+            self._tsv(title, columns, shown)
+        elif self.mode == "stream":
+            self._stream(title, columns, shown)
+        else:
+            self._rich(title, columns, shown)
+
+        hidden = sum(1 for _ in rows)
+        if hidden:
+            self._note(f"… {hidden:,} more rows not shown (--max-rows 0 shows all)")
+
+    def _note(self, message: str):
+        if self.mode == "tsv":
+            self.out.write(f"# {message}\n")
+        else:
+            self.console.print(f"[dim]{message}[/dim]")
+
+    def _rich(self, title, columns, rows):
+        table = Table(
+            title=f"[bold cyan]{title}[/bold cyan]",
+            box=box.DOUBLE,
+            show_lines=True,
+            expand=True
+        )
+        for col in columns:
+            table.add_column(col, style="bold white")
+        for row in rows:
+            table.add_row(*map(str, row))
+        self.console.print(table)
+
+    def _stream(self, title, columns, rows):
+        # Fixed-width lines, one console write per page: Rich `Table` layout
+        # costs far more than the NLP on big inputs
+        self.console.print(f"[bold cyan]{title}[/bold cyan]")
+        widths = None
+        while True:
+            page = [tuple(map(str, row)) for row in islice(rows, PAGE_ROWS)]
+            if not page:
+                break
+            if widths is None:
+                # Column widths are fixed from the first page so later pages line up
+                widths = [
+                    min(MAX_COLUMN_WIDTH, max([len(col)] + [len(plain(row[i])) for row in page]))
+                    for i, col in enumerate(columns)
+                ]
+                header = "  ".join(col.ljust(width)[:width] for col, width in zip(columns, widths))
+                self.console.print(f"[bold]{escape(header)}[/bold]", highlight=False)
+                self.console.print("─" * len(header), style="dim", highlight=False)
+            lines = ["  ".join(_fit(cell, width) for cell, width in zip(row, widths)) for row in page]
+            self.console.print("\n".join(lines), highlight=False, soft_wrap=True)
+
+    def _tsv(self, title, columns, rows):
+        def clean(cell):
+            return plain(cell).replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+        out = self.out
+        out.write(f"# {title}\n")
+        out.write("\t".join(columns) + "\n")
+        while True:
+            page = list(islice(rows, PAGE_ROWS))
+            if not page:
+                break
+            out.write("".join("\t".join(map(clean, row)) + "\n" for row in page))
+        out.write("\n")
+        out.flush()
@@ -0,0 +1,140 @@
+import re
+import threading
+
+# ----------------------------
+# Lazy resource registry
+# ----------------------------
+# Heavy models (spaCy, tiktoken, NLTK stemmers, WordNet) are only imported
+# and loaded the first time a command actually asks for them.
+_factories = {}
+_instances = {}
+_lock = threading.RLock()
+
+
+def register(name: str):
+    def decorator(factory):
+        _factories[name] = factory
+        return factory
+    return decorator
+
+
+def get(name: str, *args):
+    key = (name, args)
+    try:
+        return _instances[key]
+    except KeyError:
+        pass
+
+    with _lock:
+        if key not in _instances:
+            if name not in _factories:
+                raise KeyError(f"Unknown resource: {name}")
+            _instances[key] = _factories[name](*args)
+        return _instances[key]
+
+
+def is_loaded(name: str) -> bool:
+    return any(key[0] == name for key in _instances)
+
+
+def loaded() -> list[str]:
+    return sorted({key[0] for key in _instances})
+
+
+def clear():
+    with _lock:
+        _instances.clear()
+
+
+# ----------------------------
+# Built-in resources
+# ----------------------------
+# Only `doc.ents` is ever read; en_core_web_sm's NER has its own tok2vec,
+# so the shared tok2vec and everything that listens to it can be skipped
+SPACY_EXCLUDE = ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter")
+
+
+@register("spacy")
+def _load_spacy(model: str = "en_core_web_sm", exclude: tuple = SPACY_EXCLUDE):
+    import spacy
+    return spacy.load(model, exclude=list(exclude))
+
+
+@register("tiktoken")
+def _load_tiktoken(encoding: str = "cl100k_base"):
+    import tiktoken
+    return tiktoken.get_encoding(encoding)
+
+
+# Encoding names ("cl100k_base", "o200k", "p50k_edit") as opposed to model names
+_ENCODING_NAME = re.compile(r"[a-z]+\d+k(_\w+)?")
+
+
+@register("llm_encoder")
+def _load_llm_encoder(model: str):
+    # Model name -> its encoding; also accepts an encoding name directly,
+    # with or without "_base" ("o200k"). An encoding this tiktoken doesn't
+    # ship is an error; other unknown models fall back to cl100k_base
+    # (GPT-4 / GPT-3.5 family).
+    import tiktoken
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    if not _ENCODING_NAME.fullmatch(model):
+        return get("tiktoken", "cl100k_base")
+    known = tiktoken.list_encoding_names()
+    for encoding in (model, f"{model}_base"):
+        if encoding in known:
+            return get("tiktoken", encoding)
+    raise ValueError(
+        f"Unknown encoding: {model}. tiktoken {tiktoken.__version__} ships: {', '.join(known)}"
+    )
+
+
+@register("punkt")
+def _load_punkt(language: str = "english"):
+    from nltk.tokenize.punkt import PunktTokenizer
+    return PunktTokenizer(language)
+
+
+@register("word_tokenizer")
+def _load_word_tokenizer():
+    from nltk.tokenize import NLTKWordTokenizer
+    return NLTKWordTokenizer()
+
+
+@register("porter")
+def _load_porter():
+    from nltk.stem import PorterStemmer
+    return PorterStemmer()
+
+
+@register("snowball")
+def _load_snowball(language: str = "english"):
+    from nltk.stem import SnowballStemmer
+    return SnowballStemmer(language)
+
+
+@register("lancaster")
+def _load_lancaster():
+    from nltk.stem import LancasterStemmer
+    return LancasterStemmer()
+
+
+@register("wordnet")
+def _load_wordnet():
+    from nltk.corpus import wordnet
+    return wordnet
+
+
+@register("pos_tagger")
+def _load_pos_tagger():
+    from nltk.tag.perceptron import PerceptronTagger
+    return PerceptronTagger()
+
+
+@register("wordnet_lemmatizer")
+def _load_wordnet_lemmatizer():
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
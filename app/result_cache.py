@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from importlib import metadata
+from pathlib import Path
+
+from app import wordnet_index
+from app.json_stream import json_default
+from app.pricing import pricing
+
+# Bump when the shape of cached results changes
+CACHE_SCHEMA = 1
+
+CACHE_DIR_ENV = "TEXT_ANALYZER_CACHE_DIR"
+CACHE_MAX_MB_ENV = "TEXT_ANALYZER_CACHE_MAX_MB"
+DEFAULT_MAX_MB = 512
+
+VERSIONED_PACKAGES = ("nltk", "spacy", "en_core_web_sm", "tiktoken")
+
+
+def default_cache_dir() -> Path:
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "text-analyzer"
+
+
+def library_versions() -> dict:
+    # Read from package metadata so nothing heavy gets imported
+    versions = {"schema": CACHE_SCHEMA}
+    for name in VERSIONED_PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+_versions = None
+
+
+def cache_key(text: str, stages, **options) -> str:
+    global _versions
+    if _versions is None:
+        _versions = library_versions()
+
+    material = json.dumps({
+        "text": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "stages": sorted(stages),
+        "options": options,
+        "versions": _versions,
+        # TEXT_ANALYZER_WORDNET_EXACT changes every validity flag and winner
+        "wordnet_exact": wordnet_index.EXACT_MORPHY,
+        # Results carry cost estimates; TEXT_ANALYZER_PRICING can change them
+        "pricing": pricing()
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed result cache in a single SQLite file.
+
+    SQLite (WAL mode, busy timeout) handles concurrent readers and writers
+    across processes. When the stored payload grows past `max_bytes`, the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, path=None, max_bytes: int | None = None):
+        if path is None:
+            path = default_cache_dir() / "results.sqlite"
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get(CACHE_MAX_MB_ENV, DEFAULT_MAX_MB)) * 1024 * 1024)
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def _count(self, name: str):
+        self._connect().execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get(self, key: str):
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        self._count("hits")
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, value):
+        data = zlib.compress(json.dumps(value, ensure_ascii=False, default=json_default).encode("utf-8"))
+        if len(data) > self.max_bytes:
+            return
+
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now)
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict least recently used entries down to 90% of the limit
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            evicted.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (len(evicted),)
+        )
+
+    def clear(self) -> int:
+        conn = self._connect()
+        removed = conn.execute("DELETE FROM entries").rowcount
+        conn.execute("DELETE FROM counters")
+        conn.execute("VACUUM")
+        return removed
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "evictions": counters.get("evictions", 0)
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
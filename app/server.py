@@ -0,0 +1,264 @@
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app import resources
+from app.tokenizer import DEFAULT_LLM_MODEL, sentence_tokens, word_tokens, llm_token_counts, get_encoder
+from app.pos_tagger import pos_tag_text
+from app.lemmatizer import lemmatize_tokens
+from app.stemmer import stem_tokens
+from app.ner import process_texts, extract_entities_from_doc, generate_bio_tags_from_doc
+from app.json_stream import json_default
+from app.pipeline import analyze_requests
+
+DEFAULT_WINDOW_MS = 5
+DEFAULT_MAX_BATCH = 64
+
+_STOP = object()
+
+
+# ----------------------------
+# Batch handlers: list of request payloads -> list of results
+# ----------------------------
+def _token_counts(items):
+    # One batched count per requested model, returned in request order
+    groups = {}
+    for n, item in enumerate(items):
+        groups.setdefault(item.get("model", DEFAULT_LLM_MODEL), []).append(n)
+    counts = [0] * len(items)
+    for model, indexes in groups.items():
+        for n, count in zip(indexes, llm_token_counts([items[n]["text"] for n in indexes], model)):
+            counts[n] = count
+    return counts
+
+
+def _batch_tokenize(items):
+    counts = _token_counts(items)
+    return [
+        {"sentences": sentence_tokens(i["text"]), "words": word_tokens(i["text"]), "llm_tokens": n}
+        for i, n in zip(items, counts)
+    ]
+
+
+def _batch_tokens(items):
+    return [{"llm_tokens": n} for n in _token_counts(items)]
+
+
+def _batch_pos(items):
+    tagged = [pos_tag_text(i["text"]) for i in items]
+    return [[{"token": w, "pos": p, "description": d} for w, p, d in t] for t in tagged]
+
+
+def _batch_lemmatize(items):
+    return [lemmatize_tokens(pos_tag_text(i["text"])) for i in items]
+
+
+def _batch_stem(items):
+    return [stem_tokens(word_tokens(i["text"])) for i in items]
+
+
+def _batch_ner(items):
+    docs = process_texts([i["text"] for i in items], batch_size=len(items))
+    return [
+        {
+            "entities": extract_entities_from_doc(doc),
+            "bio_tags": [{"token": t, "tag": b} for t, b in generate_bio_tags_from_doc(doc, i.get("scheme", "BIO").upper())]
+        }
+        for doc, i in zip(docs, items)
+    ]
+
+
+ENDPOINTS = {
+    "tokenize": _batch_tokenize,
+    "tokens": _batch_tokens,
+    "pos": _batch_pos,
+    "lemmatize": _batch_lemmatize,
+    "stem": _batch_stem,
+    "ner": _batch_ner,
+    "analyze": analyze_requests,
+}
+
+
+def warm():
+    # Load every model up front so the first request is as fast as the rest
+    for name, args in [
+        ("spacy", ("en_core_web_sm",)),
+        ("punkt", ("english",)),
+        ("word_tokenizer", ()),
+        ("porter", ()),
+        ("snowball", ("english",)),
+        ("lancaster", ()),
+        ("wordnet_lemmatizer", ()),
+        ("wordnet_vocabulary", ()),
+    ]:
+        resources.get(name, *args)
+    get_encoder()
+    resources.get("pos_tagger")
+
+
+# ----------------------------
+# Micro-batching
+# ----------------------------
+class MicroBatcher:
+    """
+    Collects requests arriving within `window` seconds (up to `max_batch`)
+    and runs them through `handler` as one batch on a worker thread.
+    Requests already queued when the window closes join the batch too, so
+    with `window=0` batches still form under load without added latency.
+    `handler` may return an exception in place of a result to fail just
+    that request.
+    """
+
+    def __init__(self, handler, window: float, max_batch: int):
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def enqueue(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def submit(self, item):
+        return self.enqueue(item).result()
+
+    def close(self):
+        # Requests queued before this still run; the worker thread then exits
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    pair = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pair is _STOP:
+                    self._queue.put(_STOP)
+                    break
+                batch.append(pair)
+            self._process(batch)
+
+    def _process(self, batch):
+        try:
+            results = self.handler([item for item, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # Isolate the failing request(s) instead of failing the whole batch
+            for pair in batch:
+                self._process([pair])
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def dispatch(items):
+    """`(endpoint, payload)` pairs -> results, one handler call per endpoint in the batch."""
+    groups = {}
+    for n, (endpoint, _) in enumerate(items):
+        groups.setdefault(endpoint, []).append(n)
+    results = [None] * len(items)
+    for endpoint, indexes in groups.items():
+        for n, result in zip(indexes, ENDPOINTS[endpoint]([items[n][1] for n in indexes])):
+            results[n] = result
+    return results
+
+
+class AnalysisService:
+    """
+    Serves every endpoint from one worker thread, like `TextAnalyzer`:
+    spaCy and the tagger are never called concurrently, and requests for
+    different endpoints still share a batch window.
+    """
+
+    def __init__(self, window_ms: float = DEFAULT_WINDOW_MS, max_batch: int = DEFAULT_MAX_BATCH):
+        self.batcher = MicroBatcher(dispatch, window_ms / 1000, max_batch)
+
+    def handle(self, endpoint: str, payload: dict):
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint: {endpoint}")
+        if not isinstance(payload, dict) or not isinstance(payload.get("text"), str):
+            raise ValueError("Request body must be a JSON object with a 'text' string")
+        return self.batcher.submit((endpoint, payload))
+
+    def close(self):
+        self.batcher.close()
+
+
+# ----------------------------
+# HTTP transport (TCP or Unix socket)
+# ----------------------------
+def make_handler(service: AnalysisService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def address_string(self):
+            # Unix socket peers have no (host, port)
+            return self.client_address[0] if self.client_address else "unix"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body):
+            data = json.dumps(body, ensure_ascii=False, default=json_default).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/health":
+                self._send(200, {"status": "ok", "endpoints": sorted(ENDPOINTS)})
+            else:
+                self._send(404, {"error": f"Unknown path: {self.path}"})
+
+        def do_POST(self):
+            endpoint = self.path.strip("/")
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+            if endpoint not in ENDPOINTS:
+                self._send(404, {"error": f"Unknown endpoint: {endpoint}"})
+                return
+            try:
+                self._send(200, service.handle(endpoint, json.loads(body or b"{}")))
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+            except Exception as e:
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    return Handler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: AnalysisService, host: str = "127.0.0.1", port: int = 8765, socket_path: str | None = None):
+    handler = make_handler(service)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,273 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.document import Document
+from app.executor import size_balanced_batches, warm_stages
+from app.lemmatizer import lemmatize_document
+from app.ner import annotate_documents
+from app.pos_tagger import tag_document
+from app.stemmer import stem_document
+from app.tokenizer import llm_token_count
+
+STATS_VERSION = 1
+STATS_STAGES = ("tokens", "lemmas", "stems", "ner")
+# Buffered token ids are folded into the count arrays past this many tokens
+FLUSH_TOKENS = 1 << 20
+
+COUNTED = ("term", "lemma", "stem")
+TIE, LEMMA, STEM = 0, 1, 2
+
+
+def winner_codes(stem_ids, lemma_ids, stem_valid, lemma_valid):
+    """Vectorized `pipeline.token_winner` over id / validity arrays (TIE, LEMMA, STEM codes)."""
+    tie = stem_ids == lemma_ids
+    stem = ~tie & stem_valid & ~lemma_valid
+    return np.where(tie, TIE, np.where(stem, STEM, LEMMA))
+
+
+class Vocabulary:
+    """String <-> integer id mapping; ids are assigned in first-seen order."""
+
+    def __init__(self, strings=()):
+        self.index = {}
+        self.encode(strings)
+
+    def __len__(self):
+        return len(self.index)
+
+    def encode(self, strings) -> np.ndarray:
+        index = self.index
+        setdefault = index.setdefault
+        return np.array([setdefault(s, len(index)) for s in strings], dtype=np.int64)
+
+    def strings(self) -> list[str]:
+        return list(self.index)
+
+
+def _add_counts(total: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    if len(counts) > len(total):
+        total = np.pad(total, (0, len(counts) - len(total)))
+    total[:len(counts)] += counts
+    return total
+
+
+def _reserve(total: np.ndarray, size: int) -> np.ndarray:
+    # Grow geometrically so repeated merges don't copy the whole vocabulary each time
+    if len(total) >= size:
+        return total
+    return np.pad(total, (0, max(size, 2 * len(total)) - len(total)))
+
+
+def _bitmap_array(bitmap, size: int) -> np.ndarray:
+    bits = np.frombuffer(bitmap.to_bytes(), dtype=np.uint8)
+    return np.unpackbits(bits, bitorder="little")[:size].astype(bool)
+
+
+class CorpusStats:
+    """
+    Corpus-level aggregates: term / lemma / Porter-stem frequencies, entity
+    labels, stem-vs-lemma wins, WordNet coverage and a histogram of LLM
+    tokens per document.
+
+    Strings are mapped to integer ids once; per-token ids are buffered and
+    counted with `np.bincount`. Aggregates from separate shards combine with
+    `merge`, and round-trip through `to_dict` / `from_dict` (JSON-safe).
+    """
+
+    def __init__(self):
+        self.words = Vocabulary()
+        self.labels = Vocabulary()
+        self.counts = {name: np.zeros(0, dtype=np.int64) for name in COUNTED + ("label",)}
+        self.llm_histogram = np.zeros(0, dtype=np.int64)
+        self.totals = dict.fromkeys(
+            ("documents", "tokens", "llm_tokens", "entities", "lemma_wins", "stem_wins", "ties", "lemma_valid", "stem_valid"), 0)
+        self._buffers = {name: [] for name in COUNTED + ("label", "stem_valid", "lemma_valid", "llm_bucket")}
+        self._buffered = 0
+
+    # ------------------------
+    # Accumulation
+    # ------------------------
+    def add_document(self, document: Document):
+        """Add a document whose lemma, stem and entity layers have been filled in."""
+        n = len(document)
+        lemmas, stems = document.lemmas, document.stems
+        llm_count = llm_token_count(document.text)
+
+        buffers = self._buffers
+        buffers["term"].append(self.words.encode(document.tokens))
+        buffers["lemma"].append(self.words.encode(lemmas.column("lemma")))
+        buffers["stem"].append(self.words.encode(stems.column("porter")))
+        buffers["label"].append(self.labels.encode(label for _, _, label in document.entities))
+        buffers["lemma_valid"].append(_bitmap_array(lemmas.column("lemma_valid"), n))
+        buffers["stem_valid"].append(_bitmap_array(stems.column("porter_valid"), n))
+        buffers["llm_bucket"].append(llm_count.bit_length())
+
+        self.totals["documents"] += 1
+        self.totals["tokens"] += n
+        self.totals["llm_tokens"] += llm_count
+        self.totals["entities"] += len(document.entities)
+
+        self._buffered += n
+        if self._buffered >= FLUSH_TOKENS:
+            self.flush()
+
+    def add_documents(self, documents):
+        for document in documents:
+            self.add_document(document)
+        self.flush()
+        return self
+
+    def flush(self):
+        buffers = self._buffers
+        if not buffers["llm_bucket"]:
+            return
+
+        ids = {name: np.concatenate(buffers[name]) if buffers[name] else np.zeros(0, dtype=np.int64)
+               for name in COUNTED + ("label",)}
+        for name, values in ids.items():
+            self.counts[name] = _add_counts(self.counts[name], np.bincount(values))
+
+        stem_valid = np.concatenate(buffers["stem_valid"])
+        lemma_valid = np.concatenate(buffers["lemma_valid"])
+        wins = np.bincount(winner_codes(ids["stem"], ids["lemma"], stem_valid, lemma_valid), minlength=3)
+        self.totals["ties"] += int(wins[TIE])
+        self.totals["lemma_wins"] += int(wins[LEMMA])
+        self.totals["stem_wins"] += int(wins[STEM])
+        self.totals["stem_valid"] += int(stem_valid.sum())
+        self.totals["lemma_valid"] += int(lemma_valid.sum())
+
+        self.llm_histogram = _add_counts(self.llm_histogram, np.bincount(buffers["llm_bucket"]))
+
+        for buffer in buffers.values():
+            buffer.clear()
+        self._buffered = 0
+
+    # ------------------------
+    # Merging / serialization
+    # ------------------------
+    def merge(self, other: "CorpusStats"):
+        """Fold `other` (e.g. a shard's partial aggregate) into this one."""
+        self.flush()
+        other.flush()
+
+        for mine, theirs, names in ((self.words, other.words, COUNTED), (self.labels, other.labels, ("label",))):
+            # Remap the other shard's ids onto ours and add in place
+            mapping = mine.encode(theirs.strings())
+            for name in names:
+                # Merged aggregates hold spare capacity past their vocabulary
+                counts = other.counts[name][:len(theirs)]
+                total = self.counts[name] = _reserve(self.counts[name], len(mine))
+                np.add.at(total, mapping[:len(counts)], counts)
+
+        self.llm_histogram = _add_counts(self.llm_histogram, other.llm_histogram)
+        for name, value in other.totals.items():
+            self.totals[name] += value
+        return self
+
+    def to_dict(self) -> dict:
+        self.flush()
+        return {
+            "version": STATS_VERSION,
+            "totals": dict(self.totals),
+            "words": self.words.strings(),
+            "labels": self.labels.strings(),
+            "counts": {
+                name: counts[:len(self.labels if name == "label" else self.words)].tolist()
+                for name, counts in self.counts.items()
+            },
+            "llm_histogram": self.llm_histogram.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CorpusStats":
+        if data.get("version") != STATS_VERSION:
+            raise ValueError(f"Unsupported stats version: {data.get('version')}")
+        stats = cls()
+        stats.words = Vocabulary(data["words"])
+        stats.labels = Vocabulary(data["labels"])
+        stats.counts = {name: np.array(counts, dtype=np.int64) for name, counts in data["counts"].items()}
+        stats.llm_histogram = np.array(data["llm_histogram"], dtype=np.int64)
+        stats.totals.update(data["totals"])
+        return stats
+
+    # ------------------------
+    # Report
+    # ------------------------
+    def _top(self, name: str, vocabulary: Vocabulary, top: int):
+        counts = self.counts[name]
+        if not len(counts):
+            return []
+        k = min(top, len(counts))
+        best = np.argpartition(-counts, k - 1)[:k]
+        best = best[np.argsort(-counts[best], kind="stable")]
+        strings = vocabulary.strings()
+        return [(strings[i], int(counts[i])) for i in best if counts[i]]
+
+    def summary(self, top: int = 20) -> dict:
+        self.flush()
+        totals = self.totals
+        tokens = totals["tokens"] or 1
+
+        labels = self._top("label", self.labels, len(self.labels))
+        histogram = [
+            {"llm_tokens": "0" if bucket == 0 else f"{1 << (bucket - 1)}-{(1 << bucket) - 1}", "documents": int(n)}
+            for bucket, n in enumerate(self.llm_histogram) if n
+        ]
+        return {
+            "documents": totals["documents"],
+            "tokens": totals["tokens"],
+            "unique_terms": int(np.count_nonzero(self.counts["term"])),
+            "llm_tokens": totals["llm_tokens"],
+            "win_rates": {
+                "lemma": round(totals["lemma_wins"] / tokens, 4),
+                "stem": round(totals["stem_wins"] / tokens, 4),
+                "tie": round(totals["ties"] / tokens, 4)
+            },
+            "wordnet_coverage": {
+                "lemma": round(totals["lemma_valid"] / tokens, 4),
+                "stem": round(totals["stem_valid"] / tokens, 4)
+            },
+            "top_terms": self._top("term", self.words, top),
+            "top_lemmas": self._top("lemma", self.words, top),
+            "top_stems": self._top("stem", self.words, top),
+            "entity_labels": [
+                (label, n, round(n / (totals["entities"] or 1), 4)) for label, n in labels
+            ],
+            "llm_token_histogram": histogram
+        }
+
+
+# ----------------------------
+# Corpus driver
+# ----------------------------
+def iter_annotated(documents, batch_size: int = 64):
+    """`(doc_id, text)` pairs -> Documents with lemma, stem and entity layers."""
+    tokenized = (Document.from_text(text, doc_id=doc_id) for doc_id, text in documents)
+    for document in annotate_documents(tokenized, batch_size=batch_size):
+        tag_document(document)
+        lemmatize_document(document)
+        stem_document(document)
+        yield document
+
+
+def shard_stats(batch) -> CorpusStats:
+    return CorpusStats().add_documents(iter_annotated(batch, batch_size=len(batch)))
+
+
+def collect_stats(documents, workers: int = 1, batch_size: int = 64) -> CorpusStats:
+    """Aggregate `(doc_id, text)` pairs, on `workers` processes when > 1."""
+    if workers <= 1:
+        return CorpusStats().add_documents(iter_annotated(documents, batch_size))
+
+    stats = CorpusStats()
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_stages, initargs=(STATS_STAGES,)) as pool:
+        pending = deque()
+        for batch in size_balanced_batches(documents, batch_size=batch_size):
+            pending.append(pool.submit(shard_stats, batch))
+            if len(pending) >= workers * 2:
+                stats.merge(pending.popleft().result())
+        while pending:
+            stats.merge(pending.popleft().result())
+    return stats
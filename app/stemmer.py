@@ -1,30 +1,46 @@
-from nltk.stem import PorterStemmer, SnowballStemmer, LancasterStemmer
-from nltk.corpus import wordnet
+from app import memo, resources
+from app.lexicon import lookup_stems
+from app.memo import memoize_types
+from app.token_table import TokenTable
+from app.wordnet_index import is_valid_word
 
-porter = PorterStemmer()
-snowball = SnowballStemmer("english")
-lancaster = LancasterStemmer()
+def _stem_type(key):
+    token, exact = key
+    # Precomputed lexicon first; the NLTK stemmers only see unknown words
+    known = lookup_stems(token, exact)
+    if known is not None:
+        return known
 
-def is_valid_word(word: str):
-    return bool(wordnet.synsets(word))
+    porter_stem = resources.get("porter").stem(token)
+    snowball_stem = resources.get("snowball", "english").stem(token)
+    lancaster_stem = resources.get("lancaster").stem(token)
 
+    return (
+        porter_stem,
+        snowball_stem,
+        lancaster_stem,
+        is_valid_word(porter_stem, exact),
+        is_valid_word(snowball_stem, exact),
+        is_valid_word(lancaster_stem, exact),
+    )
 
-def stem_tokens(tokens: list[str]):
-    results = []
 
-    for token in tokens:
-        porter_stem = porter.stem(token)
-        snowball_stem = snowball.stem(token)
-        lancaster_stem = lancaster.stem(token)
+STEM_FIELDS = ("token", "porter", "snowball", "lancaster")
+STEM_FLAGS = ("porter_valid", "snowball_valid", "lancaster_valid")
 
-        results.append({
-            "token": token,
-            "porter": porter_stem,
-            "snowball": snowball_stem,
-            "lancaster": lancaster_stem,
-            "porter_valid": is_valid_word(porter_stem),
-            "snowball_valid": is_valid_word(snowball_stem),
-            "lancaster_valid": is_valid_word(lancaster_stem),
-        })
 
-    return results
+def stem_table(tokens: list[str], exact: bool | None = None) -> TokenTable:
+    # Stems are computed once per token type and shared by its occurrences
+    stems = memoize_types([(token, exact) for token in tokens], memo.table("stems"), _stem_type)
+    columns = dict(zip(STEM_FIELDS[1:] + STEM_FLAGS, zip(*stems))) if stems else {}
+    columns["token"] = tokens
+    return TokenTable(STEM_FIELDS, STEM_FLAGS, {name: columns.get(name, ()) for name in STEM_FIELDS + STEM_FLAGS})
+
+
+def stem_tokens(tokens: list[str], exact: bool | None = None):
+    return stem_table(tokens, exact).to_dicts()
+
+
+def stem_document(document):
+    document.stems = stem_table(document.tokens)
+    return document
@@ -0,0 +1,93 @@
+import sys
+
+
+class Bitmap:
+    """Packed booleans, one bit per token."""
+
+    __slots__ = ("_bits", "_size")
+
+    def __init__(self, values=()):
+        bits = bytearray()
+        size = 0
+        for value in values:
+            if not size & 7:
+                bits.append(0)
+            if value:
+                bits[-1] |= 1 << (size & 7)
+            size += 1
+        self._bits = bits
+        self._size = size
+
+    @classmethod
+    def from_bytes(cls, data: bytes, size: int):
+        bitmap = cls()
+        bitmap._bits = bytearray(data)
+        bitmap._size = size
+        return bitmap
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i: int) -> bool:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("bitmap index out of range")
+        return bool(self._bits[i >> 3] & (1 << (i & 7)))
+
+    def __iter__(self):
+        bits = self._bits
+        for i in range(self._size):
+            yield bool(bits[i >> 3] & (1 << (i & 7)))
+
+    def count(self) -> int:
+        return sum(bin(b).count("1") for b in self._bits)
+
+
+class TokenTable:
+    """
+    A per-token layer stored column-wise and indexed by token position.
+
+    String `fields` are kept as lists of interned strings and boolean
+    `flags` as `Bitmap`s, instead of one dict per token. `row(i)` /
+    `to_dicts()` rebuild the JSON shape (fields, then flags, in order)
+    only when a result is written out.
+    """
+
+    __slots__ = ("fields", "flags", "_columns", "_size")
+
+    def __init__(self, fields: tuple, flags: tuple, columns: dict):
+        self.fields = fields
+        self.flags = flags
+        intern = sys.intern
+        self._columns = {name: [intern(v) for v in columns[name]] for name in fields}
+        self._columns.update({name: Bitmap(columns[name]) for name in flags})
+
+        sizes = {len(c) for c in self._columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("TokenTable columns must all have the same length")
+        self._size = sizes.pop() if sizes else 0
+
+    def __len__(self):
+        return self._size
+
+    def column(self, name: str):
+        """The list (string field) or `Bitmap` (flag) for `name`."""
+        return self._columns[name]
+
+    def row(self, i: int) -> dict:
+        return {name: self._columns[name][i] for name in self.fields + self.flags}
+
+    def __getitem__(self, i: int) -> dict:
+        return self.row(i)
+
+    def __iter__(self):
+        names = self.fields + self.flags
+        for values in zip(*(self._columns[name] for name in names)):
+            yield dict(zip(names, values))
+
+    def to_dicts(self) -> list[dict]:
+        return list(self)
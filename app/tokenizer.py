@@ -1,16 +1,110 @@
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-import tiktoken
+import re
+
+from app import resources
+
+QUOTES = {'"', "``", "''"}
+DEFAULT_LLM_MODEL = "gpt-4o-mini"
 
 def sentence_tokens(text: str):
+    from nltk.tokenize import sent_tokenize
     return sent_tokenize(text)
 
 def word_tokens(text: str):
+    from nltk.tokenize import word_tokenize
     return word_tokenize(text)
 
-def llm_tokens(text: str, model: str = "gpt-4o-mini"):
-    # Use the exact tokenizer used by GPT-4 / GPT-4o family
-    enc = tiktoken.get_encoding("cl100k_base")
-    tokens = enc.encode(text)
+def sentence_spans(text: str):
+    # Same Punkt model as `sentence_tokens`, but as (start, end) offsets
+    return list(resources.get("punkt", "english").span_tokenize(text))
+
+def word_spans(sentence: str, offset: int = 0):
+    # One Treebank pass returning `word_tokens`-identical tokens plus their
+    # character spans in the original text (shifted by `offset`).
+    from nltk.tokenize.util import align_tokens
+
+    tokens = resources.get("word_tokenizer").tokenize(sentence)
+
+    # Treebank rewrites double quotes to `` / ''; align against the originals
+    if '"' in sentence or "''" in sentence:
+        matched = [m.group() for m in re.finditer(r"``|'{2}|\"", sentence)]
+        originals = [matched.pop(0) if t in QUOTES and matched else t for t in tokens]
+    else:
+        originals = tokens
+
+    try:
+        spans = align_tokens(originals, sentence)
+    except ValueError:
+        spans = _find_spans(originals, sentence)
+
+    return tokens, [(start + offset, end + offset) for start, end in spans]
+
+def _find_spans(tokens: list[str], text: str):
+    spans = []
+    cursor = 0
+    for token in tokens:
+        start = text.find(token, cursor)
+        if start == -1:
+            spans.append((cursor, cursor))
+            continue
+        cursor = start + len(token)
+        spans.append((start, cursor))
+    return spans
+
+def get_encoder(model: str = DEFAULT_LLM_MODEL):
+    # Cached per model; resolves to the encoding tiktoken maps the model to
+    return resources.get("llm_encoder", model)
+
+def llm_tokens(text: str, model: str = DEFAULT_LLM_MODEL):
+    enc = get_encoder(model)
+    tokens = enc.encode_ordinary(text)
     decoded = [enc.decode([t]) for t in tokens]
     return list(zip(decoded, tokens)), len(tokens)
+
+def llm_token_count(text: str, model: str = DEFAULT_LLM_MODEL) -> int:
+    # Count-only fast path: no per-token decoding
+    return len(get_encoder(model).encode_ordinary(text))
+
+def llm_token_counts(texts, model: str = DEFAULT_LLM_MODEL, num_threads: int = 8, batch_size: int = 1000) -> list[int]:
+    # Batched counting for corpora; tiktoken encodes each batch on a thread pool
+    enc = get_encoder(model)
+    counts = []
+    batch = []
+    for text in texts:
+        batch.append(text)
+        if len(batch) >= batch_size:
+            counts.extend(len(t) for t in enc.encode_ordinary_batch(batch, num_threads=num_threads))
+            batch = []
+    if batch:
+        counts.extend(len(t) for t in enc.encode_ordinary_batch(batch, num_threads=num_threads))
+    return counts
+
+def llm_token_totals(texts, models=(DEFAULT_LLM_MODEL,), num_threads: int = 8, batch_size: int = 1000) -> dict:
+    """
+    Corpus totals: `{"documents": n, "tokens": {model: total}}`. Texts are
+    streamed in batches and encoded once per distinct encoding, however many
+    of `models` share it.
+    """
+    encodings = {}
+    for model in models:
+        enc = get_encoder(model)
+        encodings.setdefault(enc.name, (enc, []))[1].append(model)
+
+    totals = dict.fromkeys(models, 0)
+    documents = 0
+    batch = []
+
+    def flush():
+        for enc, names in encodings.values():
+            count = sum(len(t) for t in enc.encode_ordinary_batch(batch, num_threads=num_threads))
+            for name in names:
+                totals[name] += count
+        batch.clear()
+
+    for text in texts:
+        batch.append(text)
+        documents += 1
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return {"documents": documents, "tokens": totals}
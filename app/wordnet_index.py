@@ -0,0 +1,83 @@
+import mmap
+import os
+
+from app import resources
+
+# Set TEXT_ANALYZER_WORDNET_INDEX to a file written by `save_vocabulary`
+# to memory-map it instead of building the vocabulary in every process.
+INDEX_ENV = "TEXT_ANALYZER_WORDNET_INDEX"
+
+# With exact semantics a word missing from the lemma-name index is still
+# valid if WordNet's morphy can reduce it to a lemma ("cars" -> "car"),
+# which is what `bool(wordnet.synsets(word))` used to answer.
+EXACT_ENV = "TEXT_ANALYZER_WORDNET_EXACT"
+EXACT_MORPHY = os.environ.get(EXACT_ENV, "") == "1"
+
+
+def build_vocabulary() -> frozenset[str]:
+    wordnet = resources.get("wordnet")
+    return frozenset(name.lower() for name in wordnet.all_lemma_names())
+
+
+def save_vocabulary(path, vocabulary=None):
+    # Sorted by UTF-8 bytes, one name per line, so it can be binary searched
+    if vocabulary is None:
+        vocabulary = build_vocabulary()
+    words = sorted(w.encode("utf-8") for w in vocabulary)
+    with open(path, "wb") as f:
+        f.write(b"\n".join(words))
+        f.write(b"\n")
+    return len(words)
+
+
+class MappedVocabulary:
+    """Read-only, memory-mapped view of a vocabulary file written by `save_vocabulary`."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        self._size = len(self._map)
+
+    def __contains__(self, word: str) -> bool:
+        key = word.encode("utf-8")
+        data = self._map
+        lo, hi = 0, self._size
+
+        # `lo` and `hi` always sit on line boundaries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b"\n", 0, mid) + 1
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = self._size
+            line = data[start:end]
+            if line == key:
+                return True
+            if line < key:
+                lo = end + 1
+            else:
+                hi = start
+
+        return False
+
+    def __len__(self):
+        return self._map[:self._size].count(b"\n")
+
+
+@resources.register("wordnet_vocabulary")
+def _load_vocabulary():
+    path = os.environ.get(INDEX_ENV)
+    if path and os.path.exists(path):
+        return MappedVocabulary(path)
+    return build_vocabulary()
+
+
+def is_valid_word(word: str, exact: bool | None = None) -> bool:
+    word = word.lower()
+    if word in resources.get("wordnet_vocabulary"):
+        return True
+
+    if EXACT_MORPHY if exact is None else exact:
+        return resources.get("wordnet").morphy(word) is not None
+    return False
@@ -0,0 +1,78 @@
+"""
+BIO tagging scaling benchmark.
+
+Builds synthetic spaCy docs of increasing length (one entity every few
+tokens, so entity count grows with the document) and times
+`generate_bio_tags_from_doc`. Per-token time should stay flat.
+
+    python benchmarks/bio_tags.py
+    python benchmarks/bio_tags.py --sizes 1000,10000,100000 --legacy
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import spacy
+from spacy.tokens import Doc, Span
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ner import generate_bio_tags_from_doc  # noqa: E402
+
+LABELS = ["PERSON", "ORG", "GPE", "DATE"]
+
+
+def legacy_bio_tags(doc):
+    # Previous O(tokens x entities) implementation, kept for comparison
+    bio_tags = []
+    for token in doc:
+        tag = "O"
+        for ent in doc.ents:
+            if token.i == ent.start:
+                tag = f"B-{ent.label_}"
+            elif ent.start < token.i < ent.end:
+                tag = f"I-{ent.label_}"
+        bio_tags.append((token.text, tag))
+    return bio_tags
+
+
+def synthetic_doc(vocab, n_tokens: int, every: int = 8):
+    doc = Doc(vocab, words=[f"w{i}" for i in range(n_tokens)])
+    doc.ents = [
+        Span(doc, i, min(i + 2, n_tokens), LABELS[(i // every) % len(LABELS)])
+        for i in range(0, n_tokens, every)
+    ]
+    return doc
+
+
+def best_of(fn, doc, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(doc)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000,50000", help="Comma-separated token counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy", action="store_true", help="Also time the old quadratic implementation")
+    args = parser.parse_args()
+
+    vocab = spacy.blank("en").vocab
+    print(f"{'tokens':>8} {'entities':>9} {'BIO ms':>9} {'us/token':>9}" + (f" {'legacy ms':>10}" if args.legacy else ""))
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        doc = synthetic_doc(vocab, size)
+        elapsed = best_of(generate_bio_tags_from_doc, doc, args.repeat)
+        line = f"{size:>8} {len(doc.ents):>9} {elapsed * 1000:>9.2f} {elapsed / size * 1e6:>9.3f}"
+        if args.legacy:
+            line += f" {best_of(legacy_bio_tags, doc, 1) * 1000:>10.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
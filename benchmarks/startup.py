@@ -0,0 +1,127 @@
+"""
+Startup-time benchmark for the CLI.
+
+Runs every subcommand in a fresh interpreter with `python -X importtime`,
+then reports wall-clock time, total import time and the slowest imports.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --commands tokenize,stem --max-import-ms 1500
+    python benchmarks/startup.py --json > startup.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLE = "Tony Stark built Jarvis in Malibu. It was running smoothly."
+
+COMMANDS = {
+    "help": ["--help"],
+    "tokenize": ["tokenize", SAMPLE],
+    "pos": ["pos", SAMPLE],
+    "lemmatize": ["lemmatize", SAMPLE],
+    "stem": ["stem", SAMPLE],
+    "ner": ["ner", SAMPLE],
+    "compare": ["compare", SAMPLE],
+    "analyze": ["analyze", SAMPLE],
+}
+
+# Heavy libraries a subcommand must never import; catches lazy-loading regressions.
+FORBIDDEN = {
+    "help": {"spacy", "nltk", "tiktoken", "numpy"},
+    "tokenize": {"spacy"},
+    "pos": {"spacy", "tiktoken"},
+    "lemmatize": {"spacy", "tiktoken"},
+    "stem": {"spacy", "tiktoken"},
+    "ner": {"nltk", "tiktoken"},
+    "compare": {"spacy", "tiktoken"},
+}
+
+
+def parse_importtime(stderr: str):
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        imports.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip())) // 2
+        })
+    return imports
+
+
+def measure(command: str, top: int = 5):
+    args = [sys.executable, "-X", "importtime", str(ROOT / "main.py"), *COMMANDS[command], "--json-output"]
+    if command == "help":
+        args = args[:-1]
+
+    start = time.perf_counter()
+    proc = subprocess.run(args, cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    imports = parse_importtime(proc.stderr)
+    total_us = sum(i["self_us"] for i in imports)
+    slowest = sorted(imports, key=lambda i: i["cumulative_us"], reverse=True)[:top]
+
+    heavy = {
+        i["module"].split(".")[0] for i in imports
+        if i["module"].split(".")[0] in {"spacy", "nltk", "tiktoken", "thinc", "torch", "numpy"}
+    }
+
+    return {
+        "command": command,
+        "returncode": proc.returncode,
+        "wall_ms": round(wall * 1000, 1),
+        "import_ms": round(total_us / 1000, 1),
+        "heavy_modules": sorted(heavy),
+        "forbidden_imports": sorted(heavy & FORBIDDEN.get(command, set())),
+        "slowest_imports": [
+            {"module": i["module"], "cumulative_ms": round(i["cumulative_us"] / 1000, 1)}
+            for i in slowest
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", default=",".join(COMMANDS), help="Comma-separated subcommands to measure")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest imports to report")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="Fail if any command exceeds this import time")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a text report")
+    args = parser.parse_args()
+
+    reports = [measure(c.strip(), args.top) for c in args.commands.split(",") if c.strip()]
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for r in reports:
+            print(f"{r['command']:<10} wall={r['wall_ms']:>8} ms  import={r['import_ms']:>8} ms  "
+                  f"heavy={','.join(r['heavy_modules']) or '-'}  rc={r['returncode']}")
+            for i in r["slowest_imports"]:
+                print(f"    {i['cumulative_ms']:>8} ms  {i['module']}")
+
+    failed = False
+    for r in reports:
+        if r["forbidden_imports"]:
+            print(f"{r['command']} imported {', '.join(r['forbidden_imports'])}", file=sys.stderr)
+            failed = True
+
+    if args.max_import_ms is not None:
+        slow = [r["command"] for r in reports if r["import_ms"] > args.max_import_ms]
+        if slow:
+            print(f"Import time regression (> {args.max_import_ms} ms): {', '.join(slow)}", file=sys.stderr)
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Pipeline benchmark suite with JSON baselines and regression thresholds.
+
+Generates synthetic corpora from short tweets to long documents, times
+every pipeline stage on each, and records throughput (word tokens/s) and
+peak traced memory.
+
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json --threshold 0.25
+    python benchmarks/suite.py --stages stem_tokens,analyze --sizes tweet,article
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import memo  # noqa: E402
+from app.tokenizer import sentence_tokens, word_tokens, llm_tokens  # noqa: E402
+from app.pos_tagger import pos_tag_tokens  # noqa: E402
+from app.lemmatizer import lemmatize_tokens  # noqa: E402
+from app.stemmer import stem_tokens  # noqa: E402
+from app.ner import process_text, generate_bio_tags_from_doc  # noqa: E402
+from app.pipeline import analyze_text  # noqa: E402
+from app.result_cache import library_versions  # noqa: E402
+
+# name -> (documents, words per document)
+SIZES = {
+    "tweet": (200, 20),
+    "paragraph": (50, 200),
+    "article": (10, 2_000),
+    "long": (2, 20_000),
+}
+
+NAMES = ["Tony Stark", "Pepper Potts", "Stark Industries", "Malibu", "New York", "Wakanda", "Monday", "March 2024"]
+WORDS = (
+    "the a an analysts were running studies on happier markets while engineers built better systems "
+    "quickly and the committee approved several proposals about running costs during meetings with "
+    "investors who visited factories cities universities and laboratories across growing regions"
+).split()
+
+
+def synthetic_text(n_words: int, rng: random.Random) -> str:
+    sentences = []
+    count = 0
+    while count < n_words:
+        length = rng.randint(8, 20)
+        words = [rng.choice(WORDS) for _ in range(length)]
+        words.insert(rng.randrange(len(words)), rng.choice(NAMES))
+        sentence = " ".join(words)
+        sentences.append(sentence[0].upper() + sentence[1:] + ".")
+        count += length + 1
+    return " ".join(sentences)
+
+
+def corpus(size: str, seed: int = 13) -> list[str]:
+    n_docs, n_words = SIZES[size]
+    rng = random.Random(f"{seed}-{size}")
+    return [synthetic_text(n_words, rng) for _ in range(n_docs)]
+
+
+def prepare(texts):
+    # Inputs each stage expects, built outside the timed region
+    words = [word_tokens(t) for t in texts]
+    tagged = [pos_tag_tokens(ws) for ws in words]
+    docs = [process_text(t) for t in texts]
+    return {"texts": texts, "words": words, "tagged": tagged, "docs": docs}
+
+
+STAGES = {
+    "sentence_tokens": lambda d: [sentence_tokens(t) for t in d["texts"]],
+    "word_tokens": lambda d: [word_tokens(t) for t in d["texts"]],
+    "llm_tokens": lambda d: [llm_tokens(t) for t in d["texts"]],
+    "pos_tag_tokens": lambda d: [pos_tag_tokens(ws) for ws in d["words"]],
+    "lemmatize_tokens": lambda d: [lemmatize_tokens(t) for t in d["tagged"]],
+    "stem_tokens": lambda d: [stem_tokens(ws) for ws in d["words"]],
+    "process_text": lambda d: [process_text(t) for t in d["texts"]],
+    "generate_bio_tags_from_doc": lambda d: [generate_bio_tags_from_doc(doc) for doc in d["docs"]],
+    "analyze": lambda d: [analyze_text(t) for t in d["texts"]],
+}
+
+
+def measure(stage: str, data, repeat: int, warm: bool):
+    fn = STAGES[stage]
+    n_tokens = sum(len(ws) for ws in data["words"])
+
+    best = float("inf")
+    cpu = float("inf")
+    for _ in range(repeat):
+        if not warm:
+            for table in memo.stats():
+                memo.table(table).clear()
+        start, start_cpu = time.perf_counter(), time.process_time()
+        fn(data)
+        best = min(best, time.perf_counter() - start)
+        cpu = min(cpu, time.process_time() - start_cpu)
+
+    if not warm:
+        for table in memo.stats():
+            memo.table(table).clear()
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "documents": len(data["texts"]),
+        "tokens": n_tokens,
+        "wall_s": round(best, 6),
+        "cpu_s": round(cpu, 6),
+        "tokens_per_s": round(n_tokens / best, 1) if best else None,
+        "peak_memory_kb": round(peak / 1024, 1)
+    }
+
+
+def run(stages, sizes, repeat: int, warm: bool):
+    results = {}
+    for size in sizes:
+        data = prepare(corpus(size))
+        for stage in stages:
+            results[f"{stage}/{size}"] = measure(stage, data, repeat, warm)
+            r = results[f"{stage}/{size}"]
+            print(f"{stage:<28} {size:<10} {r['tokens_per_s']:>14,.0f} tok/s  {r['wall_s'] * 1000:>10.1f} ms  "
+                  f"{r['peak_memory_kb']:>10,.0f} KB", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "versions": library_versions(),
+            "repeat": repeat,
+            "warm_memo": warm
+        },
+        "results": results
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, memory_threshold: float):
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if not before:
+            continue
+        if before["tokens_per_s"] and now["tokens_per_s"] < before["tokens_per_s"] * (1 - threshold):
+            regressions.append(f"{key}: throughput {now['tokens_per_s']:,.0f} < {before['tokens_per_s']:,.0f} tok/s")
+        if before["peak_memory_kb"] and now["peak_memory_kb"] > before["peak_memory_kb"] * (1 + memory_threshold):
+            regressions.append(f"{key}: peak memory {now['peak_memory_kb']:,.0f} > {before['peak_memory_kb']:,.0f} KB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="Comma-separated corpus sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best is kept)")
+    parser.add_argument("--warm", action="store_true", help="Keep stem/lemma memo tables warm between runs")
+    parser.add_argument("--save", type=Path, help="Write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed throughput drop (fraction)")
+    parser.add_argument("--memory-threshold", type=float, default=0.5, help="Allowed peak memory growth (fraction)")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES] + [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"Unknown stage/size: {', '.join(unknown)}")
+
+    current = run(stages, sizes, args.repeat, args.warm)
+
+    if args.save:
+        args.save.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(current, indent=2))
+
+    if args.compare:
+        regressions = compare(current, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold, args.memory_threshold)
+        for r in regressions:
+            print(f"REGRESSION {r}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
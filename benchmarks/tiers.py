@@ -0,0 +1,126 @@
+"""
+Speed vs. agreement report for the backend tiers (`analyze --tier`).
+
+Runs the full `analyze` pipeline with every tier over a fixed sample corpus
+and compares each tier's tokens, POS tags, lemmas and entities with the
+`accurate` tier's:
+
+- tokens:   F1 of token character spans
+- pos:      share of identically-spanned tokens with the same tag
+- lemmas:   share of identically-spanned tokens with the same lemma (case-insensitive)
+- entities: F1 of (character span, label) triples
+
+    python benchmarks/tiers.py
+    python benchmarks/tiers.py --corpus docs.jsonl --repeat 5 --save tiers.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import memo  # noqa: E402
+from app.backends import DEFAULT_TIER, TIERS, warm  # noqa: E402
+from app.corpus import iter_documents  # noqa: E402
+from app.pipeline import analyze_stream  # noqa: E402
+
+SAMPLE_CORPUS = Path(__file__).resolve().parent / "data" / "sample_corpus.jsonl"
+
+
+def run_tier(documents, tier: str, repeat: int):
+    warm(tier)
+    best = float("inf")
+    for _ in range(repeat):
+        # Cold memo tables, so tiers don't profit from each other's work
+        for table in memo.stats():
+            memo.table(table).clear()
+        start = time.perf_counter()
+        results = [result for _, result in analyze_stream(documents, tier=tier)]
+        best = min(best, time.perf_counter() - start)
+    return results, best
+
+
+def _f1(found: set, expected: set) -> float:
+    if not found and not expected:
+        return 1.0
+    matched = len(found & expected)
+    return round(2 * matched / (len(found) + len(expected)), 4)
+
+
+def _layers(result):
+    offsets = [tuple(span) for span in result["tokenization"]["word_offsets"]]
+    tokens = {
+        span: (row["pos"], row["lemma"].lower())
+        for span, row in zip(offsets, result["pos_lemmatization"])
+    }
+    entities = {
+        (offsets[e["start"]][0], offsets[e["end"] - 1][1], e["label"])
+        for e in result["named_entities"]
+    }
+    return tokens, entities
+
+
+def agreement(results, reference) -> dict:
+    token_f1, entity_f1 = [], []
+    same_pos = same_lemma = shared = 0
+    for result, expected in zip(results, reference):
+        tokens, entities = _layers(result)
+        expected_tokens, expected_entities = _layers(expected)
+        token_f1.append(_f1(set(tokens), set(expected_tokens)))
+        entity_f1.append(_f1(entities, expected_entities))
+        for span in tokens.keys() & expected_tokens.keys():
+            shared += 1
+            same_pos += tokens[span][0] == expected_tokens[span][0]
+            same_lemma += tokens[span][1] == expected_tokens[span][1]
+    return {
+        "tokens": round(sum(token_f1) / len(token_f1), 4),
+        "pos": round(same_pos / shared, 4) if shared else 0.0,
+        "lemmas": round(same_lemma / shared, 4) if shared else 0.0,
+        "entities": round(sum(entity_f1) / len(entity_f1), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(SAMPLE_CORPUS), help="Corpus source (default: the bundled sample)")
+    parser.add_argument("--tiers", default=",".join(TIERS), help="Comma-separated tiers")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per tier (best is kept)")
+    parser.add_argument("--save", type=Path, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    tiers = [t.strip() for t in args.tiers.split(",") if t.strip()]
+    unknown = [t for t in tiers if t not in TIERS]
+    if unknown:
+        parser.error(f"Unknown tier: {', '.join(unknown)}")
+
+    documents = list(iter_documents(args.corpus))
+    characters = sum(len(text) for _, text in documents)
+    reference, reference_s = run_tier(documents, DEFAULT_TIER, args.repeat)
+
+    report = {"corpus": args.corpus, "documents": len(documents), "characters": characters, "tiers": {}}
+    for tier in tiers:
+        results, seconds = (reference, reference_s) if tier == DEFAULT_TIER else run_tier(documents, tier, args.repeat)
+        report["tiers"][tier] = {
+            "backends": TIERS[tier],
+            "wall_s": round(seconds, 4),
+            "documents_per_s": round(len(documents) / seconds, 1),
+            "speedup": round(reference_s / seconds, 2),
+            "agreement": agreement(results, reference),
+        }
+
+    print(f"{'tier':<10} {'docs/s':>9} {'speedup':>8} {'tokens':>8} {'pos':>8} {'lemmas':>8} {'entities':>9}", file=sys.stderr)
+    for tier, r in report["tiers"].items():
+        a = r["agreement"]
+        print(f"{tier:<10} {r['documents_per_s']:>9,.1f} {r['speedup']:>7.2f}x {a['tokens']:>8.1%} {a['pos']:>8.1%} "
+              f"{a['lemmas']:>8.1%} {a['entities']:>9.1%}", file=sys.stderr)
+
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import pytest
+
+from app import analyzer
+from app.analyzer import TextAnalyzer
+from app.result_cache import ResultCache
+from app.token_table import TokenTable
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    # Record each batch the worker thread runs, and the thread it runs on
+    seen = []
+
+    def analyze_requests(requests):
+        seen.append(([r["text"] for r in requests], threading.current_thread().name))
+        return [{"text": r["text"], "scheme": r["scheme"], "stages": r["stages"], "tier": r["tier"]} for r in requests]
+
+    monkeypatch.setattr(analyzer, "analyze_requests", analyze_requests)
+    return seen
+
+
+def test_analyze_many_keeps_order_and_batches(batches):
+    with TextAnalyzer(stages=["tokens"], batch_size=4) as text_analyzer:
+        results = text_analyzer.analyze_many([str(i) for i in range(10)])
+        single = text_analyzer.analyze("x", scheme="bilou", tier="fast")
+
+    assert [r["text"] for r in results] == [str(i) for i in range(10)]
+    assert all(len(texts) <= 4 for texts, _ in batches)
+    assert len(batches) < 11
+    assert single == {"text": "x", "scheme": "BILOU", "stages": ["tokens"], "tier": "fast"}
+    assert len({thread for _, thread in batches}) == 1
+
+
+def test_concurrent_threads_and_coroutines_share_one_worker(batches):
+    text_analyzer = TextAnalyzer(window_ms=20)
+    results = {}
+
+    def run(i):
+        results[i] = text_analyzer.analyze(f"t{i}")["text"]
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    async def gather():
+        return await asyncio.gather(*(text_analyzer.analyze_async(f"a{i}") for i in range(8)))
+
+    async_results = asyncio.run(gather())
+    text_analyzer.close()
+
+    assert results == {i: f"t{i}" for i in range(8)}
+    assert [r["text"] for r in async_results] == [f"a{i}" for i in range(8)]
+    assert len(batches) < 16
+    assert len({thread for _, thread in batches}) == 1
+
+
+def test_stream_and_cache(batches, tmp_path):
+    text_analyzer = TextAnalyzer(cache=ResultCache(tmp_path / "cache.sqlite"), batch_size=2)
+    documents = [("a", "one"), ("b", "two"), ("c", "one")]
+
+    first = list(text_analyzer.analyze_stream(documents))
+    calls = len(batches)
+    second = list(text_analyzer.analyze_stream(documents))
+    text_analyzer.close()
+
+    assert [doc_id for doc_id, _ in first] == ["a", "b", "c"]
+    assert second == first
+    assert len(batches) == calls
+
+
+def test_options_are_validated():
+    with pytest.raises(ValueError):
+        TextAnalyzer(tier="turbo")
+    with pytest.raises(ValueError):
+        TextAnalyzer(stages=["tokens", "sentiment"])
+    with pytest.raises(ValueError):
+        TextAnalyzer().analyze("text", scheme="IOB")
+
+
+def test_cache_hits_and_misses_have_the_same_shape(monkeypatch, tmp_path):
+    def analyze_requests(requests):
+        table = TokenTable(("token", "lemma"), ("lemma_valid",), {"token": ["cats"], "lemma": ["cat"], "lemma_valid": [True]})
+        return [{"text": r["text"], "pos_lemmatization": table} for r in requests]
+
+    monkeypatch.setattr(analyzer, "analyze_requests", analyze_requests)
+    with TextAnalyzer(cache=ResultCache(tmp_path / "cache.sqlite")) as text_analyzer:
+        miss = text_analyzer.analyze("cats")
+        hit = text_analyzer.analyze("cats")
+
+    assert miss == hit
+    assert miss["pos_lemmatization"] == [{"token": "cats", "lemma": "cat", "lemma_valid": True}]
+
+
+def test_failures_stay_with_their_item(monkeypatch):
+    def analyze_requests(requests):
+        if any(r["text"] == "bad" for r in requests):
+            raise RuntimeError("boom")
+        return [{"text": r["text"]} for r in requests]
+
+    monkeypatch.setattr(analyzer, "analyze_requests", analyze_requests)
+    calls = []
+    with TextAnalyzer(window_ms=50) as text_analyzer:
+        stream = list(text_analyzer.analyze_stream([("a", "one"), ("b", "bad"), ("c", "two")]))
+
+        worker = text_analyzer._worker()
+        command = worker.enqueue(lambda: calls.append(1) or "done")
+        failing = worker.enqueue(text_analyzer._request("bad"))
+        passing = worker.enqueue(text_analyzer._request("fine"))
+
+        assert command.result() == "done"
+        assert passing.result() == {"text": "fine"}
+        with pytest.raises(RuntimeError):
+            failing.result()
+
+    assert stream == [("a", {"text": "one"}), ("b", {"error": "RuntimeError: boom"}), ("c", {"text": "two"})]
+    assert calls == [1]
@@ -0,0 +1,35 @@
+import pytest
+
+from app import backends
+from app.backends import BACKEND_STAGES, TIERS, guess_tag, regex_document
+
+
+def test_every_tier_backend_is_registered():
+    for tier, stages in TIERS.items():
+        assert set(stages) == set(BACKEND_STAGES)
+        for stage in BACKEND_STAGES:
+            assert callable(backends.backend(stage, tier))
+
+    with pytest.raises(ValueError):
+        backends.backend("pos", "turbo")
+
+
+def test_regex_tokenizer_offsets_and_sentences():
+    text = 'He said "Stop." Then he left.  I don\'t know John\'s e-mail; it costs $3.50.'
+    document = regex_document(text, doc_id="d")
+
+    assert document.tokens == [
+        "He", "said", '"', "Stop", ".", '"', "Then", "he", "left", ".",
+        "I", "do", "n't", "know", "John", "'s", "e-mail", ";", "it", "costs", "$", "3.50", ".",
+    ]
+    assert all(text[start:end] == token for token, (start, end) in zip(document.tokens, document.offsets))
+    assert document.sentence_texts() == ['He said "Stop."', "Then he left.", "I don't know John's e-mail; it costs $3.50."]
+    assert document.sentence_tokens[-1] == (10, len(document))
+
+
+def test_guess_tag_prefers_lexicon_then_rules():
+    tagdict = {"the": "DT", "is": "VBZ"}
+
+    assert [guess_tag(w, tagdict) for w in ["The", "is", "running", "quickly", "cars", "glass"]] == \
+        ["DT", "VBZ", "VBG", "RB", "NNS", "NN"]
+    assert [guess_tag(w, tagdict) for w in ["Apple", "3.5", ",", "(", "%"]] == ["NNP", "CD", ",", "(", "SYM"]
@@ -0,0 +1,49 @@
+import pytest
+
+from app.chunker import chunk_text
+from app.tokenizer import get_encoder, llm_token_count, llm_token_totals
+
+TEXT = (
+    "Tony Stark built Jarvis in Malibu. Pepper Potts runs Stark Industries. "
+    "The committee approved several proposals on Monday. Engineers rebuilt the cooling systems quickly. "
+    "Analysts expect running costs to fall next year."
+)
+
+
+def test_chunks_fit_budget_and_keep_sentences():
+    chunks = chunk_text(TEXT, max_tokens=20, model="cl100k_base")
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk["text"] == TEXT[chunk["start"]:chunk["end"]]
+        assert chunk["text"].endswith(".")
+        assert llm_token_count(chunk["text"], "cl100k_base") <= chunk["tokens"] <= 20
+    assert " ".join(c["text"] for c in chunks) == TEXT
+
+
+def test_overlap_repeats_whole_sentences():
+    chunks = chunk_text(TEXT, max_tokens=30, overlap=15, model="o200k_base")
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk["start"] < previous["end"]
+        assert TEXT[chunk["start"]:previous["end"]].endswith(".")
+
+
+def test_long_sentence_is_split_under_budget():
+    text = "word " * 300 + "end."
+    chunks = chunk_text(text, max_tokens=50)
+
+    assert all(c["tokens"] <= 50 for c in chunks)
+    assert chunks[-1]["text"].endswith("end.")
+    with pytest.raises(ValueError):
+        chunk_text(text, max_tokens=10, overlap=10)
+
+
+def test_corpus_totals_share_encodings():
+    texts = ["Hello world", "Tony Stark built Jarvis", ""]
+    totals = llm_token_totals(texts, ["gpt-4o", "gpt-4o-mini", "gpt-4"], batch_size=2)
+
+    assert totals["documents"] == 3
+    assert totals["tokens"]["gpt-4o"] == totals["tokens"]["gpt-4o-mini"] == sum(llm_token_count(t, "gpt-4o") for t in texts)
+    assert totals["tokens"]["gpt-4"] == sum(llm_token_count(t, "gpt-4") for t in texts)
+    assert get_encoder("o200k").name == "o200k_base"
@@ -0,0 +1,82 @@
+import pytest
+
+from app.columnar import MAGIC, ColumnarReader, ColumnarWriter, write_columnar
+
+def make_result(words, entities):
+    return {
+        "tokenization": {
+            "sentences": [" ".join(words)],
+            "words": words,
+            "word_offsets": [[i, i + 1] for i in range(len(words))],
+            "llm_tokens": len(words),
+            "llm_estimated_cost": 0.0
+        },
+        "stemming": [
+            {"token": w, "porter": w.lower(), "snowball": w.lower(), "lancaster": w.lower(),
+             "porter_valid": w.islower(), "snowball_valid": True, "lancaster_valid": False}
+            for w in words
+        ],
+        "named_entities": entities,
+    }
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_roundtrip_one_layer_per_document(tmp_path, compress):
+    path = tmp_path / "out.tacol"
+    docs = [
+        ("a", make_result(["Tony", "ran"] * 50, [{"text": "Tony", "label": "PERSON", "start": 0, "end": 1}])),
+        ("b", make_result(["Malibu", "is", "sunny"], [])),
+    ]
+    assert write_columnar(path, docs, compress=compress) == 2
+
+    with ColumnarReader(path) as reader:
+        assert reader.ids() == ["a", "b"]
+        assert reader.layers() == ["tokens", "sentences", "stems", "entities"]
+        assert reader.layer("tokens", doc=1)["token"] == ["Malibu", "is", "sunny"]
+        assert reader.column("stems", "porter_valid", doc=1) == [False, True, True]
+        assert reader.layer("entities")["label"] == ["PERSON"]
+        assert reader.layer("entities", doc=1)["label"] == []
+        assert reader.summary()["llm_tokens"] == [100, 3]
+        with pytest.raises(KeyError):
+            reader.layer("bio")
+
+def test_row_groups_are_written_as_documents_arrive(tmp_path):
+    path = tmp_path / "corpus.tacol"
+    entity = [{"text": "Tony", "label": "PERSON", "start": 0, "end": 1}]
+    docs = [(f"d{i}", make_result(["Tony", f"w{i}"], entity if i == 3 else [])) for i in range(5)]
+    docs[4][1].pop("named_entities")
+
+    with ColumnarWriter(path, group_documents=2) as writer:
+        for doc_id, result in docs[:4]:
+            writer.add(result, doc_id)
+        # Two full groups are already on disk before the footer
+        assert path.stat().st_size > len(MAGIC) + 100
+        writer.add(docs[4][1], docs[4][0])
+
+    with ColumnarReader(path) as reader:
+        assert reader.documents == 5
+        assert reader.ids() == [f"d{i}" for i in range(5)]
+        assert reader.column("tokens", "token") == [w for i in range(5) for w in ("Tony", f"w{i}")]
+        assert reader.layer("tokens", doc=3)["token"] == ["Tony", "w3"]
+        assert reader.layer("entities", doc=3)["label"] == ["PERSON"]
+        assert reader.layer("entities", doc=1) == {"text": [], "label": [], "start": [], "end": []}
+        assert reader.layer("entities", doc=4)["label"] == []
+        assert reader.summary()["llm_tokens"] == [2] * 5
+        with pytest.raises(IndexError):
+            reader.layer("tokens", doc=5)
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("{}" * 20)
+    with pytest.raises(ValueError):
+        ColumnarReader(path)
+
+def test_failed_documents_keep_their_error(tmp_path):
+    path = tmp_path / "corpus.tacol"
+    docs = [("ok", make_result(["Tony"], [])), ("bad", {"error": "LookupError: punkt"})]
+    write_columnar(path, docs)
+
+    with ColumnarReader(path) as reader:
+        assert reader.ids() == ["ok", "bad"]
+        assert reader.summary()["error"] == ["", "LookupError: punkt"]
+        assert reader.errors() == {1: "LookupError: punkt"}
+        assert reader.layer("tokens", doc=1)["token"] == []
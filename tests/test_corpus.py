@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from app.corpus import iter_documents
+
+def test_jsonl_corpus(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    path.write_text(
+        json.dumps({"id": "a", "text": "Hello world."}) + "\n\n" +
+        json.dumps({"text": "No id here."}) + "\n",
+        encoding="utf-8"
+    )
+
+    docs = list(iter_documents(str(path)))
+
+    assert docs[0] == ("a", "Hello world.")
+    assert docs[1] == (f"{path}:3", "No id here.")
+
+def test_directory_corpus(tmp_path):
+    (tmp_path / "b.txt").write_text("Second.\n", encoding="utf-8")
+    (tmp_path / "a.txt").write_text("First.", encoding="utf-8")
+    (tmp_path / "skip.md").write_text("Ignored.", encoding="utf-8")
+
+    docs = list(iter_documents(str(tmp_path)))
+
+    assert [text for _, text in docs] == ["First.", "Second."]
+
+def test_glob_corpus(tmp_path):
+    (tmp_path / "a.md").write_text("Markdown doc.", encoding="utf-8")
+
+    docs = list(iter_documents(str(tmp_path / "*.md")))
+
+    assert docs == [(str(tmp_path / "a.md"), "Markdown doc.")]
+
+def test_malformed_jsonl_line_names_source_and_line(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    path.write_text(json.dumps({"text": "Fine."}) + "\n{not json\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match=r"docs\.jsonl:2: invalid JSON"):
+        list(iter_documents(str(path)))
+
+def test_record_without_text_field_names_source_and_line(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    path.write_text(json.dumps({"body": "Wrong field."}) + "\n" + json.dumps([1, 2]) + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match=r"docs\.jsonl:1: missing 'text' field"):
+        list(iter_documents(str(path)))
+    with pytest.raises(ValueError, match=r"docs\.jsonl:2: missing 'body' field"):
+        list(iter_documents(str(path), text_field="body"))
@@ -0,0 +1,27 @@
+from app.document import Document
+from app.tokenizer import word_tokens
+from app.ner import annotate_document, document_bio_tags
+from app.pipeline import analyze_text
+
+def test_document_matches_word_tokens():
+    text = "Tony Stark built Jarvis. He lives in Malibu."
+    document = Document.from_text(text)
+
+    assert document.tokens == word_tokens(text)
+    assert len(document.sentences) == 2
+    assert all(text[s:e] == t for t, (s, e) in zip(document.tokens, document.offsets))
+
+def test_bio_tags_align_with_tokens():
+    document = annotate_document(Document.from_text("Apple is in California"))
+    tags = document_bio_tags(document)
+
+    assert [t for t, _ in tags] == document.tokens
+    assert any(tag.startswith("B-") for _, tag in tags)
+
+def test_analyze_layers_are_aligned():
+    result = analyze_text("The cats saw the cats.")
+    words = result["tokenization"]["words"]
+
+    assert [l["token"] for l in result["pos_lemmatization"]] == words
+    assert [b["token"] for b in result["bio_tags"]] == words
+    assert len(result["stem_vs_lemma_comparison"]["rows"]) == len(words)
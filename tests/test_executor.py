@@ -0,0 +1,46 @@
+import os
+import time
+
+from app import executor
+
+def test_size_balanced_batches_keep_order():
+    docs = [(i, "x" * n) for i, n in enumerate([40, 70, 10, 10, 10, 200])]
+    batches = list(executor.size_balanced_batches(docs, batch_chars=100, batch_size=3))
+
+    assert [[i for i, _ in b] for b in batches] == [[0, 1], [2, 3, 4], [5]]
+
+def test_batch_errors_are_isolated(monkeypatch):
+    def run(batch):
+        if any(text == "bad" for _, text in batch):
+            raise RuntimeError("boom")
+        return [(doc_id, {"text": text}) for doc_id, text in batch]
+
+    monkeypatch.setattr(executor, "_run", run)
+    results = executor.analyze_batch([("a", "ok"), ("b", "bad"), ("c", "fine")])
+
+    assert results == [
+        ("a", {"text": "ok"}),
+        ("b", {"error": "RuntimeError: boom"}),
+        ("c", {"text": "fine"}),
+    ]
+
+def _init_quietly(*args):
+    executor._worker.clear()
+
+def _crash_on_document(batch):
+    if any(text == "crash" for _, text in batch):
+        os._exit(1)
+    # Slow enough that the other batches are still in flight when one crashes
+    time.sleep(0.2)
+    return [(doc_id, {"text": text}) for doc_id, text in batch]
+
+def test_worker_crash_only_fails_the_crashing_document(monkeypatch):
+    monkeypatch.setattr(executor, "_init_worker", _init_quietly)
+    monkeypatch.setattr(executor, "_run", _crash_on_document)
+    docs = [(i, "crash" if i == 5 else f"doc {i}") for i in range(12)]
+
+    results = list(executor.analyze_parallel(docs, workers=4, batch_size=2))
+
+    assert [doc_id for doc_id, _ in results] == list(range(12))
+    assert results[5] == (5, {"error": "Worker process crashed"})
+    assert all(result == {"text": f"doc {i}"} for i, result in results if i != 5)
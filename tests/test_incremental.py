@@ -0,0 +1,48 @@
+from app import incremental
+from app.incremental import analyze_incremental, merge_sentences
+
+def part(words, entities=(), winners=()):
+    offsets, pos = [], 0
+    for w in words:
+        offsets.append([pos, pos + len(w)])
+        pos += len(w) + 1
+    return {
+        "words": words,
+        "word_offsets": offsets,
+        "pos_lemmatization": [{"token": w} for w in words],
+        "stemming": [{"token": w} for w in words],
+        "comparison_rows": [{"token": w, "winner": x} for w, x in zip(words, winners)],
+        "named_entities": list(entities),
+        "bio_tags": [{"token": w, "tag": "O"} for w in words],
+    }
+
+def test_merge_shifts_offsets_and_recounts(monkeypatch):
+    monkeypatch.setattr(incremental, "llm_token_count", lambda text: 7)
+    text = "Hi Tony. Go home."
+    merged = merge_sentences(text, [(0, 8), (9, 17)], [
+        part(["Hi", "Tony", "."], winners=["TIE", "LEMMA", "TIE"]),
+        part(["Go", "home", "."], [{"text": "home", "label": "LOC", "start": 1, "end": 2}], ["STEM", "STEM", "TIE"]),
+    ])
+
+    assert merged["tokenization"]["sentences"] == ["Hi Tony.", "Go home."]
+    assert merged["tokenization"]["word_offsets"][4] == [12, 16]
+    assert all(text[s:e] == w for w, (s, e) in zip(merged["tokenization"]["words"][3:5], merged["tokenization"]["word_offsets"][3:5]))
+    assert merged["named_entities"][0]["start"] == 4
+    assert merged["stem_vs_lemma_comparison"]["overall_winner"] == "Stemming"
+
+class DictCache(dict):
+    def get(self, key):
+        return dict.get(self, key)
+
+    def put(self, key, value):
+        self[key] = value
+
+def test_only_changed_sentences_are_analyzed():
+    cache = DictCache()
+    _, reused = analyze_incremental("Tony Stark lives in Malibu. He builds suits.", cache)
+    assert reused == 0
+
+    result, reused = analyze_incremental("Tony Stark lives in Malibu. He builds armor.", cache)
+    assert reused == 1
+    assert result["tokenization"]["words"][-2] == "armor"
+    assert result["named_entities"][0]["start"] == 0
@@ -0,0 +1,33 @@
+import io
+import json
+
+from app.json_stream import iter_json, json_default, write_json
+from app.token_table import TokenTable
+
+RESULT = {
+    "tokenization": {"sentences": ["Hi there."], "words": ["Hi", "there", "."], "llm_tokens": 3},
+    "stemming": [{"token": "running", "porter": "run", "porter_valid": True}] * 3,
+    "named_entities": [],
+    "bio_tags": [{"token": "Hi", "tag": "O"}, {"token": "there", "tag": "O"}],
+}
+
+def test_indented_output_matches_json_dumps():
+    streamed = dict(RESULT, bio_tags=(tag for tag in RESULT["bio_tags"]))
+
+    assert "".join(iter_json(streamed)) == json.dumps(RESULT, indent=2)
+
+def test_compact_output_to_multiple_sinks():
+    first, second = io.StringIO(), io.StringIO()
+    write_json({"a": [1, 2], "b": {"c": None}}, [first, second], compact=True)
+
+    assert first.getvalue() == '{"a":[1,2],"b":{"c":null}}\n'
+    assert second.getvalue() == first.getvalue()
+
+def test_token_tables_serialize_like_their_rows():
+    stems = TokenTable(("token", "porter"), ("porter_valid",), {
+        "token": ["running"] * 3, "porter": ["run"] * 3, "porter_valid": [True] * 3
+    })
+    result = dict(RESULT, stemming=stems)
+
+    assert "".join(iter_json(result)) == json.dumps(RESULT, indent=2)
+    assert json.dumps(result, default=json_default) == json.dumps(RESULT)
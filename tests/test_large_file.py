@@ -0,0 +1,67 @@
+from app import large_file
+from app.large_file import ChunkMerger, iter_chunk_results, iter_chunks
+
+def chunk_result(words, entities):
+    return {
+        "tokenization": {
+            "sentences": [" ".join(words)],
+            "words": words,
+            "word_offsets": [[i * 2, i * 2 + 1] for i in range(len(words))],
+            "llm_tokens": len(words)
+        },
+        "pos_lemmatization": [],
+        "stemming": [],
+        "stem_vs_lemma_comparison": {"rows": [], "lemma_wins": 1, "stem_wins": 0},
+        "named_entities": entities,
+        "bio_tags": [{"token": w, "tag": "O"} for w in words]
+    }
+
+def test_chunks_cover_file_on_sentence_boundaries(tmp_path):
+    text = "".join(f"Sentence {i} mentions Zürich. " for i in range(200))
+    path = tmp_path / "big.txt"
+    path.write_text(text, encoding="utf-8")
+
+    chunks = list(iter_chunks(path, chunk_bytes=300))
+
+    assert len(chunks) > 1
+    assert "".join(chunk for _, chunk in chunks) == text
+    assert all(text[offset:offset + len(chunk)] == chunk for offset, chunk in chunks)
+    assert all(chunk.rstrip().endswith(".") for _, chunk in chunks)
+
+def test_unpunctuated_text_is_cut_between_words(tmp_path, monkeypatch):
+    # A transcript with no sentence punctuation: every window is one "sentence"
+    monkeypatch.setattr(large_file, "sentence_spans", lambda text: [(0, len(text))] if text.strip() else [])
+    words = [f"word{i % 97}ü" for i in range(400)]
+    text = " ".join(words) + "\n"
+    path = tmp_path / "transcript.txt"
+    path.write_text(text, encoding="utf-8")
+
+    chunks = list(iter_chunks(path, chunk_bytes=101))
+
+    assert len(chunks) > 1
+    assert "".join(chunk for _, chunk in chunks) == text
+    assert all(chunk.split() == text[offset:offset + len(chunk)].split() for offset, chunk in chunks)
+    assert [w for _, chunk in chunks for w in chunk.split()] == words
+
+def test_chunk_results_use_the_scheme(monkeypatch):
+    monkeypatch.setattr(large_file, "analyze_text", lambda text, scheme="BIO": {"scheme": scheme})
+
+    results = list(iter_chunk_results([(0, "a"), (5, "b")], scheme="BILOU"))
+
+    assert results == [(0, {"scheme": "BILOU"}), (5, {"scheme": "BILOU"})]
+
+def test_merger_shifts_offsets_to_global_positions():
+    with ChunkMerger() as merger:
+        merger.add(0, chunk_result(["a", "B"], [{"text": "B", "label": "ORG", "start": 1, "end": 2}]))
+        merger.add(100, chunk_result(["C", "d"], [{"text": "C", "label": "GPE", "start": 0, "end": 1}]))
+        result = merger.result()
+
+        words = list(result["tokenization"]["words"])
+        offsets = list(result["tokenization"]["word_offsets"])
+        entities = list(result["named_entities"])
+
+    assert words == ["a", "B", "C", "d"]
+    assert offsets[2] == [100, 101]
+    assert [(e["start"], e["end"]) for e in entities] == [(1, 2), (2, 3)]
+    assert result["tokenization"]["llm_tokens"] == 4
+    assert result["stem_vs_lemma_comparison"]["lemma_wins"] == 2
@@ -19,3 +19,10 @@ def test_without_pos():
     result = lemmatize_tokens(tokens)
 
     assert result[0]["lemma"] == "good"
+
+def test_accepts_pos_tagger_triples():
+    tokens = [("cars", "NNS", "Plural noun")]
+    result = lemmatize_tokens(tokens)
+
+    assert result[0]["lemma"] == "car"
+    assert result[0]["pos"] == "NNS"
@@ -0,0 +1,59 @@
+import pytest
+
+from app import memo, resources
+from app.lexicon import LEXICON_ENV, MappedLexicon, lookup_lemma, lookup_stems, write_lexicon
+from app.lemmatizer import lemmatize_tokens
+from app.stemmer import stem_tokens
+
+RECORDS = [
+    ("running", "run", "run", "run", "running", "run", "running", "running", "1121112"),
+    ("geese", "gees", "gees", "gees", "goose", "geese", "geese", "geese", "0001222"),
+    ("café", "café", "café", "caf", "café", "café", "café", "café", "1101111"),
+    # Sentinel values NLTK would never produce
+    ("widget", "P", "S", "L", "LN", "LV", "LA", "LR", "0000000"),
+]
+
+
+@pytest.fixture
+def lexicon(tmp_path, monkeypatch):
+    path = tmp_path / "lexicon.bin"
+    write_lexicon(path, RECORDS)
+    monkeypatch.setenv(LEXICON_ENV, str(path))
+    resources._instances.pop(("lexicon", ()), None)
+    memo.table("stems").clear()
+    memo.table("lemmas").clear()
+    yield path
+    resources._instances.pop(("lexicon", ()), None)
+    memo.table("stems").clear()
+    memo.table("lemmas").clear()
+
+
+def test_mapped_lexicon_lookup(lexicon):
+    mapped = MappedLexicon(lexicon)
+
+    assert len(mapped) == 4
+    assert mapped.lookup("café")[3] == "caf"
+    assert all(word in mapped for word in ["running", "geese", "café"])
+    assert not any(word in mapped for word in ["", "run", "runnings", "zzz", "Geese"])
+
+
+def test_lookup_validity_follows_exact(lexicon):
+    assert lookup_stems("running", exact=False) == ("run", "run", "run", True, True, False)
+    assert lookup_stems("running", exact=True) == ("run", "run", "run", True, True, True)
+    assert lookup_lemma("geese", "n", exact=True) == ("goose", True)
+    assert lookup_lemma("geese", "v", exact=False) == ("geese", False)
+    assert lookup_lemma("geese", None, exact=False) == ("goose", True)
+    assert lookup_stems("unknown") is None
+
+
+def test_stem_and_lemmatize_use_lexicon(lexicon):
+    stems = stem_tokens(["widget"])[0]
+    assert (stems["porter"], stems["snowball"], stems["lancaster"]) == ("P", "S", "L")
+    assert [row["lemma"] for row in lemmatize_tokens([("widget", "VB"), ("widget", "JJ"), ("widget", "DT")])] == ["LV", "LA", "LN"]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-lexicon"
+    path.write_bytes(b"hello world, not a lexicon")
+    with pytest.raises(ValueError):
+        MappedLexicon(path)
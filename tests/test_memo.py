@@ -0,0 +1,31 @@
+from app.memo import LRUMemo, memoize_types
+
+def test_lru_eviction_and_counters():
+    memo = LRUMemo("test", maxsize=2)
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        return key.upper()
+
+    assert memo.get("a", compute) == "A"
+    assert memo.get("b", compute) == "B"
+    assert memo.get("a", compute) == "A"
+    memo.get("c", compute)
+    memo.get("b", compute)
+
+    assert calls == ["a", "b", "c", "b"]
+    assert memo.stats()["hits"] == 1
+    assert memo.stats()["misses"] == 4
+    assert len(memo) == 2
+
+def test_memoize_types_scatters_to_occurrences():
+    memo = LRUMemo("test")
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        return len(key)
+
+    assert memoize_types(["the", "cat", "the", "the"], memo, compute) == [3, 3, 3, 3]
+    assert calls == ["the", "cat"]
@@ -1,7 +1,8 @@
 from app.ner import (
     process_text,
     extract_entities_from_doc,
-    generate_bio_tags_from_doc
+    generate_bio_tags_from_doc,
+    iter_span_tags
 )
 
 def test_ner_detects_entity():
@@ -16,3 +17,17 @@ def test_bio_tags_present():
     tags = generate_bio_tags_from_doc(doc)
 
     assert any(tag.startswith("B-") for _, tag in tags)
+
+
+def test_bilou_tags():
+    tokens = ["Tony", "Stark", "visited", "New", "York", "City", "and", "Malibu"]
+    spans = [(0, 2, "PERSON"), (3, 6, "GPE"), (7, 8, "GPE")]
+    tags = [tag for _, tag in iter_span_tags(tokens, spans, scheme="BILOU")]
+
+    assert tags == ["B-PERSON", "L-PERSON", "O", "B-GPE", "I-GPE", "L-GPE", "O", "U-GPE"]
+
+
+def test_bio_tags_from_spans():
+    tags = [tag for _, tag in iter_span_tags(["a", "b", "c"], [(1, 3, "ORG")])]
+
+    assert tags == ["O", "B-ORG", "I-ORG"]
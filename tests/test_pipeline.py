@@ -0,0 +1,25 @@
+import pytest
+
+from app.pipeline import ANALYZE_STAGES, analyze_text, resolve_stages, stage_sections
+
+def test_resolve_stages_adds_dependencies_in_order():
+    assert resolve_stages(["compare"]) == ("lemmas", "stems", "compare")
+    assert resolve_stages(["bio", "tokens"]) == ("tokens", "ner", "bio")
+    assert resolve_stages() == ("tokens", "lemmas", "stems", "compare", "ner", "bio")
+
+def test_stage_sections_only_selected():
+    assert stage_sections(["bio"]) == ("bio_tags",)
+    assert stage_sections() == ANALYZE_STAGES
+
+def test_unknown_stage():
+    with pytest.raises(ValueError):
+        resolve_stages(["parser"])
+
+def test_selected_sections_only():
+    result = analyze_text("Running quickly. Cats are running.", stages=["tokens"])
+    assert list(result) == ["tokenization"]
+    assert result["tokenization"]["words"][0] == "Running"
+
+    result = analyze_text("Tony Stark lives in Malibu.", stages=["bio"])
+    assert list(result) == ["bio_tags"]
+    assert result["bio_tags"][0]["tag"] == "B-PERSON"
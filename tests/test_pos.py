@@ -1,5 +1,6 @@
-from app.tokenizer import word_tokens
-from app.pos_tagger import pos_tag_tokens
+from app import resources
+from app.tokenizer import sentence_tokens, word_tokens
+from app.pos_tagger import pos_tag_tokens, pos_tag_sents, pos_tag_text
 
 def test_pos_output_structure():
     text = "Apple is buying startups"
@@ -16,3 +17,18 @@ def test_proper_noun():
 
     word, tag, _ = result[0]
     assert tag == "NNP"
+
+def test_tagger_is_shared():
+    pos_tag_tokens(["warm"])
+    tagger = resources.get("pos_tagger")
+    pos_tag_tokens(["again"])
+
+    assert resources.get("pos_tagger") is tagger
+
+def test_sentence_batch_matches_word_tokens():
+    text = "Apple is buying startups. Run fast! The cars are red."
+    tagged = pos_tag_sents(sentence_tokens(text))
+
+    assert len(tagged) == 3
+    assert tagged[1][0][0] == "Run"
+    assert [w for w, _, _ in pos_tag_text(text)] == word_tokens(text)
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from app import pricing
+from app.pricing import PRICING_ENV, estimate_cost, price
+
+
+def test_estimate_cost_uses_per_million_prices():
+    assert price("gpt-4") == 30.00 / 1_000_000
+    assert estimate_cost(1_000_000, "gpt-4o-mini") == 0.15
+    assert estimate_cost(1_000, "gpt-4o", kind="output") == 0.01
+    with pytest.raises(ValueError):
+        price("no-such-model")
+
+
+def test_pricing_overrides_from_file(tmp_path, monkeypatch):
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps({"gpt-4o-mini": {"input": 1.0}, "local-llm": {"input": 0.0}}), encoding="utf-8")
+    monkeypatch.setenv(PRICING_ENV, str(path))
+    monkeypatch.setattr(pricing, "_table", None)
+
+    assert estimate_cost(1_000_000, "gpt-4o-mini") == 1.0
+    assert price("gpt-4o-mini", "output") == 0.60 / 1_000_000
+    assert estimate_cost(5_000, "local-llm") == 0.0
+    monkeypatch.setattr(pricing, "_table", None)
@@ -0,0 +1,53 @@
+import time
+
+from app import memo
+from app.profiling import Profiler, stage
+
+def test_stage_records_time_cache_and_hook():
+    seen = []
+    profiler = Profiler(on_stage=lambda name, m: seen.append(name))
+    table = memo.table("profiling-test")
+    try:
+        with profiler.stage("work"):
+            time.sleep(0.01)
+            table.get("a", str.upper)
+            table.get("a", str.upper)
+            data = [0] * 10000
+        profiler.tokens = 100
+        metrics = profiler.metrics()
+    finally:
+        profiler.close()
+
+    work = metrics["stages"]["work"]
+    assert seen == ["work"]
+    assert work["wall_s"] >= 0.01
+    assert work["peak_memory_kb"] > 0
+    assert work["cache"]["profiling-test"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert metrics["total"]["tokens"] == 100
+    assert work["tokens_per_s"] > 0
+    del data
+
+def test_cprofile_dump(tmp_path):
+    profiler = Profiler(memory=False, cprofile_dir=tmp_path)
+    with profiler.stage("ner"):
+        sum(range(1000))
+    assert (tmp_path / "ner.prof").exists()
+    assert "peak_memory_kb" not in profiler.metrics()["stages"]["ner"]
+
+def test_repeated_stage_accumulates(tmp_path):
+    seen = []
+    profiler = Profiler(memory=False, cprofile_dir=tmp_path, on_stage=lambda name, m: seen.append(m["wall_s"]))
+    table = memo.table("profiling-repeat-test")
+    for _ in range(2):
+        with profiler.stage("ner"):
+            time.sleep(0.01)
+            table.get("a", str.upper)
+
+    ner = profiler.metrics()["stages"]["ner"]
+    assert ner["wall_s"] >= 0.02
+    assert seen[1] == ner["wall_s"]
+    assert ner["cache"]["profiling-repeat-test"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_stage_is_noop_without_profiler():
+    with stage(None, "anything"):
+        pass
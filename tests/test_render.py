@@ -0,0 +1,38 @@
+import io
+
+from rich.console import Console
+
+from app.render import Renderer, plain, preview
+
+def make(mode, max_rows=None):
+    out = io.StringIO()
+    console = Console(file=out, width=100, force_terminal=False)
+    return Renderer(console, mode, max_rows, out=out), out
+
+def test_tsv_strips_markup_and_escapes():
+    renderer, out = make("auto")
+    renderer.table("Stems", ["Token", "Porter"], [("a\tb", "[red]studi ❌[/red]"), ("line\nbreak", "run")])
+
+    assert renderer.mode == "tsv"
+    assert out.getvalue().splitlines()[:4] == ["# Stems", "Token\tPorter", "a b\tstudi ❌", "line break\trun"]
+
+def test_rich_caps_rows_with_summary():
+    renderer, out = make("rich", max_rows=3)
+    renderer.table("Tokens", ["#"], ((i,) for i in range(10)))
+
+    text = out.getvalue()
+    assert "7 more rows not shown" in text
+    assert "│ 3" not in text and "║ 3" not in text
+
+def test_stream_renders_every_row():
+    renderer, out = make("stream")
+    renderer.table("Tokens", ["#", "Token"], ((i, f"tok{i}") for i in range(450)))
+
+    text = out.getvalue()
+    assert "tok0" in text and "tok449" in text
+    assert "not shown" not in text
+
+def test_plain_and_preview():
+    assert plain("[green]run[/green]") == "run"
+    assert plain("[") == "["
+    assert preview("x" * 600).startswith("x" * 500 + "…")
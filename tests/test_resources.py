@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app import resources
+
+def test_resource_loaded_once():
+    calls = []
+
+    @resources.register("dummy")
+    def _load_dummy(value="x"):
+        calls.append(value)
+        return object()
+
+    first = resources.get("dummy", "a")
+    second = resources.get("dummy", "a")
+
+    assert first is second
+    assert calls == ["a"]
+    assert resources.is_loaded("dummy")
+
+def test_cli_import_is_lazy():
+    code = "import sys, app.cli; print(sorted(m for m in ('spacy', 'tiktoken', 'nltk') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).parent.parent)
+
+    assert out.stdout.strip() == "[]"
+
+def test_unknown_encoding_name_is_an_error():
+    with pytest.raises(ValueError, match="Unknown encoding"):
+        resources.get("llm_encoder", "o999k_base")
+    with pytest.raises(ValueError, match="Unknown encoding"):
+        resources.get("llm_encoder", "zz50k")
+    assert not resources.is_loaded("llm_encoder")
@@ -0,0 +1,57 @@
+import os
+
+from app import pricing, wordnet_index
+from app.result_cache import ResultCache, cache_key
+
+def test_put_get_roundtrip(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite")
+    key = cache_key("Hello world", ["ner"])
+
+    assert cache.get(key) is None
+    cache.put(key, {"named_entities": [{"text": "Hello", "label": "ORG"}]})
+
+    assert cache.get(key) == {"named_entities": [{"text": "Hello", "label": "ORG"}]}
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_key_depends_on_text_stages_and_options():
+    base = cache_key("text", ["ner", "tokens"], scheme="BIO")
+
+    assert base == cache_key("text", ["tokens", "ner"], scheme="BIO")
+    assert base != cache_key("text!", ["ner", "tokens"], scheme="BIO")
+    assert base != cache_key("text", ["ner"], scheme="BIO")
+    assert base != cache_key("text", ["ner", "tokens"], scheme="BILOU")
+
+def test_key_depends_on_wordnet_validity_mode(monkeypatch):
+    monkeypatch.setattr(wordnet_index, "EXACT_MORPHY", False)
+    fast = cache_key("text", ["comparison"])
+    monkeypatch.setattr(wordnet_index, "EXACT_MORPHY", True)
+
+    assert cache_key("text", ["comparison"]) != fast
+
+def test_key_depends_on_pricing(monkeypatch):
+    listed = cache_key("text", ["tokenization"])
+    table = {model: dict(prices) for model, prices in pricing.pricing().items()}
+    table["gpt-4o-mini"]["input"] = 9.99
+    monkeypatch.setattr(pricing, "_table", table)
+
+    assert cache_key("text", ["tokenization"]) != listed
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite", max_bytes=4000)
+    for i in range(20):
+        cache.put(f"k{i}", {"payload": os.urandom(500).hex()})
+
+    stats = cache.stats()
+    assert stats["size_bytes"] <= 4000
+    assert stats["evictions"] > 0
+    assert cache.get("k19") is not None
+
+def test_clear(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite")
+    cache.put("a", [1])
+
+    assert cache.clear() == 1
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,83 @@
+import threading
+
+from app import server as server_module
+from app.client import call
+from app.server import AnalysisService, MicroBatcher, make_server
+
+def test_micro_batcher_groups_requests():
+    batches = []
+
+    def handler(items):
+        batches.append(len(items))
+        return [i * 2 for i in items]
+
+    batcher = MicroBatcher(handler, window=0.05, max_batch=16)
+    results = {}
+
+    def submit(i):
+        results[i] = batcher.submit(i)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {i: i * 2 for i in range(8)}
+    assert len(batches) < 8
+
+def test_micro_batcher_isolates_failures():
+    def handler(items):
+        if "bad" in items:
+            raise ValueError("bad item")
+        return items
+
+    batcher = MicroBatcher(handler, window=0.0, max_batch=4)
+
+    assert batcher.submit("ok") == "ok"
+    try:
+        batcher.submit("bad")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+def test_unix_socket_roundtrip(tmp_path):
+    socket_path = str(tmp_path / "analyzer.sock")
+    server = make_server(AnalysisService(window_ms=1), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        stems = call(f"unix:{socket_path}", "stem", "running studies")
+        assert [s["token"] for s in stems] == ["running", "studies"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_all_endpoints_share_one_worker(monkeypatch):
+    seen = []
+
+    def handler(name):
+        def run(items):
+            seen.append((name, len(items), threading.current_thread().name))
+            return [f"{name}:{i['text']}" for i in items]
+        return run
+
+    monkeypatch.setattr(server_module, "ENDPOINTS", {name: handler(name) for name in ("pos", "ner")})
+    service = AnalysisService(window_ms=50)
+    results = {}
+
+    def run(i):
+        endpoint = "pos" if i % 2 else "ner"
+        results[i] = service.handle(endpoint, {"text": str(i)})
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    service.close()
+
+    assert results == {i: f"{'pos' if i % 2 else 'ner'}:{i}" for i in range(8)}
+    assert len({thread for _, _, thread in seen}) == 1
+    assert sum(n for _, n, _ in seen) == 8
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+
+from app.document import Document
+from app.pipeline import token_winner
+from app.stats import LEMMA, STEM, TIE, CorpusStats, winner_codes
+from app import stats as stats_module
+from app.token_table import TokenTable
+
+def make_document(tokens, stems, lemmas, valid, entities=()):
+    document = Document(" ".join(tokens))
+    document.tokens = tokens
+    document.stems = TokenTable(("token", "porter"), ("porter_valid",), {"token": tokens, "porter": stems, "porter_valid": [v[0] for v in valid]})
+    document.lemmas = TokenTable(("token", "lemma"), ("lemma_valid",), {"token": tokens, "lemma": lemmas, "lemma_valid": [v[1] for v in valid]})
+    document.entities = list(entities)
+    return document
+
+def test_winner_codes_match_token_winner():
+    cases = [("run", "run", True, True), ("studi", "study", False, True), ("happi", "happy", True, False), ("x", "y", False, False)]
+    codes = {"TIE": TIE, "LEMMA": LEMMA, "STEM": STEM}
+    ids = {"run": 0, "studi": 1, "study": 2, "happi": 3, "happy": 4, "x": 5, "y": 6}
+
+    vectorized = winner_codes(
+        np.array([ids[c[0]] for c in cases]), np.array([ids[c[1]] for c in cases]),
+        np.array([c[2] for c in cases]), np.array([c[3] for c in cases])
+    )
+    assert vectorized.tolist() == [codes[token_winner(*c)] for c in cases]
+
+def test_merge_matches_single_pass(monkeypatch):
+    monkeypatch.setattr(stats_module, "llm_token_count", lambda text: len(text.split()))
+    a = make_document(["cats", "run"], ["cat", "run"], ["cat", "run"], [(True, True), (True, True)], [(0, 1, "ORG")])
+    b = make_document(["studies", "cats"], ["studi", "cat"], ["study", "cat"], [(False, True), (True, True)], [(0, 1, "PERSON"), (1, 2, "ORG")])
+
+    single = CorpusStats().add_documents([a, b])
+    merged = CorpusStats().add_documents([b]).merge(CorpusStats().add_documents([a]))
+    restored = CorpusStats.from_dict(json.loads(json.dumps(merged.to_dict())))
+
+    for result in (single.summary(), merged.summary(), restored.summary()):
+        assert result["tokens"] == 4
+        assert dict(result["top_terms"]) == {"cats": 2, "run": 1, "studies": 1}
+        assert result["win_rates"] == {"lemma": 0.25, "stem": 0.0, "tie": 0.75}
+        assert result["entity_labels"][0] == ("ORG", 2, 0.6667)
+        assert result["wordnet_coverage"]["stem"] == 0.75
+        assert result["llm_token_histogram"] == [{"llm_tokens": "2-3", "documents": 2}]
+
+
+def test_many_shard_merges_count_every_word(monkeypatch):
+    monkeypatch.setattr(stats_module, "llm_token_count", lambda text: len(text.split()))
+    stats = CorpusStats()
+    for i in range(20):
+        words = [f"w{i}", f"w{i + 1}"]
+        shard = make_document(words, words, words, [(True, True), (True, True)], [])
+        stats.merge(CorpusStats().add_documents([shard]))
+
+    data = stats.to_dict()
+    assert len(data["counts"]["term"]) == len(data["words"]) == 21
+    assert dict(zip(data["words"], data["counts"]["term"])) == {f"w{i}": 1 if i in (0, 20) else 2 for i in range(21)}
+    assert stats.summary()["unique_terms"] == 21
+
+
+def test_merging_merged_aggregates_matches_single_pass(monkeypatch):
+    monkeypatch.setattr(stats_module, "llm_token_count", lambda text: len(text.split()))
+    words = [["x", "y", "z"], ["n0"], ["q", "x"], ["y"]]
+    documents = [make_document(w, w, w, [(True, True)] * len(w), [(0, 1, "ORG")]) for w in words]
+
+    single = CorpusStats().add_documents(documents)
+    left = CorpusStats().add_documents(documents[:1]).merge(CorpusStats().add_documents(documents[1:2]))
+    right = CorpusStats().add_documents(documents[2:3]).merge(CorpusStats().add_documents(documents[3:]))
+    merged = left.merge(right)
+
+    assert merged.summary() == single.summary()
+    assert CorpusStats.from_dict(merged.to_dict()).summary() == single.summary()
@@ -0,0 +1,35 @@
+import pytest
+
+from app.token_table import Bitmap, TokenTable
+
+def test_bitmap_roundtrip():
+    values = [True, False, False, True, True, False, True, False, True, True]
+    bits = Bitmap(values)
+
+    assert list(bits) == values
+    assert bits[3] and bits[-1] and not bits[1]
+    assert bits.count() == 6
+    with pytest.raises(IndexError):
+        bits[10]
+
+def test_table_rows_match_dict_shape():
+    table = TokenTable(("token", "lemma"), ("lemma_valid",), {
+        "token": ["cats", "ran", "cats"],
+        "lemma": ["cat", "run", "cat"],
+        "lemma_valid": [True, True, True],
+    })
+
+    assert len(table) == 3
+    assert table[1] == {"token": "ran", "lemma": "run", "lemma_valid": True}
+    assert table.to_dicts()[2] == table.row(0)
+    assert list(table.to_dicts()[0]) == ["token", "lemma", "lemma_valid"]
+
+def test_strings_are_interned():
+    first, second = "".join(["ca", "ts"]), "".join(["c", "ats"])
+    table = TokenTable(("token",), (), {"token": [first, second]})
+
+    assert table.column("token")[0] is table.column("token")[1]
+
+def test_mismatched_columns():
+    with pytest.raises(ValueError):
+        TokenTable(("token",), ("valid",), {"token": ["a", "b"], "valid": [True]})
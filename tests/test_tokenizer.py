@@ -1,4 +1,4 @@
-from app.tokenizer import sentence_tokens, word_tokens, llm_tokens
+from app.tokenizer import sentence_tokens, word_tokens, llm_tokens, llm_token_count, llm_token_counts, get_encoder
 
 def test_sentence_tokenization():
     text = "Hello world. How are you?"
@@ -12,3 +12,15 @@ def test_llm_tokens():
     text = "Hello"
     tokens, count = llm_tokens(text)
     assert count > 0
+
+def test_llm_token_count_matches_llm_tokens():
+    text = "Tony Stark built Jarvis in Malibu"
+    _, count = llm_tokens(text)
+    assert llm_token_count(text) == count
+
+def test_llm_token_counts_batch():
+    texts = ["Hello", "Hello world", ""]
+    assert llm_token_counts(texts, batch_size=2) == [llm_token_count(t) for t in texts]
+
+def test_encoder_is_cached():
+    assert get_encoder("gpt-4") is get_encoder("gpt-4")
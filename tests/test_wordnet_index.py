@@ -0,0 +1,14 @@
+from app.wordnet_index import MappedVocabulary, save_vocabulary, is_valid_word
+
+def test_mapped_vocabulary_lookup(tmp_path):
+    path = tmp_path / "vocab.idx"
+    save_vocabulary(path, {"run", "car", "new_york", "zebra", "a"})
+    vocab = MappedVocabulary(path)
+
+    assert all(w in vocab for w in ["run", "car", "new_york", "zebra", "a"])
+    assert not any(w in vocab for w in ["", "ru", "runs", "cars", "zzz", "b"])
+
+def test_exact_mode_uses_morphy():
+    assert not is_valid_word("geese", exact=False)
+    assert is_valid_word("geese", exact=True)
+    assert is_valid_word("car")